@@ -1,10 +1,15 @@
 import subprocess
-subprocess.check_call(["pip", "install", "google-ads>=28.1.0"])
+subprocess.check_call(["pip", "install", "google-ads>=29.0.0"])
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 import json
 
+try:
+    from deploy.account_directory import resolve_customer_id_via_directory
+except ImportError:
+    resolve_customer_id_via_directory = None
+
 MICROS = 1_000_000
 
 def get_client():
@@ -20,6 +25,8 @@ def get_client():
 def resolve_customer_id(client, search=None, customer_id=None):
     if customer_id:
         return customer_id.replace("-", "")
+    if resolve_customer_id_via_directory is not None and search:
+        return resolve_customer_id_via_directory(secrets, search, secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", ""))
     if not search:
         raise ValueError("Either customer_id or search parameter required")
 
@@ -9,7 +9,7 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+API_VERSION = "v23"
 
 DATE_RANGES = ['TODAY', 'YESTERDAY', 'LAST_7_DAYS', 'LAST_14_DAYS', 'LAST_30_DAYS', 'LAST_90_DAYS', 'THIS_MONTH', 'LAST_MONTH']
 AUDIENCE_TYPES = ['REMARKETING', 'CRM_BASED', 'RULE_BASED', 'SIMILAR', 'BASIC_USER_LIST', 'LOGICAL_USER_LIST']
@@ -9,7 +9,7 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+API_VERSION = "v23"
 SORT_FIELDS = {'amount': 'campaign_budget.amount_micros DESC', 'name': 'campaign_budget.name ASC', 'campaigns_using': 'campaign_budget.reference_count DESC'}
 
 def get_client(login_customer_id=None):
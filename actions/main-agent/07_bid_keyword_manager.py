@@ -9,7 +9,7 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+API_VERSION = "v23"
 DATE_RANGES = ['TODAY', 'YESTERDAY', 'LAST_7_DAYS', 'LAST_14_DAYS', 'LAST_30_DAYS', 'LAST_90_DAYS', 'THIS_MONTH', 'LAST_MONTH', 'THIS_QUARTER', 'THIS_YEAR']
 SORT_FIELDS = {'cost': 'metrics.cost_micros DESC', 'conversions': 'metrics.conversions DESC', 'clicks': 'metrics.clicks DESC', 'impressions': 'metrics.impressions DESC', 'quality_score': 'ad_group_criterion.quality_info.quality_score DESC', 'cpc_bid': 'ad_group_criterion.cpc_bid_micros DESC', 'keyword': 'ad_group_criterion.keyword.text ASC'}
 
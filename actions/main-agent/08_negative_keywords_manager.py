@@ -9,7 +9,7 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+API_VERSION = "v23"
 
 def get_client(login_customer_id=None):
     config = {"developer_token": secrets["DEVELOPER_TOKEN"], "client_id": secrets["CLIENT_ID"], "client_secret": secrets["CLIENT_SECRET"], "refresh_token": secrets["REFRESH_TOKEN"], "use_proto_plus": True}
@@ -9,7 +9,12 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+try:
+    from deploy.account_directory import get_account_directory
+except ImportError:
+    get_account_directory = None
+
+API_VERSION = "v23"
 
 DATE_RANGES = [
     'TODAY', 'YESTERDAY', 'LAST_7_DAYS', 'LAST_14_DAYS', 'LAST_30_DAYS',
@@ -45,6 +50,12 @@ def get_client(login_customer_id=None):
 
 
 def resolve_account(search_term):
+    if get_account_directory is not None:
+        account = get_account_directory(secrets).resolve(search_term, statuses=("ENABLED",))
+        if account is None:
+            return None, None
+        return account.customer_id, account.login_customer_id
+
     client = get_client()
     customer_service = client.get_service("CustomerService")
     accessible = customer_service.list_accessible_customers()
@@ -384,7 +395,7 @@ def run(customer_id=None, action="list_campaigns", login_customer_id=None, campa
                     if not campaign_id:
                         return {"status": "error", "message": "Campaign not found: " + campaign_name}
 
-            query = "SELECT campaign.id, campaign.name, campaign.status, campaign.start_date, campaign.end_date, campaign.advertising_channel_type, campaign.bidding_strategy_type, campaign_budget.amount_micros, campaign_budget.id FROM campaign WHERE campaign.id = " + str(campaign_id)
+            query = "SELECT campaign.id, campaign.name, campaign.status, campaign.start_date_time, campaign.end_date_time, campaign.advertising_channel_type, campaign.bidding_strategy_type, campaign_budget.amount_micros, campaign_budget.id FROM campaign WHERE campaign.id = " + str(campaign_id)
 
             response = ga_service.search(customer_id=customer_id, query=query)
 
@@ -395,8 +406,8 @@ def run(customer_id=None, action="list_campaigns", login_customer_id=None, campa
                         "id": str(row.campaign.id),
                         "name": row.campaign.name,
                         "status": row.campaign.status.name,
-                        "start_date": row.campaign.start_date,
-                        "end_date": row.campaign.end_date,
+                        "start_date": row.campaign.start_date_time,
+                        "end_date": row.campaign.end_date_time,
                         "channel_type": row.campaign.advertising_channel_type.name,
                         "bidding_strategy": row.campaign.bidding_strategy_type.name,
                         "budget": round(row.campaign_budget.amount_micros / 1000000, 2),
@@ -7,7 +7,12 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+try:
+    from deploy.account_directory import get_account_directory
+except ImportError:
+    get_account_directory = None
+
+API_VERSION = "v23"
 
 def get_client(login_customer_id=None):
     config = {
@@ -21,6 +26,27 @@ def get_client(login_customer_id=None):
         config["login_customer_id"] = str(login_customer_id).replace("-", "")
     return GoogleAdsClient.load_from_dict(config, version=API_VERSION)
 
+def search_result(search, matches, all_accounts):
+    if matches:
+        best = matches[0]
+        return {
+            "status": "success",
+            "found": True,
+            "match_count": len(matches),
+            "best_match": best,
+            "all_matches": matches,
+            "login_customer_id": best.get("mcc_id") or best["customer_id"],
+            "customer_id": best["customer_id"],
+            "api_version": API_VERSION
+        }
+    return {
+        "status": "success",
+        "found": False,
+        "message": "No account found matching: " + str(search),
+        "available_accounts": all_accounts,
+        "api_version": API_VERSION
+    }
+
 def run(operation="list_accessible", customer_id=None, login_customer_id=None, search=None):
     try:
         client = get_client(login_customer_id)
@@ -88,6 +114,14 @@ def run(operation="list_accessible", customer_id=None, login_customer_id=None, s
             if not search:
                 return {"status": "error", "message": "search parameter required"}
 
+            if get_account_directory is not None:
+                directory = get_account_directory(secrets)
+                matches = [account.to_dict() for account in directory.find(search, statuses=("ENABLED",))]
+                all_accounts = [] if matches else [
+                    account.to_dict() for account in directory.accounts() if account.status == "ENABLED"
+                ]
+                return search_result(search, matches, all_accounts)
+
             customer_service = client.get_service("CustomerService")
             accessible = customer_service.list_accessible_customers()
 
@@ -138,26 +172,7 @@ def run(operation="list_accessible", customer_id=None, login_customer_id=None, s
                 elif search_lower in acc.get("name", "").lower():
                     matches.append(acc)
 
-            if matches:
-                best = matches[0]
-                return {
-                    "status": "success",
-                    "found": True,
-                    "match_count": len(matches),
-                    "best_match": best,
-                    "all_matches": matches,
-                    "login_customer_id": best.get("mcc_id") or best["customer_id"],
-                    "customer_id": best["customer_id"],
-                    "api_version": API_VERSION
-                }
-            else:
-                return {
-                    "status": "success",
-                    "found": False,
-                    "message": "No account found matching: " + str(search),
-                    "available_accounts": all_accounts,
-                    "api_version": API_VERSION
-                }
+            return search_result(search, matches, all_accounts)
 
         else:
             return {
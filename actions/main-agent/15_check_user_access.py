@@ -11,7 +11,7 @@ except ImportError:
 def get_client(login_customer_id=None):
     config = {"developer_token": secrets["DEVELOPER_TOKEN"], "client_id": secrets["CLIENT_ID"], "client_secret": secrets["CLIENT_SECRET"], "refresh_token": secrets["REFRESH_TOKEN"], "use_proto_plus": True}
     if login_customer_id: config["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(config, version="v19")
+    return GoogleAdsClient.load_from_dict(config, version="v23")
 
 def run(customer_id, login_customer_id=None):
     try:
@@ -1,15 +1,60 @@
+import json
+import threading
 import subprocess
-subprocess.check_call(["pip", "install", "google-ads>=28.1.0"])
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+subprocess.check_call(["pip", "install", "google-ads>=29.0.0"])
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.account_directory import resolve_customer_id_via_directory
+except ImportError:
+    resolve_customer_id_via_directory = None
+
+try:
+    from deploy.action_registry import secrets_fingerprint
+    from deploy.ads_backend import current_ads_backend
+    from deploy.result_cache import get_shared_cache
+except ImportError:
+    secrets_fingerprint = current_ads_backend = get_shared_cache = None
+
 MICROS = 1_000_000
+ENTITY_COUNT_TTL = 300  # seconds entity counts are reused per customer (they don't depend on date_range)
+ENTITY_COUNT_MAX_ACCOUNTS = 256
+SUMMARY_WORKERS = 8  # the four summary queries of up to two concurrent calls
+
+_summary_pool = None
+_summary_pool_lock = threading.Lock()
+
+AD_GROUP_COUNT_QUERY = "SELECT ad_group.id FROM ad_group WHERE ad_group.status != 'REMOVED'"
+KEYWORD_COUNT_QUERY = "SELECT ad_group_criterion.criterion_id FROM ad_group_criterion WHERE ad_group_criterion.type = 'KEYWORD' AND ad_group_criterion.status != 'REMOVED'"
+
+def entity_count_cache():
+    """Process-wide entity counts (deploy.result_cache), dropped by mutations of the account; None standalone."""
+    if get_shared_cache is None:
+        return None
+    return get_shared_cache("query_planner.entity_counts", max_entries=ENTITY_COUNT_MAX_ACCOUNTS)
+
+def entity_count_key(customer_id):
+    # Per credentials, and recorded/replayed counts never mix with live ones
+    return f"{secrets_fingerprint(secrets)}:{id(current_ads_backend()):x}:{customer_id}"
+
+def summary_pool():
+    """One bounded pool for the summary queries, shared by every call instead of a pool per cache miss."""
+    global _summary_pool
+    with _summary_pool_lock:
+        if _summary_pool is None:
+            _summary_pool = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="query-planner")
+        return _summary_pool
 
 def get_client():
     return GoogleAdsClient.load_from_dict({"developer_token": secrets["GOOGLE_ADS_DEVELOPER_TOKEN"], "client_id": secrets["GOOGLE_ADS_CLIENT_ID"], "client_secret": secrets["GOOGLE_ADS_CLIENT_SECRET"], "refresh_token": secrets["GOOGLE_ADS_REFRESH_TOKEN"], "login_customer_id": secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", "").replace("-", ""), "use_proto_plus": True})
 
 def resolve_customer_id(client, search=None, customer_id=None):
     if customer_id: return customer_id.replace("-", "")
+    if resolve_customer_id_via_directory is not None and search:
+        return resolve_customer_id_via_directory(secrets, search, secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", ""))
     login_id = secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", "").replace("-", "")
     ga_service = client.get_service("GoogleAdsService")
     response = ga_service.search(customer_id=login_id, query="SELECT customer_client.id, customer_client.descriptive_name FROM customer_client WHERE customer_client.manager = FALSE")
@@ -17,25 +62,50 @@ def resolve_customer_id(client, search=None, customer_id=None):
         if search.lower() in row.customer_client.descriptive_name.lower(): return str(row.customer_client.id)
     raise ValueError(f"No account found matching '{search}'")
 
-def get_account_summary(client, customer_id, date_range="LAST_30_DAYS"):
+def count_rows(ga_service, customer_id, query):
+    """Counting mode: stream an ID-only query and add up batch sizes, without decoding rows."""
+    return sum(len(batch.results) for batch in ga_service.search_stream(customer_id=customer_id, query=query))
+
+def get_account_metrics(ga_service, customer_id, date_range):
+    response = ga_service.search(customer_id=customer_id, query=f"SELECT customer.id, customer.descriptive_name, metrics.impressions, metrics.clicks, metrics.cost_micros, metrics.conversions, metrics.conversions_value, metrics.ctr, metrics.average_cpc FROM customer WHERE segments.date DURING {date_range}")
+    for row in response:
+        return {"customer_id": str(row.customer.id), "account_name": row.customer.descriptive_name, "total_impressions": row.metrics.impressions, "total_clicks": row.metrics.clicks, "total_cost": round(row.metrics.cost_micros / MICROS, 2), "total_conversions": round(row.metrics.conversions, 2), "avg_ctr": round(row.metrics.ctr * 100, 2), "avg_cpc": round(row.metrics.average_cpc / MICROS, 2)}
+    return None
+
+def get_campaign_counts(ga_service, customer_id):
+    response = ga_service.search(customer_id=customer_id, query="SELECT campaign.id, campaign.advertising_channel_type, campaign.status FROM campaign")
+    type_counts = {}; status_counts = {"ENABLED": 0, "PAUSED": 0, "REMOVED": 0}; total = 0
+    for row in response:
+        total += 1
+        ct = str(row.campaign.advertising_channel_type).replace("AdvertisingChannelTypeEnum.AdvertisingChannelType.", "")
+        type_counts[ct] = type_counts.get(ct, 0) + 1
+        cs = str(row.campaign.status).replace("CampaignStatusEnum.CampaignStatus.", "")
+        if cs in status_counts: status_counts[cs] += 1
+    return total, type_counts, status_counts
+
+def get_account_summary(client, customer_id, date_range="LAST_30_DAYS", fresh=False):
     ga_service = client.get_service("GoogleAdsService")
     try:
-        response = ga_service.search(customer_id=customer_id, query=f"SELECT customer.id, customer.descriptive_name, metrics.impressions, metrics.clicks, metrics.cost_micros, metrics.conversions, metrics.conversions_value, metrics.ctr, metrics.average_cpc FROM customer WHERE segments.date DURING {date_range}")
-        account_data = None
-        for row in response:
-            account_data = {"customer_id": str(row.customer.id), "account_name": row.customer.descriptive_name, "total_impressions": row.metrics.impressions, "total_clicks": row.metrics.clicks, "total_cost": round(row.metrics.cost_micros / MICROS, 2), "total_conversions": round(row.metrics.conversions, 2), "avg_ctr": round(row.metrics.ctr * 100, 2), "avg_cpc": round(row.metrics.average_cpc / MICROS, 2)}; break
-        # Campaign counts
-        response = ga_service.search(customer_id=customer_id, query="SELECT campaign.id, campaign.advertising_channel_type, campaign.status FROM campaign")
-        type_counts = {}; status_counts = {"ENABLED": 0, "PAUSED": 0, "REMOVED": 0}; total = 0
-        for row in response:
-            total += 1
-            ct = str(row.campaign.advertising_channel_type).replace("AdvertisingChannelTypeEnum.AdvertisingChannelType.", "")
-            type_counts[ct] = type_counts.get(ct, 0) + 1
-            cs = str(row.campaign.status).replace("CampaignStatusEnum.CampaignStatus.", "")
-            if cs in status_counts: status_counts[cs] += 1
-        ag_count = sum(1 for _ in ga_service.search(customer_id=customer_id, query="SELECT ad_group.id FROM ad_group WHERE ad_group.status != 'REMOVED'"))
-        kw_count = sum(1 for _ in ga_service.search(customer_id=customer_id, query="SELECT ad_group_criterion.criterion_id FROM ad_group_criterion WHERE ad_group_criterion.type = 'KEYWORD' AND ad_group_criterion.status != 'REMOVED'"))
-        return {"status": "success", "account_summary": account_data, "entity_counts": {"campaigns": total, "ad_groups": ag_count, "keywords": kw_count}, "campaigns_by_type": type_counts, "campaigns_by_status": status_counts, "date_range": date_range}
+        # Entity counts are cached per customer (fresh=True recounts); whatever is needed runs concurrently
+        cache = entity_count_cache()
+        cached = cache.get(entity_count_key(customer_id)) if cache is not None and not fresh else None
+        if cached is not None:
+            counts = json.loads(cached)
+            account_data = get_account_metrics(ga_service, customer_id, date_range)
+        else:
+            pool = summary_pool()
+            def submit(fn, *args):
+                return pool.submit(contextvars.copy_context().run, fn, ga_service, customer_id, *args)
+            account_future = submit(get_account_metrics, date_range)
+            campaigns_future = submit(get_campaign_counts)
+            ad_groups_future = submit(count_rows, AD_GROUP_COUNT_QUERY)
+            keywords_future = submit(count_rows, KEYWORD_COUNT_QUERY)
+            total, type_counts, status_counts = campaigns_future.result()
+            counts = {"entity_counts": {"campaigns": total, "ad_groups": ad_groups_future.result(), "keywords": keywords_future.result()}, "campaigns_by_type": type_counts, "campaigns_by_status": status_counts}
+            account_data = account_future.result()
+            if cache is not None:
+                cache.put(entity_count_key(customer_id), json.dumps(counts), ENTITY_COUNT_TTL, customer_id)
+        return {"status": "success", "account_summary": account_data, "entity_counts": dict(counts["entity_counts"]), "campaigns_by_type": dict(counts["campaigns_by_type"]), "campaigns_by_status": dict(counts["campaigns_by_status"]), "date_range": date_range}
     except GoogleAdsException as ex:
         return {"status": "error", "message": str(ex.failure.errors[0].message)}
 
@@ -52,7 +122,8 @@ def build_query_plan(client, customer_id, intent, entity_type="CAMPAIGN", cost_m
     return {"status": "success", "query_plan": {"intent": intent, "entity_type": entity_type, "estimated_rows": estimated_rows, "will_fit_in_single_query": estimated_rows <= 500, "recommended_action": action_map.get(entity_type.upper(), "Campaign Manager"), "recommended_filters": {"status": status, "date_range": date_range, "cost_min_dollars": cost_min, "cost_max_dollars": cost_max, "conversions_min": conversions_min, "campaign_type": campaign_type}, "account_context": summary["account_summary"]}}
 
 def validate_completeness(client, customer_id, detail_cost_total, detail_row_count, entity_type="CAMPAIGN", date_range="LAST_30_DAYS"):
-    summary = get_account_summary(client, customer_id, date_range)
+    # Compared against a fresh detail_row_count, so the counts are never taken from the cache
+    summary = get_account_summary(client, customer_id, date_range, fresh=True)
     if summary["status"] != "success": return summary
     act = summary["account_summary"]["total_cost"]
     ec = summary["entity_counts"].get(entity_type.lower() + "s", 0)
@@ -67,9 +138,9 @@ def run(action, search=None, customer_id=None, date_range="LAST_30_DAYS", intent
     elif action == "validate_completeness": return validate_completeness(client, cid, detail_cost_total, detail_row_count, entity_type, date_range)
     elif action == "estimate_row_count":
         ga_service = client.get_service("GoogleAdsService")
-        q = {"CAMPAIGN": "SELECT campaign.id FROM campaign WHERE campaign.status != 'REMOVED'", "AD_GROUP": "SELECT ad_group.id FROM ad_group WHERE ad_group.status != 'REMOVED'", "KEYWORD": "SELECT ad_group_criterion.criterion_id FROM ad_group_criterion WHERE ad_group_criterion.type = 'KEYWORD' AND ad_group_criterion.status != 'REMOVED'"}.get(entity_type.upper())
+        q = {"CAMPAIGN": "SELECT campaign.id FROM campaign WHERE campaign.status != 'REMOVED'", "AD_GROUP": AD_GROUP_COUNT_QUERY, "KEYWORD": KEYWORD_COUNT_QUERY}.get(entity_type.upper())
         if not q: return {"status": "error", "message": f"Unsupported entity_type: {entity_type}"}
-        count = sum(1 for _ in ga_service.search(customer_id=cid, query=q))
+        count = count_rows(ga_service, cid, q)
         if cost_min: count = int(count * 0.3)
         return {"status": "success", "estimated_rows": count, "will_need_pagination": count > 500}
     else: return {"status": "error", "message": f"Unknown action: {action}"}
@@ -1,8 +1,13 @@
 import subprocess
-subprocess.check_call(["pip", "install", "google-ads>=28.1.0"])
+subprocess.check_call(["pip", "install", "google-ads>=29.0.0"])
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.account_directory import resolve_customer_id_via_directory
+except ImportError:
+    resolve_customer_id_via_directory = None
+
 MICROS = 1_000_000
 
 def get_client():
@@ -10,6 +15,8 @@ def get_client():
 
 def resolve_customer_id(client, search=None, customer_id=None):
     if customer_id: return customer_id.replace("-", "")
+    if resolve_customer_id_via_directory is not None and search:
+        return resolve_customer_id_via_directory(secrets, search, secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", ""))
     login_id = secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", "").replace("-", "")
     ga_service = client.get_service("GoogleAdsService")
     for row in ga_service.search(customer_id=login_id, query="SELECT customer_client.id, customer_client.descriptive_name FROM customer_client WHERE customer_client.manager = FALSE"):
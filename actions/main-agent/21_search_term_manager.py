@@ -8,7 +8,7 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
-API_VERSION = "v22"
+API_VERSION = "v23"
 SORT_FIELDS = {'cost': 'metrics.cost_micros DESC', 'conversions': 'metrics.conversions DESC', 'clicks': 'metrics.clicks DESC', 'impressions': 'metrics.impressions DESC'}
 
 def get_client(login_customer_id=None):
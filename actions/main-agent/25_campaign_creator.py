@@ -1,9 +1,14 @@
 # ============================================
 import subprocess
-subprocess.check_call(["pip", "install", "google-ads>=28.1.0"])
+subprocess.check_call(["pip", "install", "google-ads>=29.0.0"])
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.account_directory import resolve_customer_id_via_directory
+except ImportError:
+    resolve_customer_id_via_directory = None
+
 MICROS = 1_000_000
 
 def get_client():
@@ -11,6 +16,8 @@ def get_client():
 
 def resolve_customer_id(client, search=None, customer_id=None):
     if customer_id: return customer_id.replace("-", "")
+    if resolve_customer_id_via_directory is not None and search:
+        return resolve_customer_id_via_directory(secrets, search, secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", ""))
     login_id = secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", "").replace("-", "")
     for row in client.get_service("GoogleAdsService").search(customer_id=login_id, query="SELECT customer_client.id, customer_client.descriptive_name FROM customer_client WHERE customer_client.manager = FALSE"):
         if search.lower() in row.customer_client.descriptive_name.lower(): return str(row.customer_client.id)
@@ -41,6 +48,11 @@ def add_geo_targets(client, cid, campaign_id, geo_targets):
         except GoogleAdsException as ex: return {"status": "error", "message": str(ex.failure.errors[0].message)}
     return {"status": "success", "locations": results}
 
+def campaign_date_time(date, time_of_day):
+    """YYYY-MM-DD or YYYYMMDD → the "yyyy-MM-dd HH:mm:ss" Campaign.start/end_date_time take."""
+    d = str(date).replace("-", "")
+    return f"{d[:4]}-{d[4:6]}-{d[6:8]} {time_of_day}"
+
 def create_search_campaign(client, cid, name, daily_budget, bidding_strategy, target_cpa=None, target_roas=None, geo_targets=None, start_date=None, end_date=None, status="PAUSED"):
     budget_resource = create_budget(client, cid, name, daily_budget)
     op = client.get_type("CampaignOperation"); c = op.create
@@ -56,8 +68,8 @@ def create_search_campaign(client, cid, name, daily_budget, bidding_strategy, ta
     elif bidding_strategy == "MAXIMIZE_CLICKS": c.maximize_clicks.cpc_bid_ceiling_micros = 0
     elif bidding_strategy == "MANUAL_CPC": c.manual_cpc.enhanced_cpc_enabled = True
     else: c.maximize_conversions.target_cpa_micros = 0
-    if start_date: c.start_date = start_date.replace("-", "")
-    if end_date: c.end_date = end_date.replace("-", "")
+    if start_date: c.start_date_time = campaign_date_time(start_date, "00:00:00")
+    if end_date: c.end_date_time = campaign_date_time(end_date, "23:59:59")
     c.network_settings.target_google_search = True; c.network_settings.target_search_network = True; c.network_settings.target_content_network = False
     try:
         resp = client.get_service("CampaignService").mutate_campaigns(customer_id=cid, operations=[op])
@@ -74,7 +86,6 @@ def create_pmax_campaign(client, cid, name, daily_budget, target_cpa=None, targe
     if target_roas: c.maximize_conversion_value.target_roas = target_roas
     elif target_cpa: c.maximize_conversions.target_cpa_micros = int(target_cpa * MICROS)
     else: c.maximize_conversion_value.target_roas = 0
-    c.url_expansion_opt_out = False
     try:
         resp = client.get_service("CampaignService").mutate_campaigns(customer_id=cid, operations=[op])
         cid_new = resp.results[0].resource_name.split("/")[-1]
@@ -1,9 +1,14 @@
 # ============================================
 import subprocess
-subprocess.check_call(["pip", "install", "google-ads>=28.1.0"])
+subprocess.check_call(["pip", "install", "google-ads>=29.0.0"])
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.account_directory import resolve_customer_id_via_directory
+except ImportError:
+    resolve_customer_id_via_directory = None
+
 MICROS = 1_000_000
 
 def get_client():
@@ -11,12 +16,14 @@ def get_client():
 
 def resolve_customer_id(client, search=None, customer_id=None):
     if customer_id: return customer_id.replace("-", "")
+    if resolve_customer_id_via_directory is not None and search:
+        return resolve_customer_id_via_directory(secrets, search, secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", ""))
     login_id = secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID", "").replace("-", "")
     for row in client.get_service("GoogleAdsService").search(customer_id=login_id, query="SELECT customer_client.id, customer_client.descriptive_name FROM customer_client WHERE customer_client.manager = FALSE"):
         if search.lower() in row.customer_client.descriptive_name.lower(): return str(row.customer_client.id)
     raise ValueError(f"No account found matching '{search}'")
 
-def run(action, search=None, customer_id=None, campaign_id=None, asset_group_id=None, name=None, final_url=None, path1="", path2="", status="PAUSED", asset_type=None, texts=None, image_urls=None, performance_label=None, cost_min=None, cost_max=None, conversions_min=None, date_range="LAST_30_DAYS", limit=100):
+def run(action, search=None, customer_id=None, campaign_id=None, asset_group_id=None, name=None, final_url=None, path1="", path2="", status="PAUSED", asset_type=None, texts=None, image_urls=None, primary_status=None, cost_min=None, cost_max=None, conversions_min=None, date_range="LAST_30_DAYS", limit=100):
     client = get_client(); cid = resolve_customer_id(client, search, customer_id)
     ga = client.get_service("GoogleAdsService")
 
@@ -71,17 +78,17 @@ def run(action, search=None, customer_id=None, campaign_id=None, asset_group_id=
             return {"status": "info", "message": "Image assets require uploading first. Use Cloudinary or Google Ads UI."}
 
     elif action == "get_asset_performance":
-        query = "SELECT asset_group_asset.resource_name, asset_group_asset.field_type, asset_group_asset.performance_label, asset_group_asset.status, asset.id, asset.name, asset.type, asset.text_asset.text, asset_group.id, asset_group.name, campaign.id, campaign.name FROM asset_group_asset"
+        query = "SELECT asset_group_asset.resource_name, asset_group_asset.field_type, asset_group_asset.primary_status, asset_group_asset.status, asset.id, asset.name, asset.type, asset.text_asset.text, asset_group.id, asset_group.name, campaign.id, campaign.name FROM asset_group_asset"
         conds = []
         if asset_group_id: conds.append(f"asset_group.id = {asset_group_id}")
         if campaign_id: conds.append(f"campaign.id = {campaign_id}")
-        if performance_label: conds.append(f"asset_group_asset.performance_label = '{performance_label}'")
+        if primary_status: conds.append(f"asset_group_asset.primary_status = '{primary_status}'")
         if conds: query += " WHERE " + " AND ".join(conds)
-        results = []; perf_summary = {}
+        results = []; status_summary = {}
         for row in ga.search(customer_id=cid, query=query):
-            pl = str(row.asset_group_asset.performance_label).replace("AssetPerformanceLabelEnum.AssetPerformanceLabel.", "")
-            perf_summary[pl] = perf_summary.get(pl, 0) + 1
-            results.append({"asset_group_id": str(row.asset_group.id), "asset_group_name": row.asset_group.name, "asset_id": str(row.asset.id), "asset_type": str(row.asset.type_).replace("AssetTypeEnum.AssetType.", ""), "field_type": str(row.asset_group_asset.field_type).replace("AssetFieldTypeEnum.AssetFieldType.", ""), "text": row.asset.text_asset.text if row.asset.text_asset else None, "performance_label": pl, "status": str(row.asset_group_asset.status).replace("AssetLinkStatusEnum.AssetLinkStatus.", "")})
-        return {"status": "success", "assets": results[:limit], "total_found": len(results), "performance_summary": perf_summary}
+            ps = str(row.asset_group_asset.primary_status).replace("AssetLinkPrimaryStatusEnum.AssetLinkPrimaryStatus.", "")
+            status_summary[ps] = status_summary.get(ps, 0) + 1
+            results.append({"asset_group_id": str(row.asset_group.id), "asset_group_name": row.asset_group.name, "asset_id": str(row.asset.id), "asset_type": str(row.asset.type_).replace("AssetTypeEnum.AssetType.", ""), "field_type": str(row.asset_group_asset.field_type).replace("AssetFieldTypeEnum.AssetFieldType.", ""), "text": row.asset.text_asset.text if row.asset.text_asset else None, "primary_status": ps, "status": str(row.asset_group_asset.status).replace("AssetLinkStatusEnum.AssetLinkStatus.", "")})
+        return {"status": "success", "assets": results[:limit], "total_found": len(results), "status_summary": status_summary}
 
     else: return {"status": "error", "message": f"Unknown action: {action}"}
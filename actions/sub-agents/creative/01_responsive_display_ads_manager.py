@@ -102,7 +102,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def generate_rda_preview_html(ad_data):
     """Generate HTML preview for a Responsive Display Ad."""
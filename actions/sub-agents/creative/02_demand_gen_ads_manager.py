@@ -54,7 +54,7 @@ Response Shape — Ads
     {
       "ad_id": 123456789,
       "ad_name": "DemandGen-123456789",
-      "ad_type": "DISCOVERY_MULTI_ASSET_AD",
+      "ad_type": "DEMAND_GEN_MULTI_ASSET_AD",
       "status": "ENABLED",
       "approval_status": "APPROVED",
       "business_name": "...",
@@ -114,7 +114,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def generate_demand_gen_preview_html(ad_data, placement="discover"):
     """Generate HTML preview for Demand Gen ads across different placements."""
@@ -213,7 +213,7 @@ def list_demand_gen_campaigns(client, customer_id, date_range="LAST_30_DAYS"):
             metrics.cost_micros,
             metrics.conversions,
             metrics.conversions_value,
-            metrics.video_views
+            metrics.video_trueview_views
         FROM campaign
         WHERE campaign.advertising_channel_type = 'DEMAND_GEN'
             AND campaign.status != 'REMOVED'
@@ -238,7 +238,7 @@ def list_demand_gen_campaigns(client, customer_id, date_range="LAST_30_DAYS"):
                 "conversions": round(row.metrics.conversions, 2),
                 "revenue": round(row.metrics.conversions_value, 2),
                 "roas": round(roas, 2),
-                "video_views": row.metrics.video_views if row.metrics.video_views else 0
+                "video_views": row.metrics.video_trueview_views if row.metrics.video_trueview_views else 0
             }
         })
     return campaigns
@@ -265,23 +265,23 @@ def list_demand_gen_ads(client, customer_id, campaign_id=None, ad_group_id=None,
             ad_group_ad.ad.name,
             ad_group_ad.ad.type,
             ad_group_ad.ad.final_urls,
-            ad_group_ad.ad.discovery_multi_asset_ad.headlines,
-            ad_group_ad.ad.discovery_multi_asset_ad.descriptions,
-            ad_group_ad.ad.discovery_multi_asset_ad.marketing_images,
-            ad_group_ad.ad.discovery_multi_asset_ad.square_marketing_images,
-            ad_group_ad.ad.discovery_multi_asset_ad.portrait_marketing_images,
-            ad_group_ad.ad.discovery_multi_asset_ad.logo_images,
-            ad_group_ad.ad.discovery_multi_asset_ad.business_name,
-            ad_group_ad.ad.discovery_multi_asset_ad.call_to_action_text,
-            ad_group_ad.ad.discovery_carousel_ad.headlines,
-            ad_group_ad.ad.discovery_carousel_ad.description,
-            ad_group_ad.ad.discovery_carousel_ad.business_name,
-            ad_group_ad.ad.discovery_carousel_ad.logo_image,
-            ad_group_ad.ad.discovery_carousel_ad.call_to_action_text,
-            ad_group_ad.ad.discovery_video_responsive_ad.headlines,
-            ad_group_ad.ad.discovery_video_responsive_ad.long_headlines,
-            ad_group_ad.ad.discovery_video_responsive_ad.descriptions,
-            ad_group_ad.ad.discovery_video_responsive_ad.business_name,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.headlines,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.descriptions,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.marketing_images,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.square_marketing_images,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.portrait_marketing_images,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.logo_images,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.business_name,
+            ad_group_ad.ad.demand_gen_multi_asset_ad.call_to_action_text,
+            ad_group_ad.ad.demand_gen_carousel_ad.headline,
+            ad_group_ad.ad.demand_gen_carousel_ad.description,
+            ad_group_ad.ad.demand_gen_carousel_ad.business_name,
+            ad_group_ad.ad.demand_gen_carousel_ad.logo_image,
+            ad_group_ad.ad.demand_gen_carousel_ad.call_to_action_text,
+            ad_group_ad.ad.demand_gen_video_responsive_ad.headlines,
+            ad_group_ad.ad.demand_gen_video_responsive_ad.long_headlines,
+            ad_group_ad.ad.demand_gen_video_responsive_ad.descriptions,
+            ad_group_ad.ad.demand_gen_video_responsive_ad.business_name,
             ad_group_ad.status,
             ad_group_ad.policy_summary.approval_status,
             ad_group.id,
@@ -292,7 +292,7 @@ def list_demand_gen_ads(client, customer_id, campaign_id=None, ad_group_id=None,
             metrics.clicks,
             metrics.cost_micros,
             metrics.conversions,
-            metrics.video_views
+            metrics.video_trueview_views
         FROM ad_group_ad
         WHERE {" AND ".join(where_clauses)}
         ORDER BY metrics.impressions DESC
@@ -323,24 +323,24 @@ def list_demand_gen_ads(client, customer_id, campaign_id=None, ad_group_id=None,
         business_name = ""
         cta = "Learn More"
 
-        if ad.discovery_multi_asset_ad:
-            dma = ad.discovery_multi_asset_ad
+        if ad.demand_gen_multi_asset_ad:
+            dma = ad.demand_gen_multi_asset_ad
             headlines = [h.text for h in dma.headlines] if dma.headlines else []
             descriptions = [d.text for d in dma.descriptions] if dma.descriptions else []
             business_name = dma.business_name if dma.business_name else ""
             cta = dma.call_to_action_text if dma.call_to_action_text else "Learn More"
             marketing_images_count = len(dma.marketing_images) if dma.marketing_images else 0
             logo_count = len(dma.logo_images) if dma.logo_images else 0
-        elif ad.discovery_carousel_ad:
-            dca = ad.discovery_carousel_ad
-            headlines = [h.text for h in dca.headlines] if dca.headlines else []
+        elif ad.demand_gen_carousel_ad:
+            dca = ad.demand_gen_carousel_ad
+            headlines = [dca.headline.text] if dca.headline else []
             descriptions = [dca.description.text] if dca.description else []
             business_name = dca.business_name if dca.business_name else ""
             cta = dca.call_to_action_text if dca.call_to_action_text else "Learn More"
             marketing_images_count = 0
             logo_count = 1 if dca.logo_image else 0
-        elif ad.discovery_video_responsive_ad:
-            dvra = ad.discovery_video_responsive_ad
+        elif ad.demand_gen_video_responsive_ad:
+            dvra = ad.demand_gen_video_responsive_ad
             headlines = [h.text for h in dvra.headlines] if dvra.headlines else []
             descriptions = [d.text for d in dvra.descriptions] if dvra.descriptions else []
             business_name = dvra.business_name if dvra.business_name else ""
@@ -373,7 +373,7 @@ def list_demand_gen_ads(client, customer_id, campaign_id=None, ad_group_id=None,
                 "clicks": row.metrics.clicks,
                 "cost": round(row.metrics.cost_micros / 1000000, 2),
                 "conversions": round(row.metrics.conversions, 2),
-                "video_views": row.metrics.video_views if row.metrics.video_views else 0
+                "video_views": row.metrics.video_trueview_views if row.metrics.video_trueview_views else 0
             },
             "placements": ["YouTube", "YouTube Shorts", "Discover", "Gmail"]
         }
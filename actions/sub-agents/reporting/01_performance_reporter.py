@@ -4,6 +4,11 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.row_decoder import compile_row_decoder, decode_columns
+except ImportError:
+    compile_row_decoder = decode_columns = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +19,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def get_report_config(report_type):
     configs = {
@@ -91,7 +96,45 @@ def extract_value(obj, path):
         return current.name
     return current
 
-def run(customer_id, report_type, date_range="LAST_30_DAYS", login_customer_id=None, filters=None, metrics=None, limit=1000):
+def stream_rows(ga_service, customer_id, query):
+    """Yield GoogleAdsRows batch by batch from search_stream, so only one batch is held at a time."""
+    for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+        for row in batch.results:
+            yield row
+
+def decode_rows(rows, fields):
+    """Yield one flat dict per row: micros fields converted to currency, enums as names."""
+    if compile_row_decoder is not None:
+        # Field accessors compiled once for the whole report
+        yield from compile_row_decoder(fields).decode_all(rows)
+        return
+    for row in rows:
+        row_dict = {}
+        for field in fields:
+            value = extract_value(row, field)
+            if value is not None:
+                if "_micros" in field and isinstance(value, (int, float)):
+                    row_dict[field.replace("_micros", "")] = round(value / 1000000, 2)
+                elif isinstance(value, (int, float, str, bool)):
+                    row_dict[field] = value
+                else:
+                    row_dict[field] = str(value)
+        yield row_dict
+
+def summarize(totals):
+    impressions, clicks, cost, conversions = totals
+    return {
+        "total_impressions": impressions,
+        "total_clicks": clicks,
+        "total_cost": round(cost, 2),
+        "total_conversions": round(conversions, 2),
+        "overall_ctr": round((clicks / impressions * 100), 2) if impressions > 0 else 0,
+        "overall_cpc": round(cost / clicks, 2) if clicks > 0 else 0,
+        "overall_cpa": round(cost / conversions, 2) if conversions > 0 else 0
+    }
+
+def run(customer_id, report_type, date_range="LAST_30_DAYS", login_customer_id=None, filters=None, metrics=None, limit=1000,
+        result_format="records"):
     try:
         customer_id = str(customer_id).replace("-", "")
         if login_customer_id:
@@ -132,44 +175,35 @@ def run(customer_id, report_type, date_range="LAST_30_DAYS", login_customer_id=N
             LIMIT {limit}
         """
 
-        response = ga_service.search(customer_id=customer_id, query=query)
-
-        results = []
-        for row in response:
-            row_dict = {}
-            for field in all_fields:
-                value = extract_value(row, field)
-                if value is not None:
-                    if "_micros" in field and isinstance(value, (int, float)):
-                        row_dict[field.replace("_micros", "")] = round(value / 1000000, 2)
-                    elif isinstance(value, (int, float, str, bool)):
-                        row_dict[field] = value
-                    else:
-                        row_dict[field] = str(value)
-            results.append(row_dict)
-
-        summary = {}
-        if results:
-            total_impressions = sum(r.get("metrics.impressions", 0) or 0 for r in results)
-            total_clicks = sum(r.get("metrics.clicks", 0) or 0 for r in results)
-            total_cost = sum(r.get("metrics.cost", 0) or 0 for r in results)
-            total_conversions = sum(r.get("metrics.conversions", 0) or 0 for r in results)
-
-            summary = {
-                "total_impressions": total_impressions,
-                "total_clicks": total_clicks,
-                "total_cost": round(total_cost, 2),
-                "total_conversions": round(total_conversions, 2),
-                "overall_ctr": round((total_clicks / total_impressions * 100), 2) if total_impressions > 0 else 0,
-                "overall_cpc": round(total_cost / total_clicks, 2) if total_clicks > 0 else 0,
-                "overall_cpa": round(total_cost / total_conversions, 2) if total_conversions > 0 else 0
-            }
+        rows = stream_rows(ga_service, customer_id, query)
+        if decode_columns is not None:
+            # Decoded column-wise: the summary is computed over whole columns and
+            # row dicts are only built for the output
+            report = decode_columns(rows, all_fields)
+            row_count = len(report)
+            summary = report.summary()
+            results = report.table() if result_format == "columnar" else report.records()
+        else:
+            # Standalone: rows are decoded and totalled as they stream in (one pass,
+            # no proto row list). Cost percentiles, ROAS and result_format="columnar"
+            # come from deploy.report_columns and are left out here.
+            results = []
+            impressions = clicks = cost = conversions = 0
+            for row_dict in decode_rows(rows, all_fields):
+                impressions += row_dict.get("metrics.impressions", 0) or 0
+                clicks += row_dict.get("metrics.clicks", 0) or 0
+                cost += row_dict.get("metrics.cost", 0) or 0
+                conversions += row_dict.get("metrics.conversions", 0) or 0
+                results.append(row_dict)
+
+            row_count = len(results)
+            summary = summarize((impressions, clicks, cost, conversions)) if results else {}
 
         return {
             "status": "success",
             "report_type": report_type,
             "date_range": date_range,
-            "row_count": len(results),
+            "row_count": row_count,
             "summary": summary,
             "results": results
         }
@@ -4,6 +4,12 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.report_columns import columnar_result
+    from deploy.row_decoder import compile_row_decoder, decode_columns
+except ImportError:
+    columnar_result = compile_row_decoder = decode_columns = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +20,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def extract_value(obj, path):
     parts = path.split('.')
@@ -28,67 +34,164 @@ def extract_value(obj, path):
         return current.name
     return current
 
-def get_search_terms(client, customer_id, date_range, campaign_ids=None, limit=5000):
-    ga_service = client.get_service("GoogleAdsService")
-
+SEARCH_TERM_FIELDS = [
+    "search_term_view.search_term",
+    "search_term_view.status",
+    "campaign.id",
+    "campaign.name",
+    "ad_group.id",
+    "ad_group.name",
+    "segments.keyword.info.text",
+    "segments.keyword.info.match_type",
+    "metrics.impressions",
+    "metrics.clicks",
+    "metrics.cost_micros",
+    "metrics.conversions",
+    "metrics.conversions_value"
+]
+
+def row_decoder(fields):
+    """Row → {field: value} with enums as names and cost_micros as metrics.cost."""
+    if compile_row_decoder is not None:
+        return compile_row_decoder(fields)
+
+    def decode(row):
+        values = {}
+        for field in fields:
+            value = extract_value(row, field)
+            if value is None:
+                continue
+            if "_micros" in field and isinstance(value, (int, float)):
+                values[field.replace("_micros", "")] = round(value / 1000000, 2)
+            else:
+                values[field] = value
+        return values
+    return decode
+
+def search_terms_query(date_range, campaign_ids=None, limit=5000):
     where_clauses = [f"segments.date DURING {date_range}", "metrics.impressions > 0"]
     if campaign_ids:
         ids = ", ".join(str(i) for i in campaign_ids)
         where_clauses.append(f"campaign.id IN ({ids})")
 
-    query = f"""
-        SELECT
-            search_term_view.search_term,
-            search_term_view.status,
-            campaign.id,
-            campaign.name,
-            ad_group.id,
-            ad_group.name,
-            segments.keyword.info.text,
-            segments.keyword.info.match_type,
-            metrics.impressions,
-            metrics.clicks,
-            metrics.cost_micros,
-            metrics.conversions,
-            metrics.conversions_value
+    return f"""
+        SELECT {", ".join(SEARCH_TERM_FIELDS)}
         FROM search_term_view
         WHERE {" AND ".join(where_clauses)}
         ORDER BY metrics.cost_micros DESC
         LIMIT {limit}
     """
 
-    results = []
-    response = ga_service.search(customer_id=customer_id, query=query)
-
-    for row in response:
-        results.append({
-            "search_term": row.search_term_view.search_term,
-            "status": str(row.search_term_view.status.name) if row.search_term_view.status else "UNKNOWN",
-            "campaign_id": row.campaign.id,
-            "campaign_name": row.campaign.name,
-            "ad_group_id": row.ad_group.id,
-            "ad_group_name": row.ad_group.name,
-            "matched_keyword": row.segments.keyword.info.text if row.segments.keyword.info.text else "",
-            "match_type": str(row.segments.keyword.info.match_type.name) if row.segments.keyword.info.match_type else "UNKNOWN",
-            "impressions": row.metrics.impressions,
-            "clicks": row.metrics.clicks,
-            "cost": round(row.metrics.cost_micros / 1000000, 2),
-            "conversions": round(row.metrics.conversions, 2),
-            "conversion_value": round(row.metrics.conversions_value, 2)
-        })
-
-    return results
+def stream_batches(client, customer_id, query):
+    """Yield the GoogleAdsRows of each search_stream batch, one batch held at a time."""
+    ga_service = client.get_service("GoogleAdsService")
+    for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+        yield batch.results
+
+def stream_rows(client, customer_id, query):
+    """Yield GoogleAdsRows from search_stream, one batch held at a time."""
+    for results in stream_batches(client, customer_id, query):
+        for row in results:
+            yield row
+
+def search_term_from_values(values):
+    status = values.get("search_term_view.status")
+    match_type = values.get("segments.keyword.info.match_type")
+    return {
+        "search_term": values.get("search_term_view.search_term", ""),
+        "status": status if status and status != "UNSPECIFIED" else "UNKNOWN",
+        "campaign_id": values.get("campaign.id"),
+        "campaign_name": values.get("campaign.name"),
+        "ad_group_id": values.get("ad_group.id"),
+        "ad_group_name": values.get("ad_group.name"),
+        "matched_keyword": values.get("segments.keyword.info.text") or "",
+        "match_type": match_type if match_type and match_type != "UNSPECIFIED" else "UNKNOWN",
+        "impressions": values.get("metrics.impressions", 0),
+        "clicks": values.get("metrics.clicks", 0),
+        "cost": values.get("metrics.cost", 0),
+        "conversions": round(values.get("metrics.conversions", 0), 2),
+        "conversion_value": round(values.get("metrics.conversions_value", 0), 2)
+    }
 
-def analyze_wasted_spend(search_terms, min_cost=10, min_clicks=5):
-    wasted = []
-    for term in search_terms:
-        if term["conversions"] == 0 and term["cost"] >= min_cost and term["clicks"] >= min_clicks:
-            wasted.append({
-                **term,
-                "recommendation": "PAUSE or ADD_NEGATIVE",
-                "potential_savings": term["cost"]
-            })
+def iter_search_terms(client, customer_id, date_range, campaign_ids=None, limit=5000):
+    """Yield search terms as they stream in from search_stream, one batch held at a time."""
+    decode = row_decoder(SEARCH_TERM_FIELDS)
+    query = search_terms_query(date_range, campaign_ids, limit)
+    for row in stream_rows(client, customer_id, query):
+        yield search_term_from_values(decode(row))
+
+def iter_search_term_columns(client, customer_id, date_range, campaign_ids=None, limit=5000):
+    """
+    Yield one search_stream batch at a time decoded column-wise
+    (deploy.report_columns.ReportColumns), so the analyses can run as column
+    masks without holding more than a batch of rows.
+    """
+    query = search_terms_query(date_range, campaign_ids, limit)
+    for results in stream_batches(client, customer_id, query):
+        report = decode_columns(results, SEARCH_TERM_FIELDS)
+        report.round("metrics.conversions", 2)
+        report.round("metrics.conversions_value", 2)
+        yield report
 
+def get_search_terms(client, customer_id, date_range, campaign_ids=None, limit=5000):
+    return list(iter_search_terms(client, customer_id, date_range, campaign_ids, limit))
+
+NEGATIVE_INDICATORS = [
+    "free", "cheap", "download", "torrent", "crack", "hack",
+    "reddit", "youtube", "video", "tutorial", "how to",
+    "job", "jobs", "career", "salary", "interview",
+    "wiki", "wikipedia", "definition", "meaning"
+]
+
+def wasted_spend_entry(term, min_cost=10, min_clicks=5):
+    if term["conversions"] == 0 and term["cost"] >= min_cost and term["clicks"] >= min_clicks:
+        return {
+            **term,
+            "recommendation": "PAUSE or ADD_NEGATIVE",
+            "potential_savings": term["cost"]
+        }
+    return None
+
+def opportunity_entry(term, min_conversions=1):
+    if term["conversions"] >= min_conversions and term["status"] != "ADDED":
+        cpa = term["cost"] / term["conversions"] if term["conversions"] > 0 else 0
+        roas = term["conversion_value"] / term["cost"] if term["cost"] > 0 else 0
+        return {
+            **term,
+            "cpa": round(cpa, 2),
+            "roas": round(roas, 2),
+            "recommendation": "ADD_AS_KEYWORD",
+            "suggested_match_type": "PHRASE" if term["clicks"] < 50 else "EXACT"
+        }
+    return None
+
+def negative_entry(term, min_clicks=3):
+    search_lower = term["search_term"].lower()
+
+    is_negative_candidate = False
+    matched_indicator = None
+
+    for indicator in NEGATIVE_INDICATORS:
+        if indicator in search_lower:
+            is_negative_candidate = True
+            matched_indicator = indicator
+            break
+
+    if term["clicks"] >= min_clicks and term["conversions"] == 0:
+        is_negative_candidate = True
+        if not matched_indicator:
+            matched_indicator = "zero_conversions"
+
+    if is_negative_candidate and term["status"] != "EXCLUDED":
+        return {
+            **term,
+            "reason": matched_indicator,
+            "recommendation": "ADD_AS_NEGATIVE",
+            "suggested_level": "CAMPAIGN" if term["clicks"] > 10 else "AD_GROUP"
+        }
+    return None
+
+def summarize_wasted_spend(wasted):
     wasted.sort(key=lambda x: x["cost"], reverse=True)
     total_waste = sum(t["cost"] for t in wasted)
 
@@ -98,20 +201,7 @@ def analyze_wasted_spend(search_terms, min_cost=10, min_clicks=5):
         "terms": wasted[:100]
     }
 
-def analyze_opportunities(search_terms, min_conversions=1):
-    opportunities = []
-    for term in search_terms:
-        if term["conversions"] >= min_conversions and term["status"] != "ADDED":
-            cpa = term["cost"] / term["conversions"] if term["conversions"] > 0 else 0
-            roas = term["conversion_value"] / term["cost"] if term["cost"] > 0 else 0
-            opportunities.append({
-                **term,
-                "cpa": round(cpa, 2),
-                "roas": round(roas, 2),
-                "recommendation": "ADD_AS_KEYWORD",
-                "suggested_match_type": "PHRASE" if term["clicks"] < 50 else "EXACT"
-            })
-
+def summarize_opportunities(opportunities):
     opportunities.sort(key=lambda x: x["conversions"], reverse=True)
 
     return {
@@ -120,40 +210,7 @@ def analyze_opportunities(search_terms, min_conversions=1):
         "terms": opportunities[:100]
     }
 
-def analyze_negatives(search_terms, min_clicks=3):
-    negative_indicators = [
-        "free", "cheap", "download", "torrent", "crack", "hack",
-        "reddit", "youtube", "video", "tutorial", "how to",
-        "job", "jobs", "career", "salary", "interview",
-        "wiki", "wikipedia", "definition", "meaning"
-    ]
-
-    negatives = []
-    for term in search_terms:
-        search_lower = term["search_term"].lower()
-
-        is_negative_candidate = False
-        matched_indicator = None
-
-        for indicator in negative_indicators:
-            if indicator in search_lower:
-                is_negative_candidate = True
-                matched_indicator = indicator
-                break
-
-        if term["clicks"] >= min_clicks and term["conversions"] == 0:
-            is_negative_candidate = True
-            if not matched_indicator:
-                matched_indicator = "zero_conversions"
-
-        if is_negative_candidate and term["status"] != "EXCLUDED":
-            negatives.append({
-                **term,
-                "reason": matched_indicator,
-                "recommendation": "ADD_AS_NEGATIVE",
-                "suggested_level": "CAMPAIGN" if term["clicks"] > 10 else "AD_GROUP"
-            })
-
+def summarize_negatives(negatives):
     negatives.sort(key=lambda x: x["cost"], reverse=True)
 
     return {
@@ -162,8 +219,101 @@ def analyze_negatives(search_terms, min_clicks=3):
         "terms": negatives[:100]
     }
 
+def analyze_wasted_spend(search_terms, min_cost=10, min_clicks=5):
+    entries = (wasted_spend_entry(term, min_cost, min_clicks) for term in search_terms)
+    return summarize_wasted_spend([entry for entry in entries if entry])
+
+def analyze_opportunities(search_terms, min_conversions=1):
+    entries = (opportunity_entry(term, min_conversions) for term in search_terms)
+    return summarize_opportunities([entry for entry in entries if entry])
+
+def analyze_negatives(search_terms, min_clicks=3):
+    entries = (negative_entry(term, min_clicks) for term in search_terms)
+    return summarize_negatives([entry for entry in entries if entry])
+
+def analyze_stream(search_terms, wanted, min_cost, min_clicks, min_conversions):
+    """
+    One streaming pass: totals and the requested analyses are accumulated per
+    term, so only the flagged terms are kept in memory. Used when deploy isn't
+    importable; analyze_column_batches() does the same per batch with
+    vectorized candidate masks.
+    """
+    wasted, opportunities, negatives = [], [], []
+    total_search_terms = 0
+    total_cost = total_conversions = 0
+
+    for term in search_terms:
+        total_search_terms += 1
+        total_cost += term["cost"]
+        total_conversions += term["conversions"]
+        if wanted["wasted_spend"]:
+            entry = wasted_spend_entry(term, min_cost, min_clicks)
+            if entry:
+                wasted.append(entry)
+        if wanted["opportunities"]:
+            entry = opportunity_entry(term, min_conversions)
+            if entry:
+                opportunities.append(entry)
+        if wanted["negatives"]:
+            entry = negative_entry(term, min_clicks)
+            if entry:
+                negatives.append(entry)
+
+    return (total_search_terms, total_cost, total_conversions), wasted, opportunities, negatives
+
+def analyze_columns(report, wanted, min_cost, min_clicks, min_conversions):
+    """
+    Same result as analyze_stream() from a columnar report: candidates are
+    picked with vectorized masks and only they are turned into term dicts.
+    """
+    def entries(indices, make_entry):
+        terms = (search_term_from_values(values) for values in report.records(indices))
+        return [entry for entry in (make_entry(term) for term in terms) if entry]
+
+    wasted, opportunities, negatives = [], [], []
+    if wanted["wasted_spend"]:
+        indices = report.where(
+            ("metrics.conversions", "==", 0), ("metrics.cost", ">=", min_cost), ("metrics.clicks", ">=", min_clicks)
+        )
+        wasted = entries(indices, lambda term: wasted_spend_entry(term, min_cost, min_clicks))
+    if wanted["opportunities"]:
+        indices = report.where(("metrics.conversions", ">=", min_conversions), ("search_term_view.status", "!=", "ADDED"))
+        opportunities = entries(indices, lambda term: opportunity_entry(term, min_conversions))
+    if wanted["negatives"]:
+        candidates = set(report.where(("metrics.clicks", ">=", min_clicks), ("metrics.conversions", "==", 0)))
+        for index, search_term in enumerate(report.column("search_term_view.search_term")):
+            search_lower = search_term.lower()
+            if any(indicator in search_lower for indicator in NEGATIVE_INDICATORS):
+                candidates.add(index)
+        negatives = entries(sorted(candidates), lambda term: negative_entry(term, min_clicks))
+
+    totals = (len(report), report.total("metrics.cost"), report.total("metrics.conversions"))
+    return totals, wasted, opportunities, negatives
+
+def analyze_column_batches(reports, wanted, min_cost, min_clicks, min_conversions):
+    """
+    analyze_columns() over each batch from iter_search_term_columns(): totals
+    are summed and only the flagged terms are kept across batches.
+    """
+    wasted, opportunities, negatives = [], [], []
+    total_search_terms = 0
+    total_cost = total_conversions = 0
+
+    for report in reports:
+        totals, batch_wasted, batch_opportunities, batch_negatives = analyze_columns(
+            report, wanted, min_cost, min_clicks, min_conversions
+        )
+        total_search_terms += totals[0]
+        total_cost += totals[1]
+        total_conversions += totals[2]
+        wasted.extend(batch_wasted)
+        opportunities.extend(batch_opportunities)
+        negatives.extend(batch_negatives)
+
+    return (total_search_terms, total_cost, total_conversions), wasted, opportunities, negatives
+
 def run(customer_id, analysis_type="all", date_range="LAST_30_DAYS", login_customer_id=None,
-        min_cost=10, min_clicks=5, min_conversions=1, campaign_ids=None):
+        min_cost=10, min_clicks=5, min_conversions=1, campaign_ids=None, result_format="records"):
     try:
         customer_id = str(customer_id).replace("-", "")
         if login_customer_id:
@@ -171,9 +321,24 @@ def run(customer_id, analysis_type="all", date_range="LAST_30_DAYS", login_custo
 
         client = get_client(login_customer_id)
 
-        search_terms = get_search_terms(client, customer_id, date_range, campaign_ids)
+        wanted = {
+            "wasted_spend": analysis_type in ["wasted_spend", "all"],
+            "opportunities": analysis_type in ["opportunities", "all"],
+            "negatives": analysis_type in ["negatives", "all"],
+        }
+        if decode_columns is not None:
+            reports = iter_search_term_columns(client, customer_id, date_range, campaign_ids)
+            totals, wasted, opportunities, negatives = analyze_column_batches(
+                reports, wanted, min_cost, min_clicks, min_conversions
+            )
+        else:
+            search_terms = iter_search_terms(client, customer_id, date_range, campaign_ids)
+            totals, wasted, opportunities, negatives = analyze_stream(
+                search_terms, wanted, min_cost, min_clicks, min_conversions
+            )
+        total_search_terms, total_cost, total_conversions = totals
 
-        if not search_terms:
+        if not total_search_terms:
             return {
                 "status": "success",
                 "message": "No search term data found for the specified criteria",
@@ -184,19 +349,22 @@ def run(customer_id, analysis_type="all", date_range="LAST_30_DAYS", login_custo
             "status": "success",
             "customer_id": customer_id,
             "date_range": date_range,
-            "total_search_terms": len(search_terms),
-            "total_cost": round(sum(t["cost"] for t in search_terms), 2),
-            "total_conversions": round(sum(t["conversions"] for t in search_terms), 2)
+            "total_search_terms": total_search_terms,
+            "total_cost": round(total_cost, 2),
+            "total_conversions": round(total_conversions, 2)
         }
 
-        if analysis_type in ["wasted_spend", "all"]:
-            result["wasted_spend"] = analyze_wasted_spend(search_terms, min_cost, min_clicks)
+        if wanted["wasted_spend"]:
+            result["wasted_spend"] = summarize_wasted_spend(wasted)
+
+        if wanted["opportunities"]:
+            result["opportunities"] = summarize_opportunities(opportunities)
 
-        if analysis_type in ["opportunities", "all"]:
-            result["opportunities"] = analyze_opportunities(search_terms, min_conversions)
+        if wanted["negatives"]:
+            result["negatives"] = summarize_negatives(negatives)
 
-        if analysis_type in ["negatives", "all"]:
-            result["negatives"] = analyze_negatives(search_terms, min_clicks)
+        if result_format == "columnar" and columnar_result is not None:
+            return columnar_result(result)
 
         return result
 
@@ -4,6 +4,11 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.report_columns import columnar_result
+except ImportError:
+    columnar_result = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +19,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v18")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def get_sort_field(sort_by):
     sort_map = {
@@ -280,7 +285,7 @@ def get_ad_detail(client, customer_id, ad_group_id, ad_id, date_range="LAST_30_D
 
     return None
 
-def run(customer_id, action="view_ads", login_customer_id=None, campaign_id=None, ad_group_id=None,
+def run_report(customer_id, action="view_ads", login_customer_id=None, campaign_id=None, ad_group_id=None,
         batch_size=3, page=1, sort_by="impressions", sort_order="desc", filters=None,
         ad_id=None, date_range="LAST_30_DAYS"):
     try:
@@ -328,3 +333,12 @@ def run(customer_id, action="view_ads", login_customer_id=None, campaign_id=None
         return {"status": "error", "request_id": ex.request_id, "errors": errors}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+def run(customer_id, action="view_ads", login_customer_id=None, campaign_id=None, ad_group_id=None,
+        batch_size=3, page=1, sort_by="impressions", sort_order="desc", filters=None,
+        ad_id=None, date_range="LAST_30_DAYS", result_format="records"):
+    result = run_report(customer_id, action, login_customer_id, campaign_id, ad_group_id,
+                        batch_size, page, sort_by, sort_order, filters, ad_id, date_range)
+    if result_format == "columnar" and columnar_result is not None and result.get("status") == "success":
+        return columnar_result(result)
+    return result
@@ -4,6 +4,11 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.report_columns import columnar_result
+except ImportError:
+    columnar_result = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +19,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def get_auction_insights_by_campaign(client, customer_id, date_range, campaign_ids=None):
     ga_service = client.get_service("GoogleAdsService")
@@ -73,7 +78,7 @@ def get_auction_insights_summary(client, customer_id, date_range):
     competitors.sort(key=lambda x: x["impression_share"], reverse=True)
     return {"your_performance": your_metrics, "top_competitors": competitors[:20]}
 
-def run(customer_id, date_range="LAST_30_DAYS", login_customer_id=None, campaign_ids=None, ad_group_ids=None):
+def run_report(customer_id, date_range="LAST_30_DAYS", login_customer_id=None, campaign_ids=None, ad_group_ids=None):
     try:
         customer_id = str(customer_id).replace("-", "")
         if login_customer_id:
@@ -103,3 +108,10 @@ def run(customer_id, date_range="LAST_30_DAYS", login_customer_id=None, campaign
         return {"status": "error", "request_id": ex.request_id, "errors": errors}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+def run(customer_id, date_range="LAST_30_DAYS", login_customer_id=None, campaign_ids=None, ad_group_ids=None,
+        result_format="records"):
+    result = run_report(customer_id, date_range, login_customer_id, campaign_ids, ad_group_ids)
+    if result_format == "columnar" and columnar_result is not None and result.get("status") == "success":
+        return columnar_result(result)
+    return result
@@ -4,6 +4,11 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.report_columns import columnar_result
+except ImportError:
+    columnar_result = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +19,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def get_change_summary(client, customer_id, date_range, resource_type=None, limit=500):
     ga_service = client.get_service("GoogleAdsService")
@@ -131,7 +136,7 @@ def get_change_details(client, customer_id, date_range, limit=100):
 
     return results
 
-def run(customer_id, date_range="LAST_7_DAYS", login_customer_id=None, resource_type=None, 
+def run_report(customer_id, date_range="LAST_7_DAYS", login_customer_id=None, resource_type=None, 
         change_type=None, detailed=False, limit=500):
     try:
         customer_id = str(customer_id).replace("-", "")
@@ -176,3 +181,10 @@ def run(customer_id, date_range="LAST_7_DAYS", login_customer_id=None, resource_
         return {"status": "error", "request_id": ex.request_id, "errors": errors}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+def run(customer_id, date_range="LAST_7_DAYS", login_customer_id=None, resource_type=None,
+        change_type=None, detailed=False, limit=500, result_format="records"):
+    result = run_report(customer_id, date_range, login_customer_id, resource_type, change_type, detailed, limit)
+    if result_format == "columnar" and columnar_result is not None and result.get("status") == "success":
+        return columnar_result(result)
+    return result
@@ -4,6 +4,11 @@ except ImportError:
     from google.ads.googleads.client import GoogleAdsClient
     from google.ads.googleads.errors import GoogleAdsException
 
+try:
+    from deploy.report_columns import columnar_result
+except ImportError:
+    columnar_result = None
+
 def get_client(login_customer_id=None):
     credentials = {
         "developer_token": secrets["DEVELOPER_TOKEN"],
@@ -14,7 +19,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v19")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def generate_pmax_preview_html(asset_group_data, channel="search"):
     """Generate HTML preview for Performance Max asset groups across channels."""
@@ -226,7 +231,7 @@ def get_asset_performance(client, customer_id, campaign_id=None, asset_group_id=
             asset_group.name,
             asset_group_asset.asset,
             asset_group_asset.field_type,
-            asset_group_asset.performance_label,
+            asset_group_asset.primary_status,
             asset_group_asset.status,
             asset.id,
             asset.name,
@@ -235,19 +240,20 @@ def get_asset_performance(client, customer_id, campaign_id=None, asset_group_id=
             asset.image_asset.full_size.url
         FROM asset_group_asset
         WHERE {where}
-        ORDER BY asset_group_asset.performance_label DESC
         LIMIT {limit}
     """
 
     assets = []
-    performance_summary = {"BEST": 0, "GOOD": 0, "LOW": 0, "LEARNING": 0, "PENDING": 0, "UNKNOWN": 0}
+    # Asset performance labels were removed from the API (v21+); primary_status says
+    # whether each asset is serving, limited or not eligible
+    status_summary = {"ELIGIBLE": 0, "LIMITED": 0, "NOT_ELIGIBLE": 0, "PENDING": 0, "PAUSED": 0, "REMOVED": 0, "UNKNOWN": 0}
 
     for row in ga_service.search(customer_id=customer_id, query=query):
         aga = row.asset_group_asset
         asset = row.asset
 
-        perf_label = str(aga.performance_label.name) if aga.performance_label else "UNKNOWN"
-        performance_summary[perf_label] = performance_summary.get(perf_label, 0) + 1
+        primary_status = str(aga.primary_status.name) if aga.primary_status else "UNKNOWN"
+        status_summary[primary_status] = status_summary.get(primary_status, 0) + 1
 
         # Get asset content
         content = ""
@@ -265,16 +271,16 @@ def get_asset_performance(client, customer_id, campaign_id=None, asset_group_id=
             "asset_name": asset.name if asset.name else "",
             "asset_type": str(asset.type_.name) if asset.type_ else "UNKNOWN",
             "field_type": str(aga.field_type.name) if aga.field_type else "UNKNOWN",
-            "performance_label": perf_label,
+            "primary_status": primary_status,
             "status": str(aga.status.name) if aga.status else "UNKNOWN",
             "content": content[:200] if content else ""
         })
 
-    # Sort by performance
-    perf_order = {"BEST": 0, "GOOD": 1, "LOW": 2, "LEARNING": 3, "PENDING": 4, "UNKNOWN": 5}
-    assets.sort(key=lambda x: perf_order.get(x["performance_label"], 5))
+    # Assets that need attention first
+    status_order = {"NOT_ELIGIBLE": 0, "LIMITED": 1, "PENDING": 2, "ELIGIBLE": 3, "PAUSED": 4, "REMOVED": 5, "UNKNOWN": 6}
+    assets.sort(key=lambda x: status_order.get(x["primary_status"], 6))
 
-    return {"assets": assets, "performance_summary": performance_summary, "total": len(assets)}
+    return {"assets": assets, "status_summary": status_summary, "total": len(assets)}
 
 def get_pmax_search_terms(client, customer_id, campaign_id=None, date_range="LAST_30_DAYS", limit=100):
     ga_service = client.get_service("GoogleAdsService")
@@ -436,7 +442,7 @@ def get_asset_group_previews(client, customer_id, campaign_id=None, page=1, page
         }
     }
 
-def run(customer_id, action="get_full_report", login_customer_id=None, campaign_id=None, asset_group_id=None,
+def run_report(customer_id, action="get_full_report", login_customer_id=None, campaign_id=None, asset_group_id=None,
         page=1, date_range="LAST_30_DAYS", include_previews=True):
     try:
         customer_id = str(customer_id).replace("-", "")
@@ -499,3 +505,11 @@ def run(customer_id, action="get_full_report", login_customer_id=None, campaign_
         return {"status": "error", "request_id": ex.request_id, "errors": errors}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+def run(customer_id, action="get_full_report", login_customer_id=None, campaign_id=None, asset_group_id=None,
+        page=1, date_range="LAST_30_DAYS", include_previews=True, result_format="records"):
+    result = run_report(customer_id, action, login_customer_id, campaign_id, asset_group_id,
+                        page, date_range, include_previews)
+    if result_format == "columnar" and columnar_result is not None and result.get("status") == "success":
+        return columnar_result(result)
+    return result
@@ -23,7 +23,7 @@ def get_client(login_customer_id=None):
     }
     if login_customer_id:
         credentials["login_customer_id"] = str(login_customer_id).replace("-", "")
-    return GoogleAdsClient.load_from_dict(credentials, version="v18")
+    return GoogleAdsClient.load_from_dict(credentials, version="v23")
 
 def generate_keyword_ideas(client, customer_id, keywords=None, url=None, language_id="1000", geo_target_ids=None, limit=100):
     keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
@@ -0,0 +1,233 @@
+"""
+Google Ads API Agent — Benchmark Fakes
+Stand-ins for the two network dependencies of the agent loop, so benchmarks
+measure the orchestrator, executor and action code and nothing else.
+
+1. ScriptedAnthropic / ScriptedAsyncAnthropic — answer messages.create() from
+   a script: each chat turn plays the same predetermined rounds of tool_use
+   blocks, then a final text answer. The round is derived from the messages
+   sent, so one client serves any number of sessions and threads.
+2. SyntheticAdsBackend — an offline Google Ads backend (see
+   deploy/ads_backend.py) that answers search/search_stream with generated
+   GoogleAdsRows and mutate_* with a result per operation.
+
+Usage:
+    from benchmarks.fakes import DEFAULT_SCRIPT, SyntheticAdsBackend, make_agent
+
+    agent = make_agent(DEFAULT_SCRIPT, SyntheticAdsBackend(rows=50))
+    agent.chat("How are my budgets doing?")
+"""
+
+import time
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional
+
+from anthropic.types import Message, TextBlock, ToolUseBlock, Usage
+
+from deploy.ads_backend import AdsBackend, ReplayBackend, _MaterializedResponse
+
+BENCH_CUSTOMER_ID = "1234567890"
+
+# One chat turn: rounds of tool calls (run concurrently within a round), then text
+DEFAULT_SCRIPT: List[List[Dict[str, Any]]] = [
+    [
+        {"name": "campaign_adgroup_manager", "input": {"action": "list_campaigns", "customer_id": BENCH_CUSTOMER_ID}},
+        {"name": "budget_manager", "input": {"action": "list_budgets", "customer_id": BENCH_CUSTOMER_ID}},
+    ],
+    [
+        {"name": "search_term_manager", "input": {
+            "action": "list_search_terms", "customer_id": BENCH_CUSTOMER_ID, "date_range": "LAST_30_DAYS",
+        }},
+    ],
+    [
+        {"name": "budget_manager", "input": {
+            "action": "update_budget", "customer_id": BENCH_CUSTOMER_ID, "budget_id": "111", "amount": 50.0,
+        }},
+    ],
+]
+FINAL_TEXT = "Budgets reviewed: 2 campaigns are limited by budget; I raised the shared budget to $50/day."
+
+BENCH_CREDENTIALS = {
+    "GOOGLE_ADS_DEVELOPER_TOKEN": "benchmark",
+    "GOOGLE_ADS_CLIENT_ID": "benchmark",
+    "GOOGLE_ADS_CLIENT_SECRET": "benchmark",
+    "GOOGLE_ADS_REFRESH_TOKEN": "benchmark",
+    "GOOGLE_ADS_LOGIN_CUSTOMER_ID": BENCH_CUSTOMER_ID,
+}
+
+
+# =============================================================================
+# ANTHROPIC
+# =============================================================================
+
+def _round_index(messages: List[Dict[str, Any]]) -> int:
+    """Assistant turns since the last message typed by the user."""
+    rounds = 0
+    for message in reversed(messages):
+        content = message["content"]
+        if message["role"] == "assistant":
+            rounds += 1
+        elif isinstance(content, str) or not any(
+            isinstance(block, dict) and block.get("type") == "tool_result" for block in content
+        ):
+            break
+    return rounds
+
+
+class _ScriptedMessages:
+    def __init__(self, script: List[List[Dict[str, Any]]], latency: float, model_tokens: int):
+        self.script = script
+        self.latency = latency
+        self.model_tokens = model_tokens
+        self._ids = itertools.count(1)
+        self.calls = 0
+
+    def _respond(self, model: str, messages: List[Dict[str, Any]]) -> Message:
+        self.calls += 1
+        index = _round_index(messages)
+        if index < len(self.script):
+            content = [
+                ToolUseBlock(type="tool_use", id=f"toolu_bench_{next(self._ids)}", name=call["name"], input=call["input"])
+                for call in self.script[index]
+            ]
+            stop_reason = "tool_use"
+        else:
+            content = [TextBlock(type="text", text=FINAL_TEXT)]
+            stop_reason = "end_turn"
+        return Message(
+            id=f"msg_bench_{next(self._ids)}", type="message", role="assistant", model=model,
+            content=content, stop_reason=stop_reason, stop_sequence=None,
+            usage=Usage(input_tokens=self.model_tokens, output_tokens=120),
+        )
+
+    def create(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Message:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(model, messages)
+
+
+class _AsyncScriptedMessages(_ScriptedMessages):
+    async def create(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Message:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(model, messages)
+
+
+class ScriptedAnthropic:
+    """Replaces anthropic.Anthropic: messages.create() plays the script."""
+
+    def __init__(self, script=DEFAULT_SCRIPT, latency: float = 0.0, model_tokens: int = 4000):
+        self.messages = _ScriptedMessages(script, latency, model_tokens)
+
+
+class ScriptedAsyncAnthropic:
+    """Replaces anthropic.AsyncAnthropic: awaitable messages.create() plays the script."""
+
+    def __init__(self, script=DEFAULT_SCRIPT, latency: float = 0.0, model_tokens: int = 4000):
+        self.messages = _AsyncScriptedMessages(script, latency, model_tokens)
+
+
+# =============================================================================
+# GOOGLE ADS
+# =============================================================================
+
+class SyntheticAdsBackend(ReplayBackend):
+    """
+    Offline backend that invents responses instead of reading fixtures:
+    `rows` GoogleAdsRows per search, one result per mutate operation.
+    """
+
+    def __init__(self, rows: int = 50, latency: float = 0.0):
+        super().__init__(fixtures_dir=".", latency=latency)
+        self.rows = rows
+        self._row_cache: Dict[Optional[str], List[Any]] = {}
+
+    def _make_rows(self, client: Any) -> List[Any]:
+        rows = []
+        for index in range(self.rows):
+            row = client.get_type("GoogleAdsRow")
+            row.customer.id = int(BENCH_CUSTOMER_ID)
+            row.customer.descriptive_name = "Benchmark Account"
+            row.campaign.id = 1000 + index % 10
+            row.campaign.name = f"Campaign {index % 10}"
+            row.campaign.status = client.enums.CampaignStatusEnum.ENABLED
+            row.campaign_budget.id = 111 + index % 3
+            row.campaign_budget.name = f"Budget {index % 3}"
+            row.campaign_budget.amount_micros = 25_000_000 + 1_000_000 * (index % 3)
+            row.ad_group.id = 5000 + index
+            row.ad_group.name = f"Ad group {index}"
+            row.search_term_view.search_term = f"benchmark query {index}"
+            row.metrics.impressions = 1000 + 37 * index
+            row.metrics.clicks = 40 + index
+            row.metrics.cost_micros = 12_500_000 + 250_000 * index
+            row.metrics.conversions = float(index % 7)
+            row.metrics.conversions_value = 42.0 * (index % 7)
+            row.segments.date = "2025-01-15"
+            rows.append(row)
+        return rows
+
+    def _rows(self, client: Any) -> List[Any]:
+        with self._lock:
+            rows = self._row_cache.get(None)
+            if rows is None:
+                rows = self._row_cache[None] = self._make_rows(client)
+        return list(rows)
+
+    def respond(self, service: str, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.replayed += 1
+        client = self.client()._client
+        if method == "search":
+            return _MaterializedResponse(self._rows(client))
+        if method == "search_stream":
+            batch = client.get_type("SearchGoogleAdsStreamResponse")
+            batch.results.extend(self._rows(client))
+            return _MaterializedResponse([batch])
+        if method.startswith("mutate"):
+            return self._mutate_response(client, method, kwargs)
+        if method == "list_accessible_customers":
+            response = client.get_type("ListAccessibleCustomersResponse")
+            response.resource_names.append(f"customers/{BENCH_CUSTOMER_ID}")
+            return response
+        raise NotImplementedError(f"SyntheticAdsBackend does not fake {service}.{method}")
+
+    def _mutate_response(self, client: Any, method: str, kwargs: Dict[str, Any]) -> Any:
+        operations = kwargs.get("operations") or kwargs.get("mutate_operations") or [None]
+        if method == "mutate":
+            response = client.get_type("MutateGoogleAdsResponse")
+            for _ in operations:
+                type(response).pb(response).mutate_operation_responses.add()
+            return response
+        # mutate_campaign_budgets -> MutateCampaignBudgetsResponse, .../campaignBudgets/N
+        entity = method[len("mutate_"):]
+        response = client.get_type("".join(part.title() for part in method.split("_")) + "Response")
+        collection = entity.split("_")[0] + "".join(part.title() for part in entity.split("_")[1:])
+        customer_id = str(kwargs.get("customer_id", BENCH_CUSTOMER_ID))
+        for index, _ in enumerate(operations):
+            type(response).pb(response).results.add(resource_name=f"customers/{customer_id}/{collection}/{index + 1}")
+        return response
+
+
+# =============================================================================
+# AGENT
+# =============================================================================
+
+def make_agent(
+    script=DEFAULT_SCRIPT,
+    ads_backend: AdsBackend = None,
+    model_latency: float = 0.0,
+    parallel_tools: bool = True,
+):
+    """A GoogleAdsAgent wired to the scripted Anthropic clients and a fake Ads backend."""
+    from deploy.orchestrator import GoogleAdsAgent
+
+    agent = GoogleAdsAgent(
+        api_key="benchmark", credentials=dict(BENCH_CREDENTIALS), parallel_tools=parallel_tools,
+    )
+    agent.client = ScriptedAnthropic(script, model_latency)
+    agent._async_client = ScriptedAsyncAnthropic(script, model_latency)
+    agent.executor.ads_backend = ads_backend if ads_backend is not None else SyntheticAdsBackend()
+    return agent
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Google Ads API Agent — Benchmarks
+End-to-end performance of the agent loop with stubbed backends: a scripted
+Anthropic client (benchmarks/fakes.py) and a synthetic or replayed Google Ads
+backend (deploy/ads_backend.py). No API keys or network needed.
+
+Reports:
+    cold_start   — import time of deploy.orchestrator / deploy.server and
+                   time to load every action module, each in a fresh process
+    agent_loop   — GoogleAdsAgent.chat(): rounds/s, p50/p99 chat latency
+    server       — concurrent POST /chat through the FastAPI app: requests/s,
+                   rounds/s, p50/p99 latency
+    memory       — RSS per live session after one chat turn
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --chats 200 --concurrency 16 --json results.json
+    python benchmarks/run_benchmarks.py --baseline results.json     # exit 1 on regression
+    python benchmarks/run_benchmarks.py --fixtures fixtures/google_ads  # replay recorded calls
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import subprocess
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Measure the loop itself: every tool call reaches the (fake) Ads backend
+os.environ.setdefault("AGENT_TOOL_CACHE", "0")
+
+# Metric → True if higher is better (used by --baseline)
+HIGHER_IS_BETTER = {"rounds_per_second": True, "requests_per_second": True}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc; falls back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_backend(args):
+    from benchmarks.fakes import SyntheticAdsBackend
+    from deploy.ads_backend import ReplayBackend
+
+    latency = args.ads_latency_ms / 1000
+    if args.fixtures:
+        return ReplayBackend(args.fixtures, latency=latency)
+    return SyntheticAdsBackend(rows=args.rows, latency=latency)
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+COLD_START_SNIPPETS = {
+    "import_orchestrator_ms": "import deploy.orchestrator",
+    "import_server_ms": "import deploy.server",
+    "load_actions_ms": "from deploy.tool_executor import ToolExecutor; ToolExecutor().prewarm()",
+}
+
+
+def bench_cold_start(args) -> Dict[str, float]:
+    results = {}
+    for metric, snippet in COLD_START_SNIPPETS.items():
+        code = (
+            "import sys, time; sys.path.insert(0, %r); started = time.perf_counter(); %s; "
+            "print((time.perf_counter() - started) * 1000)" % (REPO_ROOT, snippet)
+        )
+        timings = []
+        for _ in range(args.cold_runs):
+            output = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=REPO_ROOT,
+            ).stdout
+            timings.append(float(output.strip().splitlines()[-1]))
+        results[metric] = round(statistics.median(timings), 1)
+    return results
+
+
+def bench_agent_loop(args) -> Dict[str, float]:
+    from benchmarks.fakes import make_agent
+
+    agent = make_agent(ads_backend=make_backend(args), model_latency=args.model_latency_ms / 1000)
+    agent.chat("warm-up")  # load the scripted tools' action modules
+    agent.reset_conversation()
+    calls_before = agent.client.messages.calls
+
+    latencies = []
+    started = time.perf_counter()
+    for index in range(args.chats):
+        if index and index % args.turns_per_session == 0:
+            agent.reset_conversation()
+        chat_started = time.perf_counter()
+        agent.chat(f"Benchmark question {index}")
+        latencies.append(time.perf_counter() - chat_started)
+    elapsed = time.perf_counter() - started
+
+    rounds = agent.client.messages.calls - calls_before
+    return {
+        "chats": args.chats,
+        "rounds": rounds,
+        "rounds_per_second": round(rounds / elapsed, 1),
+        "chat_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "chat_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def bench_server(args) -> Dict[str, float]:
+    import httpx
+    from benchmarks.fakes import make_agent
+    from deploy import server
+
+    backend = make_backend(args)
+    agents = []
+
+    def new_agent(model: str = None):
+        agent = make_agent(ads_backend=backend, model_latency=args.model_latency_ms / 1000)
+        agents.append(agent)
+        return agent
+
+    # Sessions are created through server._new_agent → create_agent_system()
+    server.create_agent_system = new_agent
+
+    async def run() -> Dict[str, float]:
+        async with server.lifespan(server.app):
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                session_ids = []
+                for _ in range(args.sessions):
+                    response = await client.post("/sessions", json={})
+                    session_ids.append(response.json()["session_id"])
+                await asyncio.gather(*[
+                    client.post("/chat", json={"message": "warm-up", "session_id": session_id})
+                    for session_id in session_ids
+                ])
+                calls_before = sum(agent.client.messages.calls + agent._async_client.messages.calls for agent in agents)
+
+                latencies = []
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def one(index: int):
+                    async with semaphore:
+                        request_started = time.perf_counter()
+                        response = await client.post("/chat", json={
+                            "message": f"Benchmark question {index}",
+                            "session_id": session_ids[index % len(session_ids)],
+                        })
+                        response.raise_for_status()
+                        latencies.append(time.perf_counter() - request_started)
+
+                started = time.perf_counter()
+                await asyncio.gather(*[one(index) for index in range(args.chats)])
+                elapsed = time.perf_counter() - started
+
+        rounds = sum(agent.client.messages.calls + agent._async_client.messages.calls for agent in agents) - calls_before
+        return {
+            "requests": args.chats,
+            "concurrency": args.concurrency,
+            "requests_per_second": round(args.chats / elapsed, 1),
+            "rounds_per_second": round(rounds / elapsed, 1),
+            "chat_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "chat_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+
+    return asyncio.run(run())
+
+
+def bench_memory(args) -> Dict[str, float]:
+    from benchmarks.fakes import make_agent
+
+    backend = make_backend(args)
+    make_agent(ads_backend=backend).chat("warm-up")  # imports, action modules, client pool
+    gc.collect()
+    baseline = rss_bytes()
+
+    agents = []
+    for index in range(args.memory_sessions):
+        agent = make_agent(ads_backend=backend)
+        agent.chat(f"Benchmark question {index}")
+        agents.append(agent)
+    gc.collect()
+    per_session = (rss_bytes() - baseline) / args.memory_sessions
+    return {"sessions": args.memory_sessions, "rss_per_session_kb": round(per_session / 1024, 1)}
+
+
+BENCHMARKS: Dict[str, Callable[[Any], Dict[str, float]]] = {
+    "cold_start": bench_cold_start,
+    "agent_loop": bench_agent_loop,
+    "server": bench_server,
+    "memory": bench_memory,
+}
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Metrics that got worse than baseline by more than tolerance."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+            if not before or not (metric.endswith(("_ms", "_kb")) or metric in HIGHER_IS_BETTER):
+                continue
+            change = (value - before) / before
+            if HIGHER_IS_BETTER.get(metric):
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{name}.{metric}: {before} → {value} ({change:+.0%} worse)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Ads Agent benchmarks")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--chats", type=int, default=100, help="Chat turns per benchmark")
+    parser.add_argument("--turns-per-session", type=int, default=5, help="agent_loop: turns before reset")
+    parser.add_argument("--sessions", type=int, default=8, help="server: sessions to spread chats over")
+    parser.add_argument("--concurrency", type=int, default=8, help="server: concurrent requests")
+    parser.add_argument("--memory-sessions", type=int, default=50, help="memory: live sessions to create")
+    parser.add_argument("--cold-runs", type=int, default=3, help="cold_start: fresh processes per metric")
+    parser.add_argument("--rows", type=int, default=50, help="Synthetic rows per search")
+    parser.add_argument("--model-latency-ms", type=float, default=0, help="Simulated Anthropic latency per round")
+    parser.add_argument("--ads-latency-ms", type=float, default=0, help="Simulated Google Ads latency per call")
+    parser.add_argument("--fixtures", default=None, help="Replay recorded fixtures instead of synthetic rows")
+    parser.add_argument("--json", default=None, help="Write results to this file")
+    parser.add_argument("--baseline", default=None, help="Compare with a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression vs. baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    print("=" * 60)
+    print("  GOOGLE ADS AGENT — BENCHMARKS")
+    print("=" * 60)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name in args.only or BENCHMARKS:
+        print(f"\n▸ {name}")
+        results[name] = BENCHMARKS[name](args)
+        for metric, value in results[name].items():
+            print(f"  {metric:<24} {value}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n  Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        print()
+        if regressions:
+            print(f"  ❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"     {line}")
+            sys.exit(1)
+        print(f"  ✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
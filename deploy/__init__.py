@@ -1,16 +1,32 @@
 """
 Google Ads API Agent — Deploy Package
 Programmatic deployment via the Anthropic API.
+
+Exports are resolved on first access, so `import deploy.<module>` only loads
+that module and its own dependencies.
 """
 
-from deploy.orchestrator import GoogleAdsAgent, SubAgent, create_agent_system
-from deploy.tool_schemas import MAIN_AGENT_TOOLS
-from deploy.tool_executor import ToolExecutor
-
-__all__ = [
-    "GoogleAdsAgent",
-    "SubAgent", 
-    "create_agent_system",
-    "MAIN_AGENT_TOOLS",
-    "ToolExecutor",
-]
+import importlib
+
+_EXPORTS = {
+    "GoogleAdsAgent": "deploy.orchestrator",
+    "SubAgent": "deploy.orchestrator",
+    "create_agent_system": "deploy.orchestrator",
+    "MAIN_AGENT_TOOLS": "deploy.tool_schemas",
+    "ToolExecutor": "deploy.tool_executor",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'deploy' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,431 @@
+"""
+Google Ads API Agent — Account Directory
+Process-wide, in-memory copy of the MCC hierarchy, so actions resolve an
+account name to a customer ID with a dictionary lookup instead of a
+customer_client scan per call.
+
+1. Loaded once per set of credentials: every accessible root (login MCC
+   first) is listed with one customer_client query, roots in parallel
+2. Lookups, best match first:
+   - exact customer ID (dashes and spaces ignored)
+   - exact normalized name (lowercase, punctuation collapsed)
+   - name prefix (bisect over the sorted names)
+   - name substring (what every action's resolve_customer_id did)
+   - fuzzy name match (difflib), for typos
+   resolve() only returns an exact ID, an exact name or a single
+   prefix/substring match; several candidates, or only fuzzy ones, raise
+   AmbiguousAccountError listing them so the user picks the account
+3. Entries older than ACCOUNT_DIRECTORY_TTL are served while a background
+   thread reloads them; a lookup that finds nothing reloads at once (at most
+   every ACCOUNT_DIRECTORY_MISS_REFRESH seconds), for newly created accounts
+4. Accounts of every status are loaded (suspended and cancelled ones still
+   have history to report on); `statuses` narrows a lookup where a caller
+   needs it
+
+Calls go through the pooled GoogleAdsClient (deploy/client_pool.py), so they
+are rate-governed, retried and recorded/replayed like any action's calls.
+
+Configuration (env):
+    ACCOUNT_DIRECTORY_TTL           seconds before a background reload (default: 900)
+    ACCOUNT_DIRECTORY_MISS_REFRESH  min seconds between reloads on a miss (default: 60)
+
+Usage:
+    from deploy.account_directory import get_account_directory
+
+    account = get_account_directory(secrets).resolve("acme")  # AmbiguousAccountError if unclear
+    if account:
+        customer_id, login_customer_id = account.customer_id, account.login_customer_id
+
+    # what the actions' resolve_customer_id() delegates to
+    customer_id = resolve_customer_id_via_directory(secrets, "acme", login_id)
+"""
+
+import os
+import re
+import time
+import bisect
+import difflib
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Collection, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from deploy.rate_limiter import BACKGROUND, use_priority
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = float(os.environ.get("ACCOUNT_DIRECTORY_TTL", "900"))
+MISS_REFRESH_SECONDS = float(os.environ.get("ACCOUNT_DIRECTORY_MISS_REFRESH", "60"))
+
+MAX_PARALLEL_ROOTS = 8
+FUZZY_CUTOFF = 0.75
+MAX_FUZZY_MATCHES = 5
+MAX_LISTED_CANDIDATES = 10
+
+HIERARCHY_QUERY = """
+    SELECT
+        customer_client.id,
+        customer_client.descriptive_name,
+        customer_client.manager,
+        customer_client.level,
+        customer_client.status
+    FROM customer_client
+"""
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class Account(NamedTuple):
+    customer_id: str
+    name: str
+    is_manager: bool
+    level: int
+    mcc_id: Optional[str]  # the root it was found under, for accounts below a root
+    root_id: str
+    status: str = "ENABLED"  # CustomerStatus name: ENABLED, SUSPENDED, CANCELED, CLOSED
+
+    @property
+    def login_customer_id(self) -> str:
+        return self.mcc_id or self.customer_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "customer_id": self.customer_id,
+            "name": self.name,
+            "is_manager": self.is_manager,
+            "level": self.level,
+            "mcc_id": self.mcc_id,
+            "status": self.status,
+        }
+
+
+class AmbiguousAccountError(ValueError):
+    """An account search with no single safe match; `candidates` are the accounts it could mean."""
+
+    def __init__(self, search: str, candidates: List[Account], fuzzy: bool = False):
+        self.search = search
+        self.candidates = candidates
+        listed = ", ".join(
+            f"{account.name} ({account.customer_id})" for account in candidates[:MAX_LISTED_CANDIDATES]
+        )
+        if len(candidates) > MAX_LISTED_CANDIDATES:
+            listed += f" and {len(candidates) - MAX_LISTED_CANDIDATES} more"
+        if fuzzy:
+            message = f"No account found matching '{search}'. Similar names: {listed}."
+        else:
+            message = f"'{search}' matches {len(candidates)} accounts: {listed}."
+        super().__init__(f"{message} Ask the user which account to use, or pass its customer ID.")
+
+
+def normalize_name(name: str) -> str:
+    return _NON_ALNUM.sub(" ", str(name).lower()).strip()
+
+
+def _customer_id(value: Any) -> str:
+    return re.sub(r"[\s-]", "", str(value or ""))
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def _secret(secrets: Dict[str, str], name: str) -> str:
+    """Pattern A (DEVELOPER_TOKEN) or Pattern B (GOOGLE_ADS_DEVELOPER_TOKEN) secret."""
+    value = secrets.get(name) or secrets.get(f"GOOGLE_ADS_{name}")
+    if not value:
+        raise KeyError(name)
+    return value
+
+
+def _client_config(secrets: Dict[str, str], login_customer_id: str = None) -> Dict[str, Any]:
+    config = {
+        "developer_token": _secret(secrets, "DEVELOPER_TOKEN"),
+        "client_id": _secret(secrets, "CLIENT_ID"),
+        "client_secret": _secret(secrets, "CLIENT_SECRET"),
+        "refresh_token": _secret(secrets, "REFRESH_TOKEN"),
+        "use_proto_plus": True,
+    }
+    if login_customer_id:
+        config["login_customer_id"] = login_customer_id
+    return config
+
+
+def load_account_hierarchy(secrets: Dict[str, str]) -> List[Account]:
+    """
+    Every account under every accessible root, login MCC first; an
+    account reachable from several roots is listed once, under the first.
+    Roots that fail are skipped, unless all of them do.
+    """
+    from deploy.client_pool import pooled_client_factory
+
+    client = pooled_client_factory.load_from_dict(_client_config(secrets))
+    roots = []
+    login_id = _customer_id(secrets.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID"))
+    if login_id:
+        roots.append(login_id)
+    for resource_name in client.get_service("CustomerService").list_accessible_customers().resource_names:
+        root_id = resource_name.split("/")[-1]
+        if root_id not in roots:
+            roots.append(root_id)
+
+    def load_root(root_id: str) -> List[Account]:
+        root_client = pooled_client_factory.load_from_dict(_client_config(secrets, root_id))
+        response = root_client.get_service("GoogleAdsService").search(customer_id=root_id, query=HIERARCHY_QUERY)
+        accounts = []
+        for row in response:
+            cc = row.customer_client
+            level = int(cc.level)
+            accounts.append(Account(
+                str(cc.id), cc.descriptive_name or "", bool(cc.manager), level, root_id if level > 0 else None, root_id,
+                getattr(cc.status, "name", str(cc.status)),
+            ))
+        return accounts
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_ROOTS, len(roots)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, load_root, root_id) for root_id in roots]
+
+    accounts: List[Account] = []
+    seen = set()
+    errors = []
+    for root_id, future in zip(roots, futures):
+        try:
+            root_accounts = future.result()
+        except Exception as e:
+            logger.warning(f"Account directory: skipping root {root_id}: {e}")
+            errors.append(e)
+            continue
+        for account in root_accounts:
+            if account.customer_id not in seen:
+                seen.add(account.customer_id)
+                accounts.append(account)
+    if errors and len(errors) == len(roots):
+        raise errors[0]
+    return accounts
+
+
+# =============================================================================
+# DIRECTORY
+# =============================================================================
+
+ID_MATCH, NAME_MATCH, PARTIAL_MATCH, FUZZY_MATCH = "id", "name", "partial", "fuzzy"
+
+
+class _Snapshot:
+    """Indexes over one load of the hierarchy."""
+
+    def __init__(self, accounts: List[Account], loaded_at: float):
+        self.accounts = accounts
+        self.loaded_at = loaded_at
+        self.by_id: Dict[str, Account] = {}
+        self.by_name: Dict[str, List[Account]] = {}
+        for account in accounts:
+            self.by_id.setdefault(account.customer_id, account)
+            self.by_name.setdefault(normalize_name(account.name), []).append(account)
+        self.names = sorted(self.by_name)
+
+    def tiers(self, search: str) -> Iterator[Tuple[str, List[Account]]]:
+        """(kind, accounts) for each lookup tier, best first; a name is in one tier only."""
+        customer_id = _customer_id(search)
+        if customer_id.isdigit():
+            account = self.by_id.get(customer_id)
+            if account is not None:
+                yield ID_MATCH, [account]
+                return
+
+        name = normalize_name(search)
+        if not name:
+            return
+        yield NAME_MATCH, list(self.by_name.get(name, []))
+
+        prefixed = []
+        for index in range(bisect.bisect_left(self.names, name), len(self.names)):
+            if not self.names[index].startswith(name):
+                break
+            if self.names[index] != name:
+                prefixed.append(self.names[index])
+        contained = [key for key in self.names if name in key and not key.startswith(name)]
+        yield PARTIAL_MATCH, [account for key in prefixed + contained for account in self.by_name[key]]
+
+        close = difflib.get_close_matches(name, self.names, n=MAX_FUZZY_MATCHES, cutoff=FUZZY_CUTOFF)
+        yield FUZZY_MATCH, [account for key in close for account in self.by_name[key]]
+
+
+class AccountDirectory:
+    """Name/ID → account lookups over a TTL-refreshed copy of the hierarchy."""
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Account]],
+        ttl: float = TTL_SECONDS,
+        miss_refresh: float = MISS_REFRESH_SECONDS,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self._snapshot: Optional[_Snapshot] = None
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._state_lock = threading.Lock()
+        self.loads = 0
+
+    def _load(self) -> _Snapshot:
+        """Load under _load_lock."""
+        started = time.monotonic()
+        snapshot = self._snapshot = _Snapshot(self.loader(), started)
+        self.loads += 1
+        logger.info(f"Account directory: loaded {len(snapshot.accounts)} account(s)")
+        return snapshot
+
+    def refresh(self) -> int:
+        """Reload the hierarchy now; returns the account count."""
+        with self._load_lock:
+            return len(self._load().accounts)
+
+    def _reload_unless_replaced(self, seen: Optional[_Snapshot]) -> _Snapshot:
+        """Reload, unless another caller already replaced `seen` while we waited."""
+        with self._load_lock:
+            if self._snapshot is not seen:
+                return self._snapshot
+            return self._load()
+
+    def _refresh_in_background(self):
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def reload():
+            try:
+                with use_priority(BACKGROUND):
+                    self.refresh()
+            except Exception as e:
+                logger.warning(f"Account directory: background refresh failed: {e}")
+            finally:
+                with self._state_lock:
+                    self._refreshing = False
+
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(reload,), name="account-directory-refresh", daemon=True).start()
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._reload_unless_replaced(None)
+        elif time.monotonic() - snapshot.loaded_at > self.ttl:
+            self._refresh_in_background()
+        return snapshot
+
+    def accounts(self) -> List[Account]:
+        return list(self._current().accounts)
+
+    def get(self, customer_id: Any) -> Optional[Account]:
+        return self._current().by_id.get(_customer_id(customer_id))
+
+    def _tiers(
+        self,
+        search: str,
+        include_managers: bool,
+        root_id: Optional[str],
+        statuses: Optional[Collection[str]],
+    ) -> List[Tuple[str, List[Account]]]:
+        """
+        The non-empty lookup tiers after filtering, fuzzy only if nothing else
+        matched. A lookup with no non-fuzzy match reloads first.
+        """
+        def matching(snapshot: _Snapshot) -> List[Tuple[str, List[Account]]]:
+            tiers = []
+            for kind, accounts in snapshot.tiers(search):
+                if kind == FUZZY_MATCH and tiers:
+                    break
+                accounts = [
+                    account for account in accounts
+                    if (include_managers or not account.is_manager)
+                    and (not root_id or account.root_id == root_id)
+                    and (not statuses or account.status in statuses)
+                ]
+                if accounts:
+                    tiers.append((kind, accounts))
+            return tiers
+
+        snapshot = self._current()
+        tiers = matching(snapshot)
+        if (not tiers or tiers[0][0] == FUZZY_MATCH) and time.monotonic() - snapshot.loaded_at > self.miss_refresh:
+            tiers = matching(self._reload_unless_replaced(snapshot))
+        return tiers
+
+    def find(
+        self,
+        search: str,
+        include_managers: bool = True,
+        root_id: str = None,
+        statuses: Optional[Collection[str]] = None,
+    ) -> List[Account]:
+        """
+        Accounts matching an ID or name, best first. `root_id` keeps only
+        accounts found under that root, `statuses` only accounts in one of them.
+        """
+        return [account for _, accounts in self._tiers(search, include_managers, root_id, statuses) for account in accounts]
+
+    def resolve(
+        self,
+        search: str,
+        include_managers: bool = True,
+        root_id: str = None,
+        statuses: Optional[Collection[str]] = None,
+    ) -> Optional[Account]:
+        """
+        The account an ID or name unambiguously names, or None if nothing
+        matches. Raises AmbiguousAccountError when the best tier holds several
+        accounts or there are only fuzzy matches, so a typo never resolves to
+        another client's account.
+        """
+        tiers = self._tiers(search, include_managers, root_id, statuses)
+        if not tiers:
+            return None
+        kind, accounts = tiers[0]
+        if kind == FUZZY_MATCH or len(accounts) > 1:
+            raise AmbiguousAccountError(search, accounts, fuzzy=kind == FUZZY_MATCH)
+        return accounts[0]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "accounts": len(snapshot.accounts) if snapshot else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+            "loads": self.loads,
+        }
+
+
+_directories: Dict[str, AccountDirectory] = {}
+_directories_lock = threading.Lock()
+
+
+def get_account_directory(secrets: Dict[str, str]) -> AccountDirectory:
+    """
+    The process-wide directory for these credentials (and the active
+    record/replay backend, so replayed hierarchies never leak into live ones).
+    """
+    from deploy.action_registry import secrets_fingerprint
+    from deploy.ads_backend import current_ads_backend
+
+    secrets = dict(secrets)
+    key = f"{secrets_fingerprint(secrets)}:{id(current_ads_backend()):x}"
+    with _directories_lock:
+        directory = _directories.get(key)
+        if directory is None:
+            directory = _directories[key] = AccountDirectory(lambda: load_account_hierarchy(secrets))
+        return directory
+
+
+def resolve_customer_id_via_directory(secrets: Dict[str, str], search: str, login_id: str = None) -> str:
+    """
+    The non-manager account `search` names under `login_id` (the login MCC;
+    every root if empty), as the actions' resolve_customer_id() returns it.
+    Raises ValueError when nothing matches, AmbiguousAccountError when
+    several accounts could be meant.
+    """
+    account = get_account_directory(secrets).resolve(search, include_managers=False, root_id=_customer_id(login_id) or None)
+    if account is None:
+        raise ValueError(f"No account found matching '{search}'")
+    return account.customer_id
@@ -0,0 +1,190 @@
+"""
+Google Ads API Agent — Action Module Registry
+Process-wide, thread-safe cache of loaded action modules and their run()
+signatures, shared by every ToolExecutor (main agent, sub-agents, sessions).
+
+Each action file is exec'd once per distinct set of injected secrets instead
+of once per executor. Loading touches no process-global state, so modules can
+be loaded (and prewarmed) from several threads at once.
+
+Usage:
+    from deploy.action_registry import get_action_registry
+
+    entry = get_action_registry().load("budget_manager", file_path, secrets)
+    entry.module.run(...)
+"""
+
+import types
+import hashlib
+import inspect
+import logging
+import builtins
+import threading
+import subprocess
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from deploy.client_pool import api_version, pooled_client_factory
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# PIP INSTALL SUPPRESSOR
+# =============================================================================
+# Each action module gets its own `subprocess` stand-in through a private
+# __builtins__ whose __import__ hands out the shim. Nothing process-global is
+# patched, so modules can load concurrently and other threads' subprocess
+# calls are never intercepted.
+
+def _is_pip_install(cmd) -> bool:
+    if not isinstance(cmd, (list, tuple)):
+        return False
+    args = [str(part) for part in cmd]
+    if len(args) >= 2 and args[0] == "pip" and args[1] == "install":
+        return True
+    # python -m pip install ...
+    return len(args) >= 4 and args[1:4] == ["-m", "pip", "install"]
+
+
+class _SubprocessShim(types.ModuleType):
+    """
+    Per-module `subprocess` whose pip installs are no-ops while the module
+    loads (requirements.txt handles deps). After loading it passes every
+    call through to the real subprocess module.
+    """
+
+    def __init__(self, tool_name: str):
+        super().__init__("subprocess")
+        self._tool_name = tool_name
+        self.loading = True
+
+    def __getattr__(self, name: str):
+        return getattr(subprocess, name)
+
+    def check_call(self, cmd, *args, **kwargs):
+        if self.loading and _is_pip_install(cmd):
+            logger.debug(f"Suppressed pip install ({self._tool_name}): {' '.join(map(str, cmd))}")
+            return 0
+        return subprocess.check_call(cmd, *args, **kwargs)
+
+    def run(self, cmd, *args, **kwargs):
+        if self.loading and _is_pip_install(cmd):
+            logger.debug(f"Suppressed pip install ({self._tool_name}): {' '.join(map(str, cmd))}")
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+        return subprocess.run(cmd, *args, **kwargs)
+
+
+def _isolated_builtins(shim: _SubprocessShim) -> Dict[str, Any]:
+    """A private copy of builtins whose `import subprocess` resolves to the shim."""
+    real_import = builtins.__import__
+
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if name == "subprocess" and level == 0:
+            return shim
+        return real_import(name, globals, locals, fromlist, level)
+
+    namespace = dict(builtins.__dict__)
+    namespace["__import__"] = _import
+    return namespace
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+class ActionEntry(NamedTuple):
+    module: Any
+    signature: Optional[inspect.Signature]
+
+
+def secrets_fingerprint(secrets: Dict[str, str]) -> str:
+    """Stable hash of a secrets dict, for keying shared state by credentials without holding them."""
+    digest = hashlib.sha256()
+    for key in sorted(secrets):
+        digest.update(f"{key}\0{secrets[key]}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ActionRegistry:
+    """Loaded action modules keyed by (action file, injected secrets)."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], ActionEntry] = {}
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def load(self, tool_name: str, file_path: Path, secrets: Dict[str, str]) -> ActionEntry:
+        """Return the loaded module for this file and secrets, exec'ing it on first use."""
+        key = (str(Path(file_path).resolve()), secrets_fingerprint(secrets))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Concurrent first calls for the same module wait for a single load
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return entry
+            entry = self._exec_action_file(tool_name, Path(file_path), secrets)
+            with self._lock:
+                self._entries[key] = entry
+                self._load_locks.pop(key, None)
+        return entry
+
+    def _exec_action_file(self, tool_name: str, file_path: Path, secrets: Dict[str, str]) -> ActionEntry:
+        """
+        Load action file as a Python module with:
+        1. secrets dict injected into module namespace BEFORE execution
+        2. a module-private subprocess shim that suppresses pip installs
+        3. GoogleAdsClient rebound to the shared client pool, and API_VERSION
+           to the one version that pool runs on
+        """
+        spec = importlib.util.spec_from_file_location(f"action_{tool_name}", str(file_path))
+        module = importlib.util.module_from_spec(spec)
+
+        # Inject secrets BEFORE exec so `secrets["KEY"]` resolves during module load
+        module.__dict__["secrets"] = dict(secrets)
+
+        # Suppress pip installs during module loading, for this module only
+        shim = _SubprocessShim(tool_name)
+        module.__dict__["__builtins__"] = _isolated_builtins(shim)
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            shim.loading = False
+
+        # get_client() looks GoogleAdsClient up at call time, so this reroutes it to the pool
+        if "GoogleAdsClient" in module.__dict__:
+            module.GoogleAdsClient = pooled_client_factory
+            # The pool ignores pinned versions; keep the api_version actions report truthful
+            if isinstance(module.__dict__.get("API_VERSION"), str):
+                module.API_VERSION = api_version()
+
+        signature = inspect.signature(module.run) if hasattr(module, "run") else None
+        logger.debug(f"Loaded action module: {tool_name} ({file_path.name})")
+        return ActionEntry(module, signature)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_registry: Optional[ActionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_action_registry() -> ActionRegistry:
+    """The process-wide action registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ActionRegistry()
+        return _registry
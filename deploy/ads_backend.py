@@ -0,0 +1,440 @@
+"""
+Google Ads API Agent — Record/Replay Backend for the Google Ads API
+Captures Google Ads service calls made by action modules into JSON fixtures
+and serves them back offline, so actions can be benchmarked and load-tested
+without credentials or network access.
+
+Modes:
+    live    — talk to Google Ads as usual (default)
+    record  — talk to Google Ads and save every call + response as a fixture
+    replay  — never touch the network; answer every call from fixtures
+
+Every action builds its client through `GoogleAdsClient.load_from_dict`, which
+the action registry rebinds to the client pool. The pool consults the backend
+active in the current context (set by ToolExecutor around run()), so nothing
+in the action files changes. search() pagers, search_stream() batches,
+mutate_* and other unary responses are all captured. Calls that raised are
+replayed as the same kind of error: a GoogleAdsException (gRPC status plus the
+serialized GoogleAdsFailure and request_id), a grpc.RpcError with its status
+code, or ReplayedAdsError for anything else.
+
+Fixtures live in <fixtures_dir>/<Service>/<method>/<request hash>.json.
+
+Configuration (env):
+    ADS_BACKEND              live | record | replay (default: live)
+    ADS_FIXTURES_DIR         fixture directory (default: fixtures/google_ads)
+    ADS_REPLAY_LATENCY_MS    fixed replay latency per call, or "recorded" to
+                             sleep for the recorded duration (default: 0)
+
+Usage:
+    from deploy.ads_backend import ReplayBackend
+    from deploy.tool_executor import ToolExecutor
+
+    executor = ToolExecutor(ads_backend=ReplayBackend("fixtures/google_ads", latency=0.05))
+    executor.execute("budget_manager", {"action": "list_budgets", "customer_id": "1234567890"})
+
+    # Outside ToolExecutor (e.g. reporting sub-agent modules)
+    with use_ads_backend(backend):
+        module.run(customer_id="1234567890", report_type="campaign")
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import importlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_backend: contextvars.ContextVar = contextvars.ContextVar("ads_backend", default=None)
+
+
+def current_ads_backend() -> Optional["AdsBackend"]:
+    """The backend active in this context, or None for plain live calls."""
+    return _current_backend.get()
+
+
+@contextmanager
+def use_ads_backend(backend: Optional["AdsBackend"]):
+    """Route Google Ads clients built inside this block through backend."""
+    token = _current_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _current_backend.reset(token)
+
+
+class ReplayMissError(LookupError):
+    """A replayed call has no recorded fixture."""
+
+
+class ReplayedAdsError(Exception):
+    """Replays an exception raised by the recorded call that isn't a gRPC / Google Ads error."""
+
+    def __init__(self, error_type: str, message: str):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+
+def _replayed_rpc_error(code: str, details: str) -> Exception:
+    """A grpc.RpcError (and grpc.Call) carrying a recorded status code and details."""
+    import grpc
+
+    class ReplayedRpcError(grpc.RpcError, grpc.Call):
+        def __init__(self):
+            super().__init__(f"{code}: {details}")
+
+        def code(self):
+            return grpc.StatusCode[code]
+
+        def details(self):
+            return details
+
+        def initial_metadata(self):
+            return ()
+
+        def trailing_metadata(self):
+            return ()
+
+        def is_active(self):
+            return False
+
+        def time_remaining(self):
+            return None
+
+        def cancel(self):
+            return False
+
+        def add_callback(self, callback):
+            return False
+
+    return ReplayedRpcError()
+
+
+# =============================================================================
+# PROTO (DE)SERIALIZATION
+# =============================================================================
+
+def _is_message(value: Any) -> bool:
+    cls = type(value)
+    return hasattr(cls, "pb") and hasattr(cls, "wrap") or hasattr(value, "DESCRIPTOR")
+
+
+def _message_to_dict(message: Any) -> Dict[str, Any]:
+    from google.protobuf import json_format
+
+    pb = type(message).pb(message) if hasattr(type(message), "pb") else message
+    return json_format.MessageToDict(pb, preserving_proto_field_name=True)
+
+
+def _dump(value: Any) -> Dict[str, Any]:
+    cls = type(value)
+    return {"type": f"{cls.__module__}:{cls.__qualname__}", "message": _message_to_dict(value)}
+
+
+def _load(entry: Dict[str, Any]) -> Any:
+    from google.protobuf import json_format
+
+    module_name, qualname = entry["type"].split(":")
+    cls = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    if hasattr(cls, "pb") and hasattr(cls, "wrap"):
+        pb = json_format.ParseDict(entry["message"], cls.pb()(), ignore_unknown_fields=True)
+        return cls.wrap(pb)
+    return json_format.ParseDict(entry["message"], cls(), ignore_unknown_fields=True)
+
+
+def _dump_error(error: Exception) -> Dict[str, Any]:
+    """Fixture entry for an exception raised by a recorded call."""
+    entry: Dict[str, Any] = {"type": type(error).__name__, "message": str(error)}
+    rpc_error = getattr(error, "error", None) if hasattr(error, "failure") else error
+    code = getattr(rpc_error, "code", None)
+    if callable(code):
+        try:
+            entry["grpc_status"] = code().name
+            entry["details"] = rpc_error.details() if callable(getattr(rpc_error, "details", None)) else ""
+        except Exception:
+            entry.pop("grpc_status", None)
+    failure = getattr(error, "failure", None)
+    if failure is not None and "grpc_status" in entry:
+        entry["failure"] = _dump(failure)
+        entry["request_id"] = getattr(error, "request_id", None)
+    return entry
+
+
+def _load_error(entry: Dict[str, Any]) -> Exception:
+    """The exception a recorded call raised, rebuilt from _dump_error()."""
+    if "grpc_status" not in entry:
+        return ReplayedAdsError(entry["type"], entry["message"])
+    rpc_error = _replayed_rpc_error(entry["grpc_status"], entry.get("details") or "")
+    if "failure" not in entry:
+        return rpc_error
+    from google.ads.googleads.errors import GoogleAdsException
+
+    return GoogleAdsException(rpc_error, rpc_error, _load(entry["failure"]), entry.get("request_id"))
+
+
+def _normalize_request(value: Any) -> Any:
+    if _is_message(value):
+        return _message_to_dict(value)
+    if isinstance(value, dict):
+        return {key: _normalize_request(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_request(item) for item in value]
+    if isinstance(value, str):
+        # GAQL formatting differences shouldn't change the fixture
+        return re.sub(r"\s+", " ", value).strip()
+    return value
+
+
+class _MaterializedResponse:
+    """A recorded search()/search_stream() response: iterable, like the pager it replaces."""
+
+    def __init__(self, items: List[Any], original: Any = None):
+        self._items = items
+        self._original = original
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __getattr__(self, name: str):
+        if self._original is None:
+            raise AttributeError(name)
+        return getattr(self._original, name)
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class AdsBackend:
+    """Fixture storage shared by the recording and replaying backends."""
+
+    mode = "live"
+
+    def __init__(self, fixtures_dir: str):
+        self.fixtures_dir = Path(fixtures_dir)
+
+    def fixture_path(self, service: str, method: str, args: tuple, kwargs: Dict[str, Any]) -> Path:
+        request = {"args": _normalize_request(list(args)), "kwargs": _normalize_request(kwargs)}
+        digest = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:24]
+        return self.fixtures_dir / service / method / f"{digest}.json"
+
+    def wrap_client(self, client: Any) -> Any:
+        return client
+
+
+class RecordingBackend(AdsBackend):
+    """Calls Google Ads and writes each call and its response to a fixture."""
+
+    mode = "record"
+
+    def __init__(self, fixtures_dir: str):
+        super().__init__(fixtures_dir)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def wrap_client(self, client: Any) -> Any:
+        return _RecordingClient(client, self)
+
+    def save(self, service: str, method: str, args: tuple, kwargs: Dict[str, Any], fixture: Dict[str, Any]):
+        path = self.fixture_path(service, method, args, kwargs)
+        fixture = {
+            "service": service,
+            "method": method,
+            "request": {"args": _normalize_request(list(args)), "kwargs": _normalize_request(kwargs)},
+            **fixture,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(fixture, indent=1, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+        with self._lock:
+            self.recorded += 1
+
+
+class ReplayBackend(AdsBackend):
+    """Answers Google Ads calls from fixtures, with optional simulated latency."""
+
+    mode = "replay"
+
+    def __init__(self, fixtures_dir: str, latency: Optional[float] = 0.0):
+        """
+        Args:
+            fixtures_dir: Directory written by RecordingBackend
+            latency: Seconds to sleep per call, or None to sleep for the recorded duration
+        """
+        super().__init__(fixtures_dir)
+        self.latency = latency
+        self._clients: Dict[Optional[str], Any] = {}
+        self._fixtures: Dict[Path, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.misses = 0
+
+    def client(self, version: Optional[str] = None) -> Any:
+        """An offline client (types, enums, replayed services) for this API version."""
+        with self._lock:
+            client = self._clients.get(version)
+            if client is None:
+                from google.auth.credentials import AnonymousCredentials
+                from google.ads.googleads.client import GoogleAdsClient
+
+                offline = GoogleAdsClient(
+                    credentials=AnonymousCredentials(), developer_token="replay",
+                    version=version, use_proto_plus=True,
+                )
+                client = self._clients[version] = _ReplayClient(offline, self)
+            return client
+
+    def respond(self, service: str, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        path = self.fixture_path(service, method, args, kwargs)
+        with self._lock:
+            fixture = self._fixtures.get(path)
+        if fixture is None:
+            if not path.exists():
+                with self._lock:
+                    self.misses += 1
+                raise ReplayMissError(
+                    f"No recorded fixture for {service}.{method} "
+                    f"{json.dumps(_normalize_request(kwargs), default=str)[:300]} ({path})"
+                )
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+            with self._lock:
+                self._fixtures[path] = fixture
+
+        delay = fixture.get("duration_ms", 0) / 1000 if self.latency is None else self.latency
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.replayed += 1
+
+        if "error" in fixture:
+            raise _load_error(fixture["error"])
+        if fixture["kind"] == "iterable":
+            return _MaterializedResponse([_load(item) for item in fixture["items"]])
+        if fixture["kind"] == "message":
+            return _load(fixture["response"])
+        return fixture["response"]
+
+
+def ads_backend_from_env() -> Optional[AdsBackend]:
+    """The backend selected by ADS_BACKEND, or None for live."""
+    mode = os.environ.get("ADS_BACKEND", "live").lower()
+    fixtures_dir = os.environ.get("ADS_FIXTURES_DIR", "fixtures/google_ads")
+    if mode == "live":
+        return None
+    if mode == "record":
+        return RecordingBackend(fixtures_dir)
+    if mode == "replay":
+        latency = os.environ.get("ADS_REPLAY_LATENCY_MS", "0")
+        return ReplayBackend(fixtures_dir, latency=None if latency == "recorded" else float(latency) / 1000)
+    raise ValueError(f"Unknown ADS_BACKEND: {mode} (expected live, record or replay)")
+
+
+# =============================================================================
+# CLIENT / SERVICE WRAPPERS
+# =============================================================================
+
+class _RecordingClient:
+    def __init__(self, client: Any, backend: RecordingBackend):
+        self._client = client
+        self._backend = backend
+
+    def get_service(self, name: str, *args, **kwargs):
+        return _RecordingService(self._client.get_service(name, *args, **kwargs), name, self._backend)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+class _RecordingService:
+    def __init__(self, service: Any, name: str, backend: RecordingBackend):
+        self._service = service
+        self._name = name
+        self._backend = backend
+
+    def __getattr__(self, method: str):
+        attr = getattr(self._service, method)
+        if method.startswith("_") or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            started = time.monotonic()
+            # Stays None if the call is interrupted (KeyboardInterrupt, GeneratorExit...): nothing is recorded
+            fixture = None
+            try:
+                response = attr(*args, **kwargs)
+                if _is_message(response):
+                    fixture = {"kind": "message", "response": _dump(response)}
+                elif hasattr(response, "__iter__"):
+                    # search() pager / search_stream() batches: fetch everything now
+                    items = list(response)
+                    fixture = {"kind": "iterable", "items": [_dump(item) for item in items]}
+                    response = _MaterializedResponse(items, response)
+                else:
+                    fixture = {"kind": "value", "response": response}
+            except Exception as e:
+                try:
+                    fixture = {"error": _dump_error(e)}
+                except Exception:
+                    # Never mask the call's own error with one from describing it
+                    fixture = {"error": {"type": type(e).__name__, "message": str(e)}}
+                raise
+            finally:
+                if fixture is not None:
+                    fixture["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+                    try:
+                        self._backend.save(self._name, method, args, kwargs, fixture)
+                    except Exception as save_error:
+                        logger.warning(f"Could not record {self._name}.{method}: {save_error}")
+            return response
+
+        return call
+
+
+class _ReplayClient:
+    def __init__(self, client: Any, backend: ReplayBackend):
+        self._client = client
+        self._backend = backend
+        self._services: Dict[str, "_ReplayService"] = {}
+
+    def get_service(self, name: str, *args, **kwargs):
+        service = self._services.get(name)
+        if service is None:
+            service = self._services.setdefault(name, _ReplayService(name, self._backend, self._client))
+        return service
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+class _ReplayService:
+    def __init__(self, name: str, backend: ReplayBackend, client: Any):
+        self._name = name
+        self._backend = backend
+        self._client = client
+        self._service_type = None
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        if method.endswith("_path"):
+            # Resource name helpers (campaign_path, parse_campaign_path, ...) are
+            # pure; serve them from the real service class, never its channel
+            if self._service_type is None:
+                self._service_type = type(self._client.get_service(self._name))
+            return getattr(self._service_type, method)
+
+        def call(*args, **kwargs):
+            return self._backend.respond(self._name, method, args, kwargs)
+
+        return call
@@ -0,0 +1,378 @@
+"""
+Google Ads API Agent — Google Ads Client Pool
+Process-wide registry of GoogleAdsClient instances, so tool calls stop paying
+for an OAuth token refresh and fresh gRPC channels on every call.
+
+Every action file builds its client inside get_client() with
+`GoogleAdsClient.load_from_dict(config, version=...)`. After loading an action
+module, the ToolExecutor rebinds the module's `GoogleAdsClient` name to
+`pooled_client_factory`, so those calls land here instead:
+
+1. Clients are keyed by credentials, login_customer_id and API version
+2. OAuth credentials are shared by every client with the same refresh token;
+   google-auth only refreshes the access token once it has expired
+3. Services returned by get_service() are cached per client, so their gRPC
+   channels stay open between calls
+4. Every client runs on one Google Ads API version (GOOGLE_ADS_API_VERSION,
+   one of SUPPORTED_API_VERSIONS; default: DEFAULT_API_VERSION), whatever
+   version the action file pins, so only one generated proto tree is ever
+   imported. Modules that define API_VERSION have it rebound to match (see
+   action_registry)
+5. Service calls are metered by the process-wide rate governor
+   (deploy/rate_limiter.py): per developer token, per customer_id, by lane,
+   and retried with backoff on transient errors (deploy/retry.py)
+6. When a record/replay backend is active (deploy.ads_backend), clients are
+   wrapped for recording or replaced by offline replay clients
+
+Usage:
+    from deploy.client_pool import get_client_pool
+
+    client = get_client_pool().get_client(config)
+    ga_service = client.get_service("GoogleAdsService")   # on api_version()
+"""
+
+import os
+import time
+import hashlib
+import logging
+import importlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from deploy.rate_limiter import get_governor
+from deploy.retry import GOOGLE_ADS_RETRY, classify_google_ads_error, is_idempotent
+
+logger = logging.getLogger(__name__)
+
+MAX_POOLED_CLIENTS = 256
+
+# API versions the actions are run and tested on. Every action's GAQL fields,
+# services, types and enum values are checked against each of them; redo that
+# check before adding one. Bump both when moving to a new version (and the
+# google-ads requirement, if it doesn't ship it yet: v23 needs >= 29.0.0).
+SUPPORTED_API_VERSIONS = ("v23", "v24", "v25")
+DEFAULT_API_VERSION = "v23"
+
+_api_version: Optional[str] = None
+_api_version_lock = threading.Lock()
+_pinned_versions_seen = set()
+
+
+def api_version() -> str:
+    """
+    The single Google Ads API version used by every action, resolved once:
+    GOOGLE_ADS_API_VERSION if set, else DEFAULT_API_VERSION. Raises if it
+    isn't one of SUPPORTED_API_VERSIONS or the installed google-ads lacks it.
+    """
+    global _api_version
+    with _api_version_lock:
+        if _api_version is None:
+            version = os.environ.get("GOOGLE_ADS_API_VERSION", "").strip().lower() or DEFAULT_API_VERSION
+            if version not in SUPPORTED_API_VERSIONS:
+                raise ValueError(
+                    f"GOOGLE_ADS_API_VERSION={version} is not supported by this agent "
+                    f"(supported: {', '.join(SUPPORTED_API_VERSIONS)})"
+                )
+            if importlib.util.find_spec(f"google.ads.googleads.{version}") is None:
+                raise RuntimeError(
+                    f"The installed google-ads package has no Google Ads API {version}; "
+                    f"install a release that ships it, or set GOOGLE_ADS_API_VERSION to another of "
+                    f"{', '.join(SUPPORTED_API_VERSIONS)}"
+                )
+            _api_version = version
+            logger.info(f"Google Ads API version: {version}")
+        return _api_version
+
+
+def _resolve_version(requested: Optional[str]) -> str:
+    version = api_version()
+    if requested and requested != version and requested not in _pinned_versions_seen:
+        _pinned_versions_seen.add(requested)
+        logger.debug(f"Google Ads client pool: {requested} requested, using {version}")
+    return version
+
+
+def _fingerprint(*parts: Any) -> str:
+    """Stable hash of credential material (never keep raw secrets in keys)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _normalize_customer_id(customer_id: Any) -> Optional[str]:
+    return str(customer_id).replace("-", "") if customer_id else None
+
+
+def _call_customer_id(args: tuple, kwargs: Dict[str, Any]) -> Optional[str]:
+    """The customer_id a service call targets: keyword, request field, or first positional."""
+    customer_id = kwargs.get("customer_id")
+    if customer_id is None and kwargs.get("request") is not None:
+        request = kwargs["request"]
+        customer_id = request.get("customer_id") if isinstance(request, dict) else getattr(request, "customer_id", None)
+    if customer_id is None and args and isinstance(args[0], str):
+        customer_id = args[0]
+    return _normalize_customer_id(customer_id)
+
+
+# Server-streaming RPCs: the call returns at once and the transfer (and its
+# errors) happens while the response is iterated
+STREAMING_METHODS = {"search_stream"}
+
+_END = object()
+
+
+class GovernedService:
+    """
+    A service whose calls go through the rate governor (deploy/rate_limiter.py)
+    and are retried on transient errors (deploy/retry.py), each attempt taking
+    its own slot. search() pages fetched while iterating after the call
+    returns aren't metered or retried. search_stream() holds its slot until
+    the stream is consumed (see _stream).
+    """
+
+    def __init__(self, service: Any, developer_key: str):
+        self._service = service
+        self._developer_key = developer_key
+
+    def _stream(self, method: Any, idempotent: bool, args: tuple, kwargs: Dict[str, Any]):
+        """
+        A streaming call as a generator. The governor slot is held from the
+        call until the stream is exhausted or closed, and errors raised while
+        iterating reach the governor (quota pause). Failures before the first
+        batch are retried; after it, rows have been handed out, so they aren't.
+        """
+        governor = get_governor()
+        customer_id = _call_customer_id(args, kwargs)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            governor.acquire(self._developer_key, customer_id)
+            try:
+                stream = iter(method(*args, **kwargs))
+                first = next(stream, _END)
+                break
+            except Exception as e:
+                governor.release(self._developer_key, e)
+                delay = GOOGLE_ADS_RETRY.backoff(
+                    e, attempt, started, classify=lambda error: classify_google_ads_error(error, idempotent)
+                )
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+        error = None
+        try:
+            if first is not _END:
+                yield first
+                yield from stream
+        except GeneratorExit:
+            # The consumer stopped early: end the RPC instead of leaving it streaming
+            cancel = getattr(stream, "cancel", None)
+            if callable(cancel):
+                cancel()
+            raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            governor.release(self._developer_key, error)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._service, name)
+        if name.startswith("_") or name.endswith("_path") or not callable(attr):
+            return attr
+
+        customer_id_of = _call_customer_id
+        idempotent = is_idempotent(name)
+
+        if name in STREAMING_METHODS:
+            return lambda *args, **kwargs: self._stream(attr, idempotent, args, kwargs)
+
+        def attempt(*args, **kwargs):
+            with get_governor().slot(self._developer_key, customer_id_of(args, kwargs)):
+                return attr(*args, **kwargs)
+
+        def call(*args, **kwargs):
+            return GOOGLE_ADS_RETRY.call(
+                attempt, *args, _classify=lambda e: classify_google_ads_error(e, idempotent), **kwargs
+            )
+
+        return call
+
+
+class PooledClient:
+    """
+    Thin wrapper around a GoogleAdsClient that memoizes get_service() and puts
+    the services' calls under the rate governor.
+    Everything else (get_type, enums, copy_from, ...) is passed through.
+    """
+
+    def __init__(self, client: Any, developer_key: str = ""):
+        self._client = client
+        self._developer_key = developer_key
+        self._services: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get_service(self, name: str, version: str = None, interceptors: list = None, **kwargs):
+        """The named service on the client's (process-wide) API version; version is ignored."""
+        if version:
+            _resolve_version(version)
+        # Custom interceptors or async clients get their own channel, as before
+        if interceptors or kwargs:
+            return self._client.get_service(name, interceptors=interceptors, **kwargs)
+
+        with self._lock:
+            service = self._services.get(name)
+            if service is None:
+                service = GovernedService(self._client.get_service(name), self._developer_key)
+                self._services[name] = service
+        return service
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+class GoogleAdsClientPool:
+    """Thread-safe LRU of PooledClient instances plus shared OAuth credentials."""
+
+    def __init__(self, max_clients: int = MAX_POOLED_CLIENTS):
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, PooledClient]" = OrderedDict()
+        self._credentials: Dict[str, Any] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _client_key(self, config: Dict[str, Any], version: Optional[str]) -> str:
+        return _fingerprint(
+            config.get("developer_token"), config.get("client_id"),
+            config.get("client_secret"), config.get("refresh_token"),
+            _normalize_customer_id(config.get("login_customer_id")),
+            _normalize_customer_id(config.get("linked_customer_id")),
+            bool(config.get("use_proto_plus", True)), version,
+        )
+
+    def _credentials_key(self, config: Dict[str, Any]) -> str:
+        return _fingerprint(config.get("client_id"), config.get("client_secret"), config.get("refresh_token"))
+
+    def get_client(self, config: Dict[str, Any], version: Optional[str] = None) -> PooledClient:
+        """Return a pooled client for this config, building it on first use (on api_version())."""
+        version = _resolve_version(version)
+        key = self._client_key(config, version)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Only one thread builds a given client; the rest wait and reuse it
+        with build_lock:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is not None:
+                    self.hits += 1
+                    return client
+            client = PooledClient(self._build_client(config, version), _fingerprint(config.get("developer_token")))
+            with self._lock:
+                self.misses += 1
+                self._clients[key] = client
+                self._build_locks.pop(key, None)
+                while len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+        return client
+
+    def _build_client(self, config: Dict[str, Any], version: Optional[str]):
+        from google.ads.googleads.client import GoogleAdsClient
+
+        creds_key = self._credentials_key(config)
+        with self._lock:
+            credentials = self._credentials.get(creds_key)
+
+        if credentials is None:
+            # First client for this refresh token: load_from_dict does the OAuth refresh
+            client = GoogleAdsClient.load_from_dict(config, version=version)
+            with self._lock:
+                self._credentials.setdefault(creds_key, client.credentials)
+            logger.debug("Google Ads client pool: new credentials")
+            return client
+
+        # Same OAuth identity, different MCC/version: reuse the live access token
+        return GoogleAdsClient(
+            credentials=credentials,
+            developer_token=config.get("developer_token"),
+            endpoint=config.get("endpoint"),
+            login_customer_id=_normalize_customer_id(config.get("login_customer_id")),
+            linked_customer_id=_normalize_customer_id(config.get("linked_customer_id")),
+            version=version,
+            http_proxy=config.get("http_proxy"),
+            use_proto_plus=bool(config.get("use_proto_plus", True)),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._credentials.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "credentials": len(self._credentials),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def preload_api_version() -> str:
+    """
+    Import the generated protos of api_version(). Otherwise the first
+    get_type()/get_service() imports every resource type inside a tool call.
+    """
+    version = api_version()
+    importlib.import_module(f"google.ads.googleads.{version}.services.types.google_ads_service")
+    importlib.import_module(f"google.ads.googleads.{version}.services.services.google_ads_service")
+    return version
+
+
+_pool: Optional[GoogleAdsClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> GoogleAdsClientPool:
+    """The process-wide client pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GoogleAdsClientPool()
+        return _pool
+
+
+class PooledClientFactory:
+    """
+    Stands in for the `GoogleAdsClient` class inside action modules.
+    load_from_dict() goes through the pool; anything else reaches the real class.
+    """
+
+    def load_from_dict(self, config_dict: Dict[str, Any], version: Optional[str] = None) -> PooledClient:
+        from deploy.ads_backend import current_ads_backend
+
+        backend = current_ads_backend()
+        if backend is not None and backend.mode == "replay":
+            return backend.client(_resolve_version(version))
+        client = get_client_pool().get_client(config_dict, version)
+        return backend.wrap_client(client) if backend is not None else client
+
+    def __getattr__(self, name: str):
+        from google.ads.googleads.client import GoogleAdsClient
+        return getattr(GoogleAdsClient, name)
+
+
+pooled_client_factory = PooledClientFactory()
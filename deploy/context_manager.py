@@ -0,0 +1,225 @@
+"""
+Google Ads API Agent — Conversation Context Manager
+Keeps conversation_history inside a token budget by compacting tool results
+the model has already read.
+
+A tool_result is "consumed" once an assistant message follows it. Consumed
+results are moved into a per-session store and replaced in history with a
+short summary plus a handle (the original tool_use_id). The model can read the
+full data again with the `get_stored_result` tool.
+
+The store is an LRU bounded by result count and total characters, and is part
+of every session snapshot. A result that was already offloaded to managed
+storage (see deploy/result_serializer.py) is kept as a reference to its
+file_id, not as a second copy.
+
+Compaction runs at the start of each user turn, and mid-loop only when the
+history exceeds its token budget, so prompt-cache prefixes survive within a
+multi-round tool loop.
+"""
+
+import os
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_STORED_RESULTS = int(os.environ.get("AGENT_MAX_STORED_RESULTS", "200"))
+MAX_STORED_CHARS = int(os.environ.get("AGENT_MAX_STORED_RESULT_CHARS", "2000000"))
+
+# Same rough estimate the API gateway uses: ~4 bytes per token
+CHARS_PER_TOKEN = 4
+
+COMPACTED_MARKER = "[Compacted tool result"
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count for a string, content block list or whole history."""
+    if isinstance(value, str):
+        return len(value) // CHARS_PER_TOKEN
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN
+
+
+def summarize_result(content: str, max_chars: int = 600) -> str:
+    """
+    Short description of a tool result: status, row counts per list field,
+    any `summary` block and a few scalar fields. Non-JSON results are truncated.
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return content[:max_chars]
+
+    if isinstance(data, list):
+        return f"list of {len(data)} items"[:max_chars]
+    if not isinstance(data, dict):
+        return str(data)[:max_chars]
+
+    parts = []
+    for key in ("status", "message", "error"):
+        if key in data:
+            parts.append(f"{key}: {str(data[key])[:120]}")
+    for key, value in data.items():
+        if isinstance(value, list):
+            parts.append(f"{key}: {len(value)} rows")
+        elif isinstance(value, dict) and isinstance(value.get("rows"), list):
+            # Tabular encoding (see result_serializer.tabulate)
+            parts.append(f"{key}: {len(value['rows'])} rows ({', '.join(map(str, value.get('columns', [])[:12]))})")
+    if isinstance(data.get("summary"), dict):
+        parts.append(f"summary: {json.dumps(data['summary'], default=str)}")
+    for key, value in data.items():
+        if key in ("status", "message", "error", "summary"):
+            continue
+        if isinstance(value, (int, float, bool)) or (isinstance(value, str) and len(value) <= 80):
+            parts.append(f"{key}: {value}")
+
+    summary = "; ".join(parts)
+    return summary if len(summary) <= max_chars else summary[:max_chars - 3] + "..."
+
+
+def offloaded_file_id(content: str) -> Optional[str]:
+    """The managed-storage file_id of an offloaded result's preview, if it is one."""
+    if '"_result_overflow"' not in content:
+        return None
+    try:
+        overflow = json.loads(content).get("_result_overflow") or {}
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return overflow.get("file_id") if overflow.get("offloaded") else None
+
+
+class ContextManager:
+    """Per-session tool-result store plus the compaction policy for history."""
+
+    COMPACT_MIN_CHARS = 1500  # smaller results stay inline at turn boundaries
+    BUDGET_MIN_CHARS = 400    # over budget, compact anything larger than this
+
+    def __init__(
+        self,
+        token_budget: int = 60_000,
+        fallback: Callable[[str], Optional[str]] = None,
+        max_results: int = MAX_STORED_RESULTS,
+        max_chars: int = MAX_STORED_CHARS,
+    ):
+        """
+        Args:
+            token_budget: Estimated history tokens before mid-loop compaction kicks in
+            fallback: Looks up result_ids this store doesn't hold (e.g. offloaded results)
+            max_results: Stored results kept (least recently used dropped first)
+            max_chars: Total characters of stored results kept
+        """
+        self.token_budget = token_budget
+        self.fallback = fallback
+        self.max_results = max_results
+        self.max_chars = max_chars
+        self.results: "OrderedDict[str, str]" = OrderedDict()
+        self.offloaded: "OrderedDict[str, str]" = OrderedDict()  # result_id -> managed-storage file_id
+        self.stored_chars = 0
+        self.tokens_saved = 0
+
+    def store(self, result_id: str, content: str):
+        """Keep a consumed result (or a reference to its offloaded copy), evicting the oldest over the caps."""
+        file_id = offloaded_file_id(content)
+        if file_id is not None:
+            self.offloaded[result_id] = file_id
+            self.offloaded.move_to_end(result_id)
+            while len(self.offloaded) > self.max_results:
+                self.offloaded.popitem(last=False)
+            return
+        previous = self.results.pop(result_id, None)
+        if previous is not None:
+            self.stored_chars -= len(previous)
+        self.results[result_id] = content
+        self.stored_chars += len(content)
+        while self.results and (len(self.results) > self.max_results or self.stored_chars > self.max_chars):
+            evicted_id, evicted = self.results.popitem(last=False)
+            self.stored_chars -= len(evicted)
+            logger.debug(f"Stored result {evicted_id} evicted ({len(evicted):,} chars)")
+
+    def load(self, results: Dict[str, str], offloaded: Dict[str, str] = None):
+        """Restore a store saved with export()."""
+        for result_id, content in results.items():
+            self.store(result_id, content)
+        for result_id, file_id in (offloaded or {}).items():
+            self.offloaded[result_id] = file_id
+
+    def export(self) -> Dict[str, Dict[str, str]]:
+        return {"stored_results": dict(self.results), "offloaded_results": dict(self.offloaded)}
+
+    def clear(self):
+        self.results.clear()
+        self.offloaded.clear()
+        self.stored_chars = 0
+
+    def compact(self, history: List[Dict[str, Any]], min_chars: int = None) -> int:
+        """
+        Replace consumed tool results of at least min_chars with summaries.
+        Returns the estimated number of tokens removed from history.
+        """
+        min_chars = self.COMPACT_MIN_CHARS if min_chars is None else min_chars
+        last_assistant = max(
+            (i for i, message in enumerate(history) if message["role"] == "assistant"),
+            default=-1,
+        )
+        saved = 0
+        for message in history[:last_assistant]:
+            if message["role"] != "user" or not isinstance(message["content"], list):
+                continue
+            for index, block in enumerate(message["content"]):
+                if not isinstance(block, dict) or block.get("type") != "tool_result":
+                    continue
+                content = block.get("content")
+                if not isinstance(content, str) or len(content) < min_chars:
+                    continue
+                if content.startswith(COMPACTED_MARKER):
+                    continue
+                result_id = block["tool_use_id"]
+                compacted = (
+                    f'{COMPACTED_MARKER} — full data stored as result_id="{result_id}" '
+                    f"({len(content):,} chars); call get_stored_result to read it again]\n"
+                    f"{summarize_result(content)}"
+                )
+                if len(compacted) >= len(content):
+                    continue
+                self.store(result_id, content)
+                message["content"][index] = {**block, "content": compacted}
+                saved += estimate_tokens(content) - estimate_tokens(compacted)
+
+        if saved:
+            self.tokens_saved += saved
+            logger.debug(f"Compacted tool results: ~{saved} tokens removed from history")
+        return saved
+
+    def enforce_budget(self, history: List[Dict[str, Any]]) -> int:
+        """Compact more aggressively if the history has grown past the token budget."""
+        if estimate_tokens(history) <= self.token_budget:
+            return 0
+        return self.compact(history, min_chars=self.BUDGET_MIN_CHARS)
+
+    def get_stored_result(self, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Handler for the get_stored_result tool."""
+        result_id = tool_input.get("result_id", "")
+        content = self.results.get(result_id)
+        if content is not None:
+            self.results.move_to_end(result_id)
+        elif self.fallback:
+            content = self.fallback(self.offloaded.get(result_id, result_id))
+        if content is None:
+            return {
+                "status": "error",
+                "message": f"No stored result with result_id '{result_id}' (it may have expired; run the tool again)",
+            }
+        offset = max(0, int(tool_input.get("offset", 0) or 0))
+        max_chars = max(1, int(tool_input.get("max_chars", 20_000) or 20_000))
+        chunk = content[offset:offset + max_chars]
+        return {
+            "status": "success",
+            "result_id": result_id,
+            "offset": offset,
+            "returned_chars": len(chunk),
+            "total_chars": len(content),
+            "has_more": offset + len(chunk) < len(content),
+            "content": chunk,
+        }
@@ -0,0 +1,231 @@
+"""
+Google Ads API Agent — Metrics
+Process-wide counters, gauges and histograms, rendered in the Prometheus text
+exposition format by the server's /metrics endpoint. Self-contained, so the
+agent needs no extra dependency to be scraped.
+
+Series:
+    gads_agent_tool_duration_seconds{tool,action}          histogram
+    gads_agent_tool_errors_total{tool,action}              counter
+    gads_agent_tool_cache_total{tool,result}               counter
+    gads_agent_anthropic_request_duration_seconds{model}   histogram
+    gads_agent_tokens_total{model,type}                    counter
+    gads_agent_rounds_per_chat                             histogram
+    gads_agent_active_sessions                             gauge
+    gads_agent_ads_rate_wait_seconds{lane}                 histogram
+    gads_agent_ads_queue_depth{lane}                       gauge
+    gads_agent_ads_in_flight                               gauge
+    gads_agent_ads_quota_errors_total                      counter
+    gads_agent_retries_total{target,reason,outcome}        counter
+
+Usage:
+    from deploy.metrics import TOOL_DURATION, render_metrics
+
+    TOOL_DURATION.observe(0.42, tool="budget_manager", action="list_budgets")
+    text = render_metrics()
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """A gauge set directly, or read from a callback at scrape time (unlabelled)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # per label set: [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            for index, bound in enumerate(self.buckets):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {_format_value(state[index])}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_DURATION = REGISTRY.register(Histogram(
+    "gads_agent_tool_duration_seconds", "Tool execution latency.", ("tool", "action"),
+))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    "gads_agent_tool_errors_total", "Tool executions that raised an exception.", ("tool", "action"),
+))
+TOOL_CACHE = REGISTRY.register(Counter(
+    "gads_agent_tool_cache_total", "Read-only tool calls by outcome (cache hit, miss, or coalesced).", ("tool", "result"),
+))
+ANTHROPIC_DURATION = REGISTRY.register(Histogram(
+    "gads_agent_anthropic_request_duration_seconds", "Latency of one Anthropic Messages API round.", ("model",),
+))
+TOKENS = REGISTRY.register(Counter(
+    "gads_agent_tokens_total",
+    "Tokens reported in response.usage (type: input, output, cache_read, cache_creation).",
+    ("model", "type"),
+))
+ROUNDS_PER_CHAT = REGISTRY.register(Histogram(
+    "gads_agent_rounds_per_chat", "Anthropic rounds needed to answer one user message.",
+    buckets=(1, 2, 3, 4, 5, 8, 13, 20, 25),
+))
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "gads_agent_active_sessions", "Conversation sessions held in memory.",
+))
+
+ADS_RATE_WAIT = REGISTRY.register(Histogram(
+    "gads_agent_ads_rate_wait_seconds", "Time Google Ads calls waited for rate-limit capacity.", ("lane",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+))
+ADS_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "gads_agent_ads_queue_depth", "Google Ads calls waiting for rate-limit capacity.", ("lane",),
+))
+ADS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "gads_agent_ads_in_flight", "Google Ads calls in progress.",
+))
+ADS_QUOTA_ERRORS = REGISTRY.register(Counter(
+    "gads_agent_ads_quota_errors_total", "Google Ads calls rejected with RESOURCE_EXHAUSTED / quota errors.",
+))
+RETRIES = REGISTRY.register(Counter(
+    "gads_agent_retries_total",
+    "Transient failures by target (google_ads, anthropic), reason and outcome (retried, gave_up).",
+    ("target", "reason", "outcome"),
+))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+def record_usage(model: str, usage) -> None:
+    """Count the tokens of one response.usage."""
+    for field, kind in (
+        ("input_tokens", "input"),
+        ("output_tokens", "output"),
+        ("cache_read_input_tokens", "cache_read"),
+        ("cache_creation_input_tokens", "cache_creation"),
+    ):
+        value = getattr(usage, field, 0) or 0
+        if value:
+            TOKENS.inc(value, model=model, type=kind)
@@ -12,22 +12,146 @@ Usage:
     # Multi-turn conversation
     response = agent.chat("Drill into the top campaign by spend")
     print(response)
+
+    # From async code (e.g. the FastAPI server), without blocking the event loop
+    response = await agent.achat("Which campaigns are limited by budget?")
+
+    # Streaming: text deltas and tool progress as they happen
+    async for event in agent.astream_chat("Audit search terms for Acme Corp"):
+        print(event)
+
+    # With create_agent_system(), Claude can fan work out to sub-agents through
+    # the delegate_tasks tool (e.g. one reporting task per account in an MCC)
 """
 
 import os
 import json
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Optional
 from pathlib import Path
 
-import anthropic
+from deploy.tool_schemas import MAIN_AGENT_TOOLS, BUILTIN_TOOLS, SEQUENTIAL_TOOLS
+from deploy.tool_executor import ToolExecutor, is_read_only_call
+from deploy.context_manager import ContextManager
+from deploy.metrics import ANTHROPIC_DURATION, ROUNDS_PER_CHAT, record_usage
+from deploy.rate_limiter import BACKGROUND, use_priority
+from deploy.retry import ANTHROPIC_RETRY
 
-from deploy.tool_schemas import MAIN_AGENT_TOOLS
-from deploy.tool_executor import ToolExecutor
+if TYPE_CHECKING:
+    import anthropic
 
 logger = logging.getLogger(__name__)
 
 
+def load_anthropic():
+    """
+    The anthropic SDK, imported on first use. It is most of this package's
+    import time, so importing the server or CLI doesn't pay for it up front.
+    """
+    import anthropic
+    return anthropic
+
+
+# =============================================================================
+# PROMPT CACHING
+# =============================================================================
+# Every round resends the system prompt, all tool schemas and the conversation
+# so far. Cache breakpoints on those let Anthropic serve the stable prefix from
+# its prompt cache instead of re-reading it each round.
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _cached_system(prompt: str) -> List[Dict[str, Any]]:
+    return [{"type": "text", "text": prompt, "cache_control": CACHE_CONTROL}]
+
+
+def _cached_tools(tools: List[Dict]) -> List[Dict]:
+    if not tools:
+        return tools
+    return tools[:-1] + [{**tools[-1], "cache_control": CACHE_CONTROL}]
+
+
+def _cached_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Copy of messages with a breakpoint on the last block, so the whole history
+    up to this round becomes the cached prefix of the next one. History itself
+    is never modified (the API allows at most 4 breakpoints per request).
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    elif isinstance(content, list) and content and isinstance(content[-1], dict):
+        content = content[:-1] + [{**content[-1], "cache_control": CACHE_CONTROL}]
+    else:
+        return messages
+    return messages[:-1] + [{**last, "content": content}]
+
+
+# The 28 action tools plus in-process tools such as get_stored_result
+AGENT_TOOLS = MAIN_AGENT_TOOLS + BUILTIN_TOOLS
+CACHED_AGENT_TOOLS = _cached_tools(AGENT_TOOLS)
+
+# Sub-agents run unsupervised and several at a time, so they only read: no
+# SEQUENTIAL_TOOLS (mutations, shared state files, delegate_tasks), and the
+# executor refuses mutating actions of the mixed tools (is_delegable_call)
+SUB_AGENT_TOOLS = [tool for tool in AGENT_TOOLS if tool["name"] not in SEQUENTIAL_TOOLS]
+
+# =============================================================================
+# SUB-AGENT DELEGATION
+# =============================================================================
+# delegate_tasks runs SubAgent tasks on their own pool: sub-agents execute
+# their tools on the shared tool pool, so running them there could deadlock.
+
+MAX_PARALLEL_SUBAGENTS = int(os.environ.get("AGENT_MAX_PARALLEL_SUBAGENTS", "8"))
+MAX_DELEGATED_TASKS = 20
+DEFAULT_TASK_TOKEN_BUDGET = 150_000
+DEFAULT_TASK_TIMEOUT = 300
+DELEGATION_GRACE_SECONDS = 10  # extra wait for a task finishing its last round
+
+_subagent_pool: Optional[ThreadPoolExecutor] = None
+_subagent_pool_lock = threading.Lock()
+
+
+def _get_subagent_pool() -> ThreadPoolExecutor:
+    global _subagent_pool
+    with _subagent_pool_lock:
+        if _subagent_pool is None:
+            _subagent_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_SUBAGENTS, thread_name_prefix="subagent")
+        return _subagent_pool
+
+
+class _TaskCancel:
+    """Cancellation of one delegated task: set by delegate_tasks, or past the task's deadline."""
+
+    def __init__(self, deadline: float = None, event: threading.Event = None):
+        self.deadline = deadline
+        self.event = event
+
+    def is_set(self) -> bool:
+        if self.event is not None and self.event.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+def _response_tokens(response) -> int:
+    """Input (including cached), and output tokens of one response."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0
+    return sum(
+        getattr(usage, field, 0) or 0
+        for field in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+    )
+
+
 class GoogleAdsAgent:
     """
     Main orchestrator for the Google Ads Agent system.
@@ -35,13 +159,19 @@ class GoogleAdsAgent:
     Handles:
     - Multi-turn conversations with Claude
     - Tool use loop (send → tool_use → execute → return → repeat)
+    - Concurrent execution of independent read-only tool calls in one turn
+    - Prompt caching of the system prompt, tools and conversation prefix
     - Sub-agent delegation for large/complex tasks
-    - Conversation history management
+    - Conversation history management (consumed tool results are compacted
+      to summaries once history outgrows its token budget)
     """
 
     DEFAULT_MODEL = "claude-opus-4-5-20251101"
     MAX_TOKENS = 8192
     MAX_TOOL_ROUNDS = 25  # Safety limit on tool use loops
+    PROMPT_CACHING = True  # cache_control breakpoints on system, tools and history
+    CONTEXT_TOKEN_BUDGET = int(os.environ.get("AGENT_CONTEXT_TOKEN_BUDGET", "60000"))
+    MAX_ROUNDS_MESSAGE = "[Agent reached maximum tool execution rounds. Please try a more specific request.]"
 
     def __init__(
         self,
@@ -50,6 +180,7 @@ class GoogleAdsAgent:
         repo_root: str = None,
         credentials: Dict[str, str] = None,
         system_prompt_path: str = None,
+        parallel_tools: bool = True,
     ):
         """
         Initialize the Google Ads Agent.
@@ -60,14 +191,43 @@ class GoogleAdsAgent:
             repo_root: Path to the repo root (for loading action files)
             credentials: Dict of Google Ads/Cloudinary/etc credentials
             system_prompt_path: Path to system prompt file
+            parallel_tools: Run independent read-only tool calls concurrently
         """
-        self.client = anthropic.Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+        self._api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        # Retries are ANTHROPIC_RETRY's job (deploy/retry.py), not the SDK's
+        self.client = load_anthropic().Anthropic(api_key=self._api_key, max_retries=0)
+        self._async_client: Optional["anthropic.AsyncAnthropic"] = None
         self.model = model or self.DEFAULT_MODEL
         self.repo_root = Path(repo_root or os.path.dirname(os.path.dirname(__file__)))
-        self.executor = ToolExecutor(repo_root=str(self.repo_root), credentials=credentials)
+        self.executor = ToolExecutor(
+            repo_root=str(self.repo_root), credentials=credentials, parallel=parallel_tools
+        )
         self.system_prompt = self._load_system_prompt(system_prompt_path)
         self.conversation_history: List[Dict[str, Any]] = []
+        self.context = ContextManager(
+            token_budget=self.CONTEXT_TOKEN_BUDGET, fallback=self.executor.serializer.read_offloaded
+        )
+        self.executor.register_builtin("get_stored_result", self.context.get_stored_result)
+        self.executor.register_builtin("delegate_tasks", self.delegate_tasks)
         self.sub_agents: Dict[str, "SubAgent"] = {}
+        # Tool batch a disconnected astream_chat() left running (see _stream_tool_uses)
+        self._abandoned_tools: Optional[asyncio.Future] = None
+        self.usage: Dict[str, int] = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+
+    @property
+    def async_client(self) -> "anthropic.AsyncAnthropic":
+        """AsyncAnthropic client, created on first use by achat()."""
+        if self._async_client is None:
+            self._async_client = load_anthropic().AsyncAnthropic(api_key=self._api_key, max_retries=0)
+        return self._async_client
 
     def _load_system_prompt(self, path: str = None) -> str:
         """Load the system prompt from file."""
@@ -98,15 +258,22 @@ class GoogleAdsAgent:
             The agent's final text response
         """
         # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        self._start_turn(user_message)
 
         # Run the agentic loop
         response_text = self._run_agent_loop()
         return response_text
 
+    async def achat(self, user_message: str) -> str:
+        """
+        Async variant of chat(). Claude is called through AsyncAnthropic and
+        tool execution is offloaded to the event loop's worker threads, so
+        other conversations keep running while this one waits.
+        """
+        await self._settle_abandoned_tools()
+        self._start_turn(user_message)
+        return await self._arun_agent_loop()
+
     def _run_agent_loop(self) -> str:
         """
         Core agentic loop: send → check for tool_use → execute → return → repeat.
@@ -119,54 +286,281 @@ class GoogleAdsAgent:
             logger.debug(f"Agent loop round {rounds}")
 
             # Call Claude
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.MAX_TOKENS,
-                system=self.system_prompt,
-                tools=MAIN_AGENT_TOOLS,
-                messages=self.conversation_history,
-            )
-
-            # Process the response
-            assistant_content = response.content
-            stop_reason = response.stop_reason
-
-            # Add assistant response to history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_content
-            })
+            round_started = time.monotonic()
+            response = ANTHROPIC_RETRY.call(self.client.messages.create, **self._request_params())
+            ANTHROPIC_DURATION.observe(time.monotonic() - round_started, model=self.model)
 
             # If no tool use, we're done — extract text
-            if stop_reason != "tool_use":
-                return self._extract_text(assistant_content)
-
-            # Handle tool calls
-            tool_results = []
-            for block in assistant_content:
-                if block.type == "tool_use":
-                    logger.info(f"Executing tool: {block.name} (id: {block.id})")
-                    logger.debug(f"Tool input: {json.dumps(block.input, indent=2)}")
-
-                    # Execute the tool
-                    result = self.executor.execute(block.name, block.input)
-                    logger.debug(f"Tool result (truncated): {result[:500]}")
-
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result
-                    })
-
-            # Add tool results to history
-            self.conversation_history.append({
-                "role": "user",
-                "content": tool_results
-            })
+            tool_uses = self._record_response(response)
+            if tool_uses is None:
+                ROUNDS_PER_CHAT.observe(rounds)
+                return self._extract_text(response.content)
+
+            # Handle tool calls (independent reads run concurrently, results stay in order)
+            tool_results = self.executor.execute_tool_uses(tool_uses)
+            self._record_tool_results(tool_results)
 
         # Safety: hit max rounds
         logger.warning(f"Hit max tool rounds ({self.MAX_TOOL_ROUNDS})")
-        return "[Agent reached maximum tool execution rounds. Please try a more specific request.]"
+        ROUNDS_PER_CHAT.observe(rounds)
+        return self.MAX_ROUNDS_MESSAGE
+
+    async def _arun_agent_loop(self) -> str:
+        """Async twin of _run_agent_loop(); see achat()."""
+        rounds = 0
+
+        while rounds < self.MAX_TOOL_ROUNDS:
+            rounds += 1
+            logger.debug(f"Agent loop round {rounds}")
+
+            round_started = time.monotonic()
+            response = await ANTHROPIC_RETRY.acall(self.async_client.messages.create, **self._request_params())
+            ANTHROPIC_DURATION.observe(time.monotonic() - round_started, model=self.model)
+
+            tool_uses = self._record_response(response)
+            if tool_uses is None:
+                ROUNDS_PER_CHAT.observe(rounds)
+                return self._extract_text(response.content)
+
+            tool_results = await asyncio.to_thread(self.executor.execute_tool_uses, tool_uses)
+            self._record_tool_results(tool_results)
+
+        logger.warning(f"Hit max tool rounds ({self.MAX_TOOL_ROUNDS})")
+        ROUNDS_PER_CHAT.observe(rounds)
+        return self.MAX_ROUNDS_MESSAGE
+
+    async def astream_chat(self, user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of achat(). Yields event dicts as the turn progresses:
+
+            {"type": "text_delta", "text": ...}
+            {"type": "tool_start", "id": ..., "tool": ..., "input": {...}}
+            {"type": "tool_finish", "id": ..., "tool": ..., "duration_ms": ..., "result_chars": ...}
+            {"type": "done", "response": ..., "rounds": ..., "tool_calls": ..., "duration_ms": ...}
+
+        If the consumer stops early (e.g. the HTTP client disconnects), the
+        partial turn is removed from history so it stays valid for the next one,
+        and tool calls that haven't started are not run. If a write had already
+        started, the turn is kept instead: its tool results are recorded when
+        the running batch ends, so the next turn sees what was applied.
+        """
+        await self._settle_abandoned_tools()
+        started = time.monotonic()
+        history_len = len(self.conversation_history)
+        self._start_turn(user_message)
+        completed = False
+        rounds = 0
+        tool_calls = 0
+
+        try:
+            while rounds < self.MAX_TOOL_ROUNDS:
+                rounds += 1
+                logger.debug(f"Agent stream round {rounds}")
+
+                round_started = time.monotonic()
+                attempt = 0
+                while True:
+                    attempt += 1
+                    streamed = False
+                    try:
+                        async with self.async_client.messages.stream(**self._request_params()) as stream:
+                            async for event in stream:
+                                if event.type == "text":
+                                    streamed = True
+                                    yield {"type": "text_delta", "text": event.text}
+                            response = await stream.get_final_message()
+                        break
+                    except Exception as e:
+                        # Once text has reached the client the round can't be replayed
+                        delay = None if streamed else ANTHROPIC_RETRY.backoff(e, attempt, round_started)
+                        if delay is None:
+                            raise
+                    await asyncio.sleep(delay)
+                ANTHROPIC_DURATION.observe(time.monotonic() - round_started, model=self.model)
+
+                tool_uses = self._record_response(response)
+                if tool_uses is None:
+                    response_text = self._extract_text(response.content)
+                    break
+
+                tool_calls += len(tool_uses)
+                tool_events = self._stream_tool_uses(tool_uses)
+                try:
+                    async for event in tool_events:
+                        yield event
+                finally:
+                    # Closed now, not at garbage collection, so an abandoned batch is
+                    # handled before the rollback below
+                    await tool_events.aclose()
+            else:
+                logger.warning(f"Hit max tool rounds ({self.MAX_TOOL_ROUNDS})")
+                response_text = self.MAX_ROUNDS_MESSAGE
+
+            completed = True
+            ROUNDS_PER_CHAT.observe(rounds)
+            yield {
+                "type": "done",
+                "response": response_text,
+                "rounds": rounds,
+                "tool_calls": tool_calls,
+                "duration_ms": round((time.monotonic() - started) * 1000),
+            }
+        finally:
+            if not completed and self._abandoned_tools is None:
+                del self.conversation_history[history_len:]
+
+    async def _stream_tool_uses(self, tool_uses: List[Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run one turn's tools on a worker thread, yielding start/finish events as they happen."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        cancel = threading.Event()
+        write_started = threading.Event()
+
+        def progress(kind, block, result=None, elapsed=None):
+            event = {"type": kind, "id": block.id, "tool": block.name}
+            if kind == "tool_start":
+                if not is_read_only_call(block.name, block.input):
+                    write_started.set()
+                event["input"] = block.input
+            else:
+                event["duration_ms"] = round(elapsed * 1000)
+                event["result_chars"] = len(result)
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        # The worker thread can't be interrupted; cancel only keeps further calls from starting
+        task = asyncio.ensure_future(
+            asyncio.to_thread(self.executor.execute_tool_uses, tool_uses, progress, cancel)
+        )
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                break
+            # Events queued before the worker returned are still pending
+            while not events.empty():
+                yield events.get_nowait()
+        except BaseException:
+            # The consumer went away (GeneratorExit / CancelledError) mid-batch
+            if getter is not None:
+                getter.cancel()
+            cancel.set()
+            if write_started.is_set():
+                # A write may be applied: keep the turn and record its results once the batch ends
+                self._abandoned_tools = task
+                task.add_done_callback(self._record_abandoned_tools)
+            raise
+
+        self._record_tool_results(task.result())
+
+    def _record_abandoned_tools(self, task: asyncio.Future):
+        """Done callback of a batch left running by a disconnected stream."""
+        if task is not self._abandoned_tools:
+            return  # the conversation was reset meanwhile
+        try:
+            tool_results = task.result()
+        except BaseException as e:
+            tool_results = self._unanswered_tool_results(f"[Tool execution failed: {e}]")
+        self._record_tool_results(tool_results)
+
+    async def _settle_abandoned_tools(self):
+        """Before a new turn, wait for an abandoned batch (its done callback records the results)."""
+        task = self._abandoned_tools
+        if task is not None:
+            await asyncio.wait({task})
+            self._abandoned_tools = None
+
+    def _unanswered_tool_results(self, message: str) -> List[Dict[str, Any]]:
+        """tool_result blocks for the tool_use blocks of the last message, if it is an assistant one."""
+        if not self.conversation_history or self.conversation_history[-1]["role"] != "assistant":
+            return []
+        content = self.conversation_history[-1]["content"]
+        blocks = content if isinstance(content, list) else []
+        return [
+            {"type": "tool_result", "tool_use_id": _block_field(block, "id"), "content": message}
+            for block in blocks
+            if _block_field(block, "type") == "tool_use"
+        ]
+
+    def _start_turn(self, user_message: str):
+        """
+        Compact tool results consumed in earlier turns, then add the user message.
+        Compacting only at turn boundaries (or when over budget) keeps the
+        history prefix stable, and so cacheable, within a tool loop.
+        """
+        abandoned = self._abandoned_tools
+        if abandoned is not None:
+            if not abandoned.done():
+                raise RuntimeError("The previous turn's tools are still running")
+            self._abandoned_tools = None
+        else:
+            # e.g. restored from a snapshot taken while an abandoned batch was still running
+            unanswered = self._unanswered_tool_results("[No result recorded: the turn ended while this tool ran]")
+            if unanswered:
+                self._record_tool_results(unanswered)
+        self.context.compact(self.conversation_history)
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+    def _request_params(self) -> Dict[str, Any]:
+        """Arguments for one messages.create() round."""
+        if not self.PROMPT_CACHING:
+            return {
+                "model": self.model,
+                "max_tokens": self.MAX_TOKENS,
+                "system": self.system_prompt,
+                "tools": AGENT_TOOLS,
+                "messages": self.conversation_history,
+            }
+        return {
+            "model": self.model,
+            "max_tokens": self.MAX_TOKENS,
+            "system": _cached_system(self.system_prompt),
+            "tools": CACHED_AGENT_TOOLS,
+            "messages": _cached_messages(self.conversation_history),
+        }
+
+    def _record_usage(self, response):
+        """Accumulate token usage and prompt-cache hit/miss counts for this session."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        record_usage(self.model, usage)
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.usage["requests"] += 1
+        self.usage["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+        self.usage["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+        self.usage["cache_read_input_tokens"] += cache_read
+        self.usage["cache_creation_input_tokens"] += getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.usage["cache_hits" if cache_read else "cache_misses"] += 1
+
+    def _record_response(self, response) -> Optional[List[Any]]:
+        """
+        Add Claude's response to history. Returns its tool_use blocks, or None
+        when the turn is finished (no tool use requested).
+        """
+        self._record_usage(response)
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": response.content
+        })
+        if response.stop_reason != "tool_use":
+            return None
+        return [block for block in response.content if block.type == "tool_use"]
+
+    def _record_tool_results(self, tool_results: List[Dict[str, Any]]):
+        """Add tool results to history as the next user message."""
+        self.conversation_history.append({
+            "role": "user",
+            "content": tool_results
+        })
+        self.context.enforce_budget(self.conversation_history)
 
     def _extract_text(self, content_blocks) -> str:
         """Extract text from Claude's response content blocks."""
@@ -179,11 +573,138 @@ class GoogleAdsAgent:
     def reset_conversation(self):
         """Clear conversation history to start fresh."""
         self.conversation_history = []
+        self._abandoned_tools = None
+        self.context.clear()
 
     def get_conversation_history(self) -> List[Dict[str, Any]]:
         """Return the full conversation history."""
         return self.conversation_history
 
+    def find_sub_agent(self, name: str) -> Optional["SubAgent"]:
+        """Look up a registered sub-agent by key (e.g. "reporting"), full name or agent_id."""
+        for sub in self.sub_agents.values():
+            if name in (sub.key, sub.name, sub.agent_id):
+                return sub
+        return None
+
+    def delegate_tasks(self, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handler for the delegate_tasks tool: run independent sub-agent tasks
+        concurrently, each within its own token and time budget, and merge
+        their results in the order they were given.
+        """
+        tasks = tool_input.get("tasks") or []
+        if not tasks:
+            return {"status": "error", "message": "No tasks given"}
+        if len(tasks) > MAX_DELEGATED_TASKS:
+            return {"status": "error", "message": f"At most {MAX_DELEGATED_TASKS} tasks per call (got {len(tasks)})"}
+
+        max_parallel = max(1, min(int(tool_input.get("max_parallel") or 4), MAX_PARALLEL_SUBAGENTS))
+        token_budget = int(tool_input.get("token_budget_per_task") or DEFAULT_TASK_TOKEN_BUDGET)
+        timeout = float(tool_input.get("timeout_seconds") or DEFAULT_TASK_TIMEOUT)
+
+        started = time.monotonic()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        runnable = []
+        for index, task in enumerate(tasks):
+            label = task.get("label") or f"task_{index + 1}"
+            sub = self.find_sub_agent(task.get("agent", ""))
+            if sub is None:
+                known = sorted(s.key for s in self.sub_agents.values())
+                results[index] = {"label": label, "agent": task.get("agent"), "status": "error",
+                                  "output": f"Unknown sub-agent '{task.get('agent')}'. Available: {known}"}
+            else:
+                runnable.append((index, label, sub, task))
+
+        def run(label, sub, task, deadline, cancel):
+            logger.info(f"Delegating to {sub.key}: {label}")
+            try:
+                # Fan-out yields Google Ads capacity to interactive chat turns
+                with use_priority(BACKGROUND):
+                    outcome = sub.run_task(task["task"], task.get("context"), token_budget, deadline, cancel)
+            except Exception as e:
+                logger.error(f"Delegated task failed ({sub.key}: {label}): {e}")
+                outcome = {"status": "error", "output": str(e)}
+            return {"label": label, "agent": sub.key, **outcome}
+
+        # Rolling submission: at most max_parallel of this call's tasks hold pool
+        # threads, including timed-out ones still finishing their current call
+        pool = _get_subagent_pool()
+        running: Dict[Any, tuple] = {}
+        draining = set()
+        while runnable or running:
+            while runnable and len(running) + len(draining) < max_parallel:
+                index, label, sub, task = runnable.pop(0)
+                deadline = time.monotonic() + timeout
+                cancel = threading.Event()
+                future = pool.submit(run, label, sub, task, deadline, cancel)
+                running[future] = (index, label, sub, deadline, cancel)
+
+            # Wake up for the next finished task or the earliest overdue one
+            next_cutoff = min(entry[3] for entry in running.values()) + DELEGATION_GRACE_SECONDS if running else None
+            timeout_left = None if next_cutoff is None else max(0.0, next_cutoff - time.monotonic())
+            done, _ = wait(set(running) | draining, timeout=timeout_left, return_when=FIRST_COMPLETED)
+            for future in done:
+                draining.discard(future)
+                if future in running:
+                    index = running.pop(future)[0]
+                    results[index] = future.result()
+            now = time.monotonic()
+            for future, (index, label, sub, deadline, cancel) in list(running.items()):
+                if now >= deadline + DELEGATION_GRACE_SECONDS:
+                    # Its pending tool calls are skipped; a call already running finishes
+                    cancel.set()
+                    del running[future]
+                    draining.add(future)
+                    results[index] = {"label": label, "agent": sub.key, "status": "timeout",
+                                      "output": f"[No result within {timeout:.0f}s]"}
+
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        return {
+            "status": "success" if succeeded == len(results) else "partial" if succeeded else "error",
+            "tasks": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "total_tokens": sum(result.get("tokens", 0) for result in results),
+            "duration_ms": round((time.monotonic() - started) * 1000),
+            "results": results,
+        }
+
+    def export_state(self, version: int = 0) -> Dict[str, Any]:
+        """JSON-serializable session state (see deploy/session_store.py)."""
+        return {
+            "version": version,
+            "model": self.model,
+            "conversation_history": [
+                {"role": message["role"], "content": _content_to_dicts(message["content"])}
+                for message in self.conversation_history
+            ],
+            "usage": dict(self.usage),
+            **self.context.export(),
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        """Restore a session saved with export_state()."""
+        self.model = state.get("model") or self.model
+        self.conversation_history = state.get("conversation_history", [])
+        self.usage.update(state.get("usage", {}))
+        self.context.load(state.get("stored_results", {}), state.get("offloaded_results"))
+
+
+def _block_field(block: Any, name: str) -> Any:
+    """A field of a content block, as an SDK object or a plain dict (restored sessions)."""
+    return block.get(name) if isinstance(block, dict) else getattr(block, name, None)
+
+
+def _content_to_dicts(content: Any) -> Any:
+    """Convert SDK content blocks (assistant messages) to plain dicts the API accepts back."""
+    if not isinstance(content, list):
+        return content
+    return [
+        block.model_dump(exclude_none=True) if hasattr(block, "model_dump") else block
+        for block in content
+    ]
+
 
 class SubAgent:
     """
@@ -191,6 +712,8 @@ class SubAgent:
     Each sub-agent has its own system prompt, tools, and conversation context.
     """
 
+    MAX_ROUNDS = 15
+
     def __init__(
         self,
         name: str,
@@ -201,15 +724,25 @@ class SubAgent:
         api_key: str = None,
         repo_root: str = None,
         credentials: Dict[str, str] = None,
+        parallel_tools: bool = True,
+        executor: ToolExecutor = None,
+        key: str = None,
     ):
         self.name = name
         self.agent_id = agent_id
-        self.client = anthropic.Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+        self.key = key or agent_id  # short name used by delegate_tasks
+        self.client = load_anthropic().Anthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"), max_retries=0
+        )
         self.model = model
         self.tools = tools or []
         self.repo_root = Path(repo_root or os.path.dirname(os.path.dirname(__file__)))
-        self.executor = ToolExecutor(repo_root=str(self.repo_root), credentials=credentials)
+        # Sub-agents normally share their parent's executor (see create_agent_system)
+        self.executor = executor or ToolExecutor(
+            repo_root=str(self.repo_root), credentials=credentials, parallel=parallel_tools
+        )
         self.system_prompt = self._load_prompt(system_prompt_path)
+        self._cached_tools = _cached_tools(self.tools)
 
     def _load_prompt(self, path: str = None) -> str:
         if path and Path(path).exists():
@@ -221,6 +754,28 @@ class SubAgent:
         Execute a delegated task and return the result.
         Sub-agents run a fresh conversation per task (no persistent history).
         """
+        return self.run_task(task_description, context)["output"]
+
+    def run_task(
+        self,
+        task_description: str,
+        context: Dict = None,
+        token_budget: int = None,
+        deadline: float = None,
+        cancel: threading.Event = None,
+    ) -> Dict[str, Any]:
+        """
+        execute_task() with budgets. Stops after the round that exhausts
+        token_budget, or once time.monotonic() passes deadline or cancel is
+        set; both are also checked between tool calls. Returns
+        {"status", "output", "rounds", "tokens", "duration_ms"}; status is
+        success, budget_exceeded, timeout or max_rounds.
+
+        Sub-agents only read: calls that would change Google Ads or shared
+        state are refused (see tool_executor.is_delegable_call).
+        """
+        stop = _TaskCancel(deadline, cancel)
+        started = time.monotonic()
         messages = [{"role": "user", "content": task_description}]
         if context:
             messages[0]["content"] = (
@@ -228,35 +783,54 @@ class SubAgent:
             )
 
         rounds = 0
-        max_rounds = 15
+        tokens = 0
+        status, output = "max_rounds", "[Sub-agent reached maximum rounds]"
+
+        while rounds < self.MAX_ROUNDS:
+            params = {}
+            if stop.is_set():
+                status, output = "timeout", "[Sub-agent ran out of time]"
+                break
+            if deadline is not None:
+                params["timeout"] = deadline - time.monotonic()
 
-        while rounds < max_rounds:
             rounds += 1
-            response = self.client.messages.create(
+            round_started = time.monotonic()
+            response = ANTHROPIC_RETRY.call(
+                self.client.messages.create,
                 model=self.model,
                 max_tokens=8192,
-                system=self.system_prompt,
-                tools=self.tools,
-                messages=messages,
+                system=_cached_system(self.system_prompt),
+                tools=self._cached_tools,
+                messages=_cached_messages(messages),
+                _deadline=deadline,
+                **params,
             )
+            ANTHROPIC_DURATION.observe(time.monotonic() - round_started, model=self.model)
+            if getattr(response, "usage", None) is not None:
+                record_usage(self.model, response.usage)
+            tokens += _response_tokens(response)
 
             messages.append({"role": "assistant", "content": response.content})
 
             if response.stop_reason != "tool_use":
-                return self._extract_text(response.content)
-
-            tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    result = self.executor.execute(block.name, block.input)
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result
-                    })
+                status, output = "success", self._extract_text(response.content)
+                break
+            if token_budget and tokens >= token_budget:
+                status, output = "budget_exceeded", self._extract_text(response.content)
+                break
+
+            tool_uses = [block for block in response.content if block.type == "tool_use"]
+            tool_results = self.executor.execute_tool_uses(tool_uses, cancel=stop, delegated=True)
             messages.append({"role": "user", "content": tool_results})
 
-        return "[Sub-agent reached maximum rounds]"
+        return {
+            "status": status,
+            "output": output,
+            "rounds": rounds,
+            "tokens": tokens,
+            "duration_ms": round((time.monotonic() - started) * 1000),
+        }
 
     def _extract_text(self, content_blocks) -> str:
         texts = []
@@ -280,21 +854,25 @@ def create_agent_system(api_key: str = None, repo_root: str = None) -> GoogleAds
     sub_agent_configs = [
         {
             "name": "Simba — Reporting & Analysis",
+            "key": "reporting",
             "agent_id": "8b9991fd-7750-417e-a2c2-69527d64388b",
             "prompt_file": "prompts/sub-agents/01_reporting_analysis.md",
         },
         {
             "name": "Nemo — Research & Intelligence",
+            "key": "research",
             "agent_id": "47885bdc-0390-44a4-ab58-9046c1182691",
             "prompt_file": "prompts/sub-agents/02_research_intelligence.md",
         },
         {
             "name": "Moana — Creative",
+            "key": "creative",
             "agent_id": "9aeb9afc-bd87-4df7-955a-1b928b23aa0e",
             "prompt_file": "prompts/sub-agents/05_creative.md",
         },
         {
             "name": "Baymax — Creative Innovate",
+            "key": "creative_innovate",
             "agent_id": "9b971c1c-0204-4496-869e-7a3620718242",
             "model": "claude-sonnet-4-5-20250929",
             "prompt_file": "prompts/sub-agents/06_creative_innovate.md",
@@ -309,8 +887,11 @@ def create_agent_system(api_key: str = None, repo_root: str = None) -> GoogleAds
             agent_id=config["agent_id"],
             model=config.get("model", "claude-opus-4-5-20251101"),
             system_prompt_path=prompt_path,
+            tools=SUB_AGENT_TOOLS,
             api_key=api_key,
             repo_root=str(root),
+            executor=agent.executor,
+            key=config["key"],
         )
         agent.sub_agents[config["name"]] = sub
 
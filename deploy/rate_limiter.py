@@ -0,0 +1,257 @@
+"""
+Google Ads API Agent — Google Ads Rate Limiter
+Process-wide governor for Google Ads service calls, so parallel tool calls
+across sessions queue up under the developer token's QPS instead of failing
+with RESOURCE_EXHAUSTED.
+
+Every call made through a pooled client (see deploy/client_pool.py) first
+acquires from the governor:
+
+1. Token bucket per developer token (overall QPS of this process)
+2. Token bucket per customer_id (keeps one large account from starving others)
+3. A cap on calls in flight
+4. Priority lanes: waiting "interactive" calls (chat turns) always go before
+   "background" ones (delegated sub-agent fan-out, batch jobs)
+5. A RESOURCE_EXHAUSTED / quota error pauses that developer token's bucket
+   for QUOTA_BACKOFF_SECONDS
+
+Calls wait rather than fail; only a wait longer than ADS_RATE_MAX_WAIT_SECONDS
+raises RateLimitTimeout.
+
+Configuration (env):
+    ADS_RATE_TOKEN_QPS         calls/sec per developer token (default: 10)
+    ADS_RATE_TOKEN_BURST       bucket size per developer token (default: 20)
+    ADS_RATE_CUSTOMER_QPS      calls/sec per customer_id (default: 5)
+    ADS_RATE_CUSTOMER_BURST    bucket size per customer_id (default: 10)
+    ADS_MAX_IN_FLIGHT          concurrent Google Ads calls (default: 16)
+    ADS_RATE_MAX_WAIT_SECONDS  longest wait before giving up (default: 60)
+    ADS_QUOTA_BACKOFF_SECONDS  pause after a quota error (default: 5)
+
+Usage:
+    from deploy.rate_limiter import get_governor, use_priority
+
+    with get_governor().slot(developer_key, customer_id):
+        response = ga_service.search(customer_id=customer_id, query=query)
+
+    with use_priority(BACKGROUND):
+        ...  # Google Ads calls made here yield to interactive ones
+"""
+
+import os
+import time
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from deploy.metrics import ADS_IN_FLIGHT, ADS_QUEUE_DEPTH, ADS_QUOTA_ERRORS, ADS_RATE_WAIT
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, BACKGROUND)
+
+TOKEN_QPS = float(os.environ.get("ADS_RATE_TOKEN_QPS", "10"))
+TOKEN_BURST = float(os.environ.get("ADS_RATE_TOKEN_BURST", "20"))
+CUSTOMER_QPS = float(os.environ.get("ADS_RATE_CUSTOMER_QPS", "5"))
+CUSTOMER_BURST = float(os.environ.get("ADS_RATE_CUSTOMER_BURST", "10"))
+MAX_IN_FLIGHT = int(os.environ.get("ADS_MAX_IN_FLIGHT", "16"))
+MAX_WAIT_SECONDS = float(os.environ.get("ADS_RATE_MAX_WAIT_SECONDS", "60"))
+QUOTA_BACKOFF_SECONDS = float(os.environ.get("ADS_QUOTA_BACKOFF_SECONDS", "5"))
+
+MAX_CUSTOMER_BUCKETS = 10_000
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("ads_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def use_priority(lane: str):
+    """Run the Google Ads calls made inside this block in the given lane."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown priority lane: {lane} (expected one of {LANES})")
+    token = _priority.set(lane)
+    try:
+        yield lane
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class RateLimitTimeout(TimeoutError):
+    """A Google Ads call waited longer than the governor's max_wait for capacity."""
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """RESOURCE_EXHAUSTED from gRPC or a Google Ads QuotaError."""
+    code = getattr(error, "code", None)
+    if callable(code):
+        try:
+            code = code()
+        except Exception:
+            code = None
+    if getattr(code, "name", None) == "RESOURCE_EXHAUSTED":
+        return True
+    text = str(error)
+    return "RESOURCE_EXHAUSTED" in text or "quota_error" in text
+
+
+class TokenBucket:
+    """Not thread-safe on its own; the governor holds its lock around every call."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if one is available now)."""
+        self._refill(now)
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, seconds: float, now: float):
+        """Empty the bucket so the next token arrives after `seconds`."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class AdsRateGovernor:
+    """Token buckets, in-flight cap and priority lanes shared by every Google Ads call."""
+
+    def __init__(
+        self,
+        token_qps: float = TOKEN_QPS,
+        token_burst: float = TOKEN_BURST,
+        customer_qps: float = CUSTOMER_QPS,
+        customer_burst: float = CUSTOMER_BURST,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ):
+        self.token_qps = token_qps
+        self.token_burst = token_burst
+        self.customer_qps = customer_qps
+        self.customer_burst = customer_burst
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._customer_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._in_flight = 0
+        self._waiting = {lane: 0 for lane in LANES}
+        self._condition = threading.Condition()
+        self.throttled = 0
+
+    def _token_bucket(self, developer_key: str) -> TokenBucket:
+        bucket = self._token_buckets.get(developer_key)
+        if bucket is None:
+            bucket = self._token_buckets[developer_key] = TokenBucket(self.token_qps, self.token_burst)
+        return bucket
+
+    def _customer_bucket(self, customer_id: str) -> TokenBucket:
+        bucket = self._customer_buckets.get(customer_id)
+        if bucket is None:
+            bucket = self._customer_buckets[customer_id] = TokenBucket(self.customer_qps, self.customer_burst)
+            while len(self._customer_buckets) > MAX_CUSTOMER_BUCKETS:
+                self._customer_buckets.popitem(last=False)
+        else:
+            self._customer_buckets.move_to_end(customer_id)
+        return bucket
+
+    def _wait_time(self, lane: str, developer_key: str, customer_id: Optional[str], now: float) -> float:
+        """0 if the call may start now, else how long to sleep before checking again."""
+        if lane == BACKGROUND and self._waiting[INTERACTIVE]:
+            return 0.05  # woken by notify when interactive calls get going
+        if self._in_flight >= self.max_in_flight:
+            return 0.05
+        wait = self._token_bucket(developer_key).wait_time(now)
+        if customer_id:
+            wait = max(wait, self._customer_bucket(customer_id).wait_time(now))
+        return wait
+
+    def acquire(self, developer_key: str, customer_id: Optional[str] = None, lane: str = None):
+        """Block until the call may start; every acquire() needs a release()."""
+        lane = lane or current_priority()
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._condition:
+            wait = self._wait_time(lane, developer_key, customer_id, started)
+            if wait:
+                self.throttled += 1
+                self._waiting[lane] += 1
+                ADS_QUEUE_DEPTH.set(self._waiting[lane], lane=lane)
+                try:
+                    while wait:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitTimeout(
+                                f"Google Ads call waited over {self.max_wait:g}s for rate-limit capacity"
+                            )
+                        self._condition.wait(min(wait, remaining))
+                        wait = self._wait_time(lane, developer_key, customer_id, time.monotonic())
+                finally:
+                    self._waiting[lane] -= 1
+                    ADS_QUEUE_DEPTH.set(self._waiting[lane], lane=lane)
+                    if lane == INTERACTIVE and not self._waiting[INTERACTIVE]:
+                        self._condition.notify_all()
+            self._token_bucket(developer_key).take()
+            if customer_id:
+                self._customer_bucket(customer_id).take()
+            self._in_flight += 1
+            ADS_IN_FLIGHT.set(self._in_flight)
+        ADS_RATE_WAIT.observe(time.monotonic() - started, lane=lane)
+
+    def release(self, developer_key: str, error: BaseException = None):
+        with self._condition:
+            self._in_flight -= 1
+            ADS_IN_FLIGHT.set(self._in_flight)
+            if error is not None and is_quota_error(error):
+                ADS_QUOTA_ERRORS.inc()
+                self._token_bucket(developer_key).pause(QUOTA_BACKOFF_SECONDS, time.monotonic())
+                logger.warning(f"Google Ads quota error; pausing calls for {QUOTA_BACKOFF_SECONDS:g}s")
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, developer_key: str, customer_id: Optional[str] = None, lane: str = None):
+        self.acquire(developer_key, customer_id, lane)
+        try:
+            yield
+        except BaseException as e:
+            self.release(developer_key, e)
+            raise
+        self.release(developer_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "in_flight": self._in_flight,
+                "waiting": dict(self._waiting),
+                "throttled": self.throttled,
+                "customers": len(self._customer_buckets),
+            }
+
+
+_governor: Optional[AdsRateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> AdsRateGovernor:
+    """The process-wide governor."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = AdsRateGovernor()
+        return _governor
@@ -0,0 +1,223 @@
+"""
+Google Ads API Agent — Columnar Report Results
+Report rows held as one list per field instead of one dict per row, so
+summaries are computed over whole columns and row dicts are only built for
+the rows that end up in the result.
+
+1. Built by deploy/row_decoder.decode_columns() straight from GoogleAdsRows
+2. Totals, masks and percentiles are vectorized with NumPy when it is
+   installed (optional); without it the same methods run as plain Python
+3. summary() gives totals, CTR, CPC, CPA, ROAS and cost percentiles
+4. records() / table() materialize rows at the edge: row dicts (missing
+   values left out, as the reporting actions always did) or the
+   {"columns", "rows"} layout of deploy/result_serializer.tabulate()
+5. columnar_result() gives any reporting tool's result that layout, for
+   result_format="columnar"
+
+Usage:
+    report = decode_columns(stream_rows(ga_service, customer_id, query), fields)
+    summary = report.summary()
+    wasted = report.where(("metrics.conversions", "==", 0), ("metrics.cost", ">=", 10))
+    return {"summary": summary, "results": report.records(wasted)}
+"""
+
+import math
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PERCENTILES = (50, 90, 99)
+
+_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+Condition = Tuple[str, str, Any]
+
+_numpy_module: Any = None
+
+
+def _numpy() -> Optional[Any]:
+    """NumPy if installed (imported on first use), else None."""
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy_module = numpy
+    return _numpy_module or None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Linear interpolation between closest ranks (NumPy's default method)."""
+    position = (len(ordered) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class ReportColumns:
+    """Decoded report rows stored column-wise."""
+
+    def __init__(self, columns: Dict[str, List[Any]]):
+        self.columns = columns
+        self.keys = list(columns)
+        self._length = len(next(iter(columns.values()))) if columns else 0
+        self._arrays: Dict[str, Any] = {}
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "ReportColumns":
+        """Columns from row dicts (keys in first-seen order, None where a row has none)."""
+        keys: Dict[str, None] = {}
+        for record in records:
+            keys.update(dict.fromkeys(record))
+        return cls({key: [record.get(key) for record in records] for key in keys})
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, key: str) -> List[Any]:
+        """Values of one field (None where a row has none); empty if the field wasn't selected."""
+        return self.columns.get(key, [])
+
+    def round(self, key: str, ndigits: int):
+        """Round a numeric column in place, as per-row round() would."""
+        if key in self.columns:
+            self.columns[key] = [round(value, ndigits) if _is_number(value) else value for value in self.columns[key]]
+            self._arrays.pop(key, None)
+
+    def _array(self, key: str) -> Any:
+        """NumPy array of a column: int64/float64 for numbers, object otherwise."""
+        array = self._arrays.get(key)
+        if array is None:
+            np = _numpy()
+            values = self.columns[key]
+            if values and all(_is_number(value) for value in values):
+                dtype = np.int64 if all(isinstance(value, int) for value in values) else np.float64
+                array = np.asarray(values, dtype=dtype)
+            else:
+                array = np.asarray(values, dtype=object)
+            self._arrays[key] = array
+        return array
+
+    def total(self, key: str) -> Any:
+        """Sum of a numeric column (0 if the field wasn't selected)."""
+        if key not in self.columns or not self._length:
+            return 0
+        if _numpy() is not None:
+            array = self._array(key)
+            if array.dtype != object:
+                return array.sum().item()
+        return sum(value for value in self.columns[key] if _is_number(value))
+
+    def where(self, *conditions: Condition) -> List[int]:
+        """
+        Indices of the rows matching every (key, op, value) condition, in row
+        order. A condition on a field that wasn't selected matches no row
+        (every row for "!=").
+        """
+        np = _numpy()
+        if np is not None:
+            mask = np.ones(self._length, dtype=bool)
+            for key, op, value in conditions:
+                if key not in self.columns:
+                    mask &= op == "!="
+                    continue
+                mask &= np.asarray(_OPERATORS[op](self._array(key), value), dtype=bool)
+            return np.flatnonzero(mask).tolist()
+
+        indices = range(self._length)
+        for key, op, value in conditions:
+            if key not in self.columns:
+                indices = indices if op == "!=" else []
+                continue
+            compare, column = _OPERATORS[op], self.columns[key]
+            indices = [index for index in indices if column[index] is not None and compare(column[index], value)]
+        return list(indices)
+
+    def percentiles(self, key: str, pcts: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """{"p50": ..., "p90": ..., "p99": ...} of a numeric column, rounded to 2 places."""
+        values = [value for value in self.column(key) if _is_number(value)]
+        if not values:
+            return {}
+        np = _numpy()
+        if np is not None:
+            array = self._array(key)
+            if array.dtype == object:
+                array = np.asarray(values, dtype=np.float64)
+            points = np.percentile(array, pcts).tolist()
+        else:
+            ordered = sorted(values)
+            points = [_percentile(ordered, pct) for pct in pcts]
+        return {f"p{pct:g}": round(point, 2) for pct, point in zip(pcts, points)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Account-level totals and ratios over every row, as the performance reporter reports them."""
+        if not self._length:
+            return {}
+        impressions = self.total("metrics.impressions")
+        clicks = self.total("metrics.clicks")
+        cost = self.total("metrics.cost")
+        conversions = self.total("metrics.conversions")
+        summary = {
+            "total_impressions": impressions,
+            "total_clicks": clicks,
+            "total_cost": round(cost, 2),
+            "total_conversions": round(conversions, 2),
+            "overall_ctr": round((clicks / impressions * 100), 2) if impressions > 0 else 0,
+            "overall_cpc": round(cost / clicks, 2) if clicks > 0 else 0,
+            "overall_cpa": round(cost / conversions, 2) if conversions > 0 else 0,
+        }
+        if "metrics.conversions_value" in self.columns:
+            conversions_value = self.total("metrics.conversions_value")
+            summary["total_conversions_value"] = round(conversions_value, 2)
+            summary["overall_roas"] = round(conversions_value / cost, 2) if cost > 0 else 0
+        if "metrics.cost" in self.columns:
+            summary["cost_percentiles"] = self.percentiles("metrics.cost")
+        return summary
+
+    def _indices(self, indices: Optional[Iterable[int]]) -> Iterable[int]:
+        return range(self._length) if indices is None else indices
+
+    def records(self, indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Row dicts (all rows, or the given indices), leaving out missing values."""
+        columns = [(key, self.columns[key]) for key in self.keys]
+        records = []
+        for index in self._indices(indices):
+            record = {}
+            for key, column in columns:
+                value = column[index]
+                if value is not None:
+                    record[key] = value
+            records.append(record)
+        return records
+
+    def table(self, indices: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """{"columns": [...], "rows": [[...]]}, the layout result_serializer.tabulate() produces."""
+        columns = [self.columns[key] for key in self.keys]
+        return {
+            "columns": list(self.keys),
+            "rows": [[column[index] for column in columns] for index in self._indices(indices)],
+        }
+
+
+def columnar_result(value: Any) -> Any:
+    """
+    A tool result with every list of row dicts, at any dict depth, as a
+    {"columns", "rows"} table (result_format="columnar"). Values inside rows
+    are left as they are.
+    """
+    if isinstance(value, dict):
+        return {key: columnar_result(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+        return ReportColumns.from_records(value).table()
+    return value
@@ -0,0 +1,306 @@
+"""
+Google Ads API Agent — Tool Result Cache
+Per-executor TTL memoization of read-only tool calls, so a repeated
+list_campaigns or search-term report within a session skips the GAQL round trip.
+
+1. Keyed on tool name + normalized input (customer IDs without dashes, no
+   None values, stable key order)
+2. Only read-only calls are cached (see tool_executor.is_read_only_call);
+   error results never are
+3. TTL depends on the date range: short when the range includes today,
+   long for closed historical ranges, medium for undated listings
+4. A mutating call invalidates the entries of the account it touched, in
+   every executor's cache (new_tool_cache registers them process-wide), so
+   no other session keeps serving reads from before the mutation
+5. Identical read-only calls that are in flight at the same time, from any
+   session, share one execution (SingleFlight), with or without the cache
+6. Actions that memoize per-account data themselves (e.g. the query
+   planner's entity counts) use a process-wide named cache
+   (get_shared_cache), which every mutation invalidates the same way
+   (invalidate_cached_results)
+
+Configuration (env):
+    AGENT_TOOL_CACHE        0 disables the cache (default: 1)
+    AGENT_CACHE_TTL_LIVE    seconds for ranges that include today (default: 60)
+    AGENT_CACHE_TTL_DEFAULT seconds for calls without a date range (default: 300)
+    AGENT_CACHE_TTL_CLOSED  seconds for closed historical ranges (default: 3600)
+    AGENT_SINGLE_FLIGHT     0 disables coalescing of concurrent identical reads (default: 1)
+    AGENT_SINGLE_FLIGHT_WAIT  seconds a caller waits for an identical in-flight call before
+                              running it itself (default: 30)
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+CACHE_ENABLED = os.environ.get("AGENT_TOOL_CACHE", "1").lower() not in ("0", "false", "no")
+TTL_LIVE = float(os.environ.get("AGENT_CACHE_TTL_LIVE", "60"))
+TTL_DEFAULT = float(os.environ.get("AGENT_CACHE_TTL_DEFAULT", "300"))
+TTL_CLOSED = float(os.environ.get("AGENT_CACHE_TTL_CLOSED", "3600"))
+SINGLE_FLIGHT_ENABLED = os.environ.get("AGENT_SINGLE_FLIGHT", "1").lower() not in ("0", "false", "no")
+SINGLE_FLIGHT_MAX_WAIT = float(os.environ.get("AGENT_SINGLE_FLIGHT_WAIT", "30"))
+
+# Predefined Google Ads date ranges that include today
+LIVE_DATE_RANGES = {
+    "TODAY", "THIS_WEEK_SUN_TODAY", "THIS_WEEK_MON_TODAY", "THIS_MONTH", "THIS_YEAR",
+}
+DATE_FIELDS = ("date_range", "change_date_range")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def account_scope(tool_input: Dict[str, Any]) -> Optional[str]:
+    """The account a call targets: a customer ID (digits) or a lowercased account name."""
+    customer_id = tool_input.get("customer_id")
+    if customer_id:
+        return str(customer_id).replace("-", "").strip()
+    search = tool_input.get("search")
+    if isinstance(search, str) and search.strip():
+        return search.strip().lower()
+    return None
+
+
+def ttl_for(tool_input: Dict[str, Any], today: date = None) -> float:
+    """Cache lifetime for a call, based on how fresh its date range is."""
+    today = today or date.today()
+    dates = []
+    dated = False
+    for field in DATE_FIELDS + ("start_date", "end_date"):
+        value = tool_input.get(field)
+        if not isinstance(value, str) or not value.strip():
+            continue
+        dated = True
+        if value.strip().upper() in LIVE_DATE_RANGES:
+            return TTL_LIVE
+        dates.extend(_ISO_DATE.findall(value))
+    if dates and max(dates) >= today.isoformat():
+        return TTL_LIVE
+    if tool_input.get("start_date") and not tool_input.get("end_date"):
+        return TTL_LIVE  # open-ended custom range runs through today
+    return TTL_CLOSED if dated else TTL_DEFAULT
+
+
+def _may_reflect(entry_scope: Optional[str], scope: str) -> bool:
+    """
+    Whether data scoped to entry_scope may reflect the account `scope`. Unscoped
+    entries, and entries named the other way (ID vs. name, which can't be
+    matched up), may.
+    """
+    return entry_scope is None or entry_scope == scope or entry_scope.isdigit() != scope.isdigit()
+
+
+class _Entry(NamedTuple):
+    value: str
+    expires_at: float
+    scope: Optional[str]
+
+
+class ResultCache:
+    """Thread-safe LRU of serialized tool results with per-entry TTLs."""
+
+    def __init__(self, max_entries: int = 128, max_chars: int = 2_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(tool_name: str, tool_input: Dict[str, Any]) -> str:
+        normalized = _normalize(tool_input)
+        if "customer_id" in normalized:
+            normalized["customer_id"] = str(normalized["customer_id"]).replace("-", "")
+        return tool_name + ":" + json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str, ttl: float, scope: Optional[str]):
+        if ttl <= 0 or len(value) > self.max_chars:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, time.monotonic() + ttl, scope)
+            self._chars += len(value)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, scope: Optional[str]) -> int:
+        """
+        Drop entries that may reflect an account changed by a mutation. Entries
+        without an account, and entries named the other way (ID vs. name, which
+        can't be matched up), are dropped too. scope=None clears everything.
+        """
+        with self._lock:
+            if scope is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._chars = 0
+                return dropped
+            stale = [key for key, entry in self._entries.items() if _may_reflect(entry.scope, scope)]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._chars -= len(entry.value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "chars": self._chars, "hits": self.hits, "misses": self.misses}
+
+
+class _Flight:
+    def __init__(self, scope: Optional[str]):
+        self.scope = scope
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Process-wide coalescing of identical concurrent calls: the first caller
+    (leader) runs the call, callers arriving while it runs wait for and
+    share its result. Nothing is kept after the call returns. A caller that
+    has waited max_wait seconds runs the call itself instead.
+    """
+
+    def __init__(self, max_wait: float = SINGLE_FLIGHT_MAX_WAIT):
+        self.max_wait = max_wait
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self.wait_timeouts = 0
+
+    def do(
+        self, key: str, fn: Callable[[], Any], scope: Optional[str] = None, timeout: Optional[float] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Return fn()'s result (or raise its error) and whether it came from
+        another caller's run. timeout overrides max_wait for this caller.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(scope)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(self.max_wait if timeout is None else timeout):
+                with self._lock:
+                    self.wait_timeouts += 1
+                return fn(), False
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def forget(self, prefix: str, scope: Optional[str]) -> int:
+        """
+        Stop sharing in-flight calls that may predate a mutation of `scope`
+        (same matching as ResultCache.invalidate); later callers start afresh.
+        """
+        with self._lock:
+            stale = [
+                key for key, flight in self._flights.items()
+                if key.startswith(prefix) and (scope is None or _may_reflect(flight.scope, scope))
+            ]
+            for key in stale:
+                del self._flights[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+_single_flight = SingleFlight()
+
+_shared_caches: Dict[str, ResultCache] = {}
+_shared_caches_lock = threading.Lock()
+# Per-executor tool-result caches; an executor's cache goes away with it
+_tool_caches: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+
+
+def get_single_flight() -> SingleFlight:
+    """The process-wide SingleFlight shared by every ToolExecutor."""
+    return _single_flight
+
+
+def get_shared_cache(name: str, max_entries: int = 256) -> ResultCache:
+    """
+    The process-wide cache `name`, created on first use. Entries are scoped
+    like tool results (account_scope) so mutations drop them through
+    invalidate_cached_results().
+    """
+    with _shared_caches_lock:
+        cache = _shared_caches.get(name)
+        if cache is None:
+            cache = _shared_caches[name] = ResultCache(max_entries=max_entries)
+        return cache
+
+
+def new_tool_cache() -> ResultCache:
+    """A ToolExecutor's own result cache, registered so mutations from any session invalidate it."""
+    cache = ResultCache()
+    with _shared_caches_lock:
+        _tool_caches.add(cache)
+    return cache
+
+
+def invalidate_cached_results(scope: Optional[str]) -> int:
+    """
+    Drop the entries that may reflect a mutated account (see
+    ResultCache.invalidate) from every executor's cache and every shared cache.
+    """
+    with _shared_caches_lock:
+        caches = list(_tool_caches) + list(_shared_caches.values())
+    return sum(cache.invalidate(scope) for cache in caches)
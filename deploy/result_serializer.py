@@ -0,0 +1,209 @@
+"""
+Google Ads API Agent — Tool Result Serializer
+Turns run() results into the text sent back to the model, within a token budget.
+
+1. Compact JSON — no indentation or spaces after separators
+2. Tabular encoding — lists of row dicts become {"columns": [...], "rows": [[...]]},
+   so keys are written once instead of once per row
+3. Token budget — a result over budget is written in full to the serializer's
+   own offload directory (AGENT_OFFLOAD_DIR) and the model gets a preview: the
+   first rows of each list, per-column summary stats and the file_id.
+   get_stored_result reads the full result back from the file_id.
+
+Offloaded results are one file each, named by their file_id and written
+atomically (temp file + os.replace), so there is no shared index to update:
+concurrent offloads from any session or thread can't lose each other. Files
+expire after AGENT_OFFLOAD_TTL_HOURS.
+
+Usage:
+    serializer = ResultSerializer(token_budget=8000, gateway_loader=load_gateway_module)
+    text = serializer.serialize("search_term_manager", tool_input, result)
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from deploy.context_manager import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+RESULT_TOKEN_BUDGET = int(os.environ.get("AGENT_RESULT_TOKEN_BUDGET", "8000"))
+OFFLOAD_DIR = os.environ.get("AGENT_OFFLOAD_DIR", os.path.join(tempfile.gettempdir(), "gads_agent_results"))
+OFFLOAD_TTL_HOURS = float(os.environ.get("AGENT_OFFLOAD_TTL_HOURS", "24"))
+SWEEP_INTERVAL_SECONDS = 600  # at most this often, offloading also deletes expired files
+
+TABLE_MIN_ROWS = 3  # shorter lists stay as plain objects
+PREVIEW_ROWS = (20, 10, 5, 2, 0)  # preview sizes tried, largest first
+
+_FILE_ID = re.compile(r"^result_[0-9a-f]{32}$")
+
+_sweep_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def to_compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def tabulate(value: Any) -> Any:
+    """Recursively replace lists of row dicts with a columns/rows table."""
+    if isinstance(value, dict):
+        return {key: tabulate(item) for key, item in value.items()}
+    if not isinstance(value, list):
+        return value
+    if len(value) >= TABLE_MIN_ROWS and all(isinstance(row, dict) for row in value):
+        columns: Dict[str, None] = {}
+        for row in value:
+            columns.update(dict.fromkeys(row))
+        return {
+            "columns": list(columns),
+            "rows": [[tabulate(row.get(column)) for column in columns] for row in value],
+        }
+    return [tabulate(item) for item in value]
+
+
+def _row_lists(result: Any) -> Dict[str, List[Any]]:
+    """The top-level list fields of a result (or the result itself if it is a list)."""
+    if isinstance(result, list):
+        return {"data": result}
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if isinstance(value, list)}
+    return {}
+
+
+class ResultSerializer:
+    """Compact, size-governed serialization of tool results for one executor."""
+
+    def __init__(
+        self, token_budget: int = None, gateway_loader: Callable[[], Any] = None, offload_dir: str = None,
+    ):
+        """
+        Args:
+            token_budget: Max estimated tokens per tool result (AGENT_RESULT_TOKEN_BUDGET)
+            gateway_loader: Returns the loaded 16_api_gateway module (for preview summary stats)
+            offload_dir: Where over-budget results are written (AGENT_OFFLOAD_DIR)
+        """
+        self.token_budget = token_budget or RESULT_TOKEN_BUDGET
+        self._gateway_loader = gateway_loader
+        self.offload_dir = offload_dir or OFFLOAD_DIR
+
+    def serialize(self, tool_name: str, tool_input: Dict[str, Any], result: Any, enforce_budget: bool = True) -> str:
+        if isinstance(result, str):
+            if not enforce_budget or estimate_tokens(result) <= self.token_budget:
+                return result
+            try:
+                result = json.loads(result)
+            except ValueError:
+                result = {"text": result}
+
+        text = to_compact_json(tabulate(result))
+        if not enforce_budget or estimate_tokens(text) <= self.token_budget:
+            return text
+        return self._offload(tool_name, tool_input, result, text)
+
+    def _path(self, file_id: str) -> str:
+        return os.path.join(self.offload_dir, f"{file_id}.json")
+
+    def _write_offload_file(self, text: str) -> str:
+        """Write one offloaded result atomically; returns its file_id."""
+        os.makedirs(self.offload_dir, exist_ok=True)
+        self._sweep_expired()
+        file_id = f"result_{uuid.uuid4().hex}"
+        fd, temp_path = tempfile.mkstemp(dir=self.offload_dir, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self._path(file_id))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return file_id
+
+    def _sweep_expired(self):
+        """Delete expired offload files, at most every SWEEP_INTERVAL_SECONDS per process."""
+        global _last_sweep
+        with _sweep_lock:
+            if time.monotonic() - _last_sweep < SWEEP_INTERVAL_SECONDS:
+                return
+            _last_sweep = time.monotonic()
+        cutoff = time.time() - OFFLOAD_TTL_HOURS * 3600
+        for entry in os.scandir(self.offload_dir):
+            try:
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def _offload(self, tool_name: str, tool_input: Dict[str, Any], result: Any, text: str) -> str:
+        """Store the full result in the offload directory and return a preview within budget."""
+        storage: Dict[str, Any] = {"offloaded": False}
+        try:
+            file_id = self._write_offload_file(text)
+            storage = {
+                "offloaded": True,
+                "file_id": file_id,
+                "expires_at": (datetime.now() + timedelta(hours=OFFLOAD_TTL_HOURS)).isoformat(),
+                "retrieval_instruction": (
+                    f"Call get_stored_result with result_id='{file_id}' to page through the full result"
+                ),
+            }
+        except Exception as e:
+            logger.warning(f"Could not offload large result of {tool_name}: {e}")
+            storage["offload_error"] = str(e)
+
+        gateway = None
+        try:
+            gateway = self._gateway_loader() if self._gateway_loader else None
+        except Exception as e:
+            logger.warning(f"Could not load the API gateway for summary stats: {e}")
+
+        lists = _row_lists(result)
+        overflow: Dict[str, Any] = {
+            **storage,
+            "estimated_tokens": estimate_tokens(text),
+            "token_budget": self.token_budget,
+            "total_rows": {key: len(rows) for key, rows in lists.items()},
+        }
+        if gateway is not None:
+            stats = {key: gateway.generate_summary_stats(rows) for key, rows in lists.items()}
+            overflow["summary_stats"] = {key: value for key, value in stats.items() if value}
+
+        for preview_rows in PREVIEW_ROWS:
+            if isinstance(result, dict):
+                preview = {
+                    key: value[:preview_rows] if isinstance(value, list) else value
+                    for key, value in result.items()
+                }
+            else:
+                preview = {"data": result[:preview_rows] if isinstance(result, list) else None}
+            preview["_result_overflow"] = {**overflow, "rows_shown": preview_rows}
+            candidate = to_compact_json(tabulate(preview))
+            if estimate_tokens(candidate) <= self.token_budget:
+                return candidate
+
+        # Even an empty preview is too large (huge scalar fields): send only the overflow note
+        return to_compact_json({"_result_overflow": {**overflow, "rows_shown": 0}})
+
+    def read_offloaded(self, file_id: str) -> Optional[str]:
+        """Full compact JSON of an offloaded result, or None if the file_id is unknown or expired."""
+        if not isinstance(file_id, str) or not _FILE_ID.match(file_id):
+            return None
+        path = self._path(file_id)
+        try:
+            if time.time() - os.path.getmtime(path) > OFFLOAD_TTL_HOURS * 3600:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
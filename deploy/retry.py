@@ -0,0 +1,222 @@
+"""
+Google Ads API Agent — Retry Policy
+Shared retry layer for transient Google Ads and Anthropic failures, so a
+blip is retried in place instead of costing a model round (the model would
+otherwise read the error and re-plan).
+
+1. Errors are classified as retryable (with a reason, used as a metric label)
+   or fatal. Fatal errors are raised at once.
+   - Google Ads: UNAVAILABLE, DEADLINE_EXCEEDED, INTERNAL, RESOURCE_EXHAUSTED,
+     ABORTED and GoogleAdsFailures made only of internal/transient or
+     temporary quota errors. Calls that change data (mutate_*, upload, apply,
+     ...) are only retried on RESOURCE_EXHAUSTED / quota errors, which reject
+     the request before it runs.
+   - Anthropic: connection errors and timeouts, 408, 409, 429, 5xx and 529
+     (overloaded), honoring Retry-After.
+2. Full-jitter exponential backoff: sleep U(0, min(max_delay, base * 2^n)).
+3. An overall deadline per call: no retry is started that would sleep past it.
+4. Retries and give-ups are counted in metrics (gads_agent_retries_total).
+
+Configuration (env):
+    AGENT_RETRY_MAX_ATTEMPTS   attempts per call, including the first (default: 4)
+    AGENT_RETRY_BASE_DELAY     first backoff ceiling in seconds (default: 0.5)
+    AGENT_RETRY_MAX_DELAY      largest backoff ceiling in seconds (default: 20)
+    AGENT_RETRY_DEADLINE       seconds from the first attempt (default: 60)
+
+Usage:
+    from deploy.retry import ANTHROPIC_RETRY, GOOGLE_ADS_RETRY
+
+    response = ANTHROPIC_RETRY.call(client.messages.create, **params)
+    rows = GOOGLE_ADS_RETRY.call(ga_service.search, customer_id=cid, query=q)
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from deploy.metrics import RETRIES
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.environ.get("AGENT_RETRY_MAX_ATTEMPTS", "4"))
+BASE_DELAY = float(os.environ.get("AGENT_RETRY_BASE_DELAY", "0.5"))
+MAX_DELAY = float(os.environ.get("AGENT_RETRY_MAX_DELAY", "20"))
+DEADLINE = float(os.environ.get("AGENT_RETRY_DEADLINE", "60"))
+
+RETRYABLE_GRPC_CODES = {"UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL", "RESOURCE_EXHAUSTED", "ABORTED"}
+QUOTA_GRPC_CODES = {"RESOURCE_EXHAUSTED"}
+RETRYABLE_ADS_ERRORS = {
+    ("internal_error", "INTERNAL_ERROR"),
+    ("internal_error", "TRANSIENT_ERROR"),
+    ("internal_error", "DEADLINE_EXCEEDED"),
+    ("quota_error", "RESOURCE_EXHAUSTED"),
+    ("quota_error", "RESOURCE_TEMPORARILY_EXHAUSTED"),
+    ("quota_error", "EXCESSIVE_SHORT_TERM_QUERY_RESOURCE_CONSUMPTION"),
+}
+RETRYABLE_HTTP_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+READ_METHOD_PREFIXES = ("search", "get_", "list_", "generate_", "suggest")
+
+
+def _grpc_code(error: BaseException) -> Optional[str]:
+    """Status code name of a grpc.RpcError, google.api_core error or GoogleAdsException."""
+    for candidate in (getattr(error, "error", None), error):
+        code = getattr(candidate, "code", None)
+        if callable(code):
+            try:
+                code = code()
+            except Exception:
+                code = None
+        name = getattr(code, "name", None)
+        if name:
+            return name
+        grpc_status = getattr(candidate, "grpc_status_code", None)
+        if getattr(grpc_status, "name", None):
+            return grpc_status.name
+    return None
+
+
+def _ads_failure_codes(error: BaseException) -> Optional[list]:
+    """(category, code) of every error in a GoogleAdsException's failure, if any."""
+    failure = getattr(error, "failure", None)
+    if failure is None:
+        return None
+    codes = []
+    for item in getattr(failure, "errors", []):
+        error_code = item.error_code
+        pb = type(error_code).pb(error_code) if hasattr(type(error_code), "pb") else error_code
+        category = pb.WhichOneof("error_code")
+        value = getattr(pb, category) if category else 0
+        field = pb.DESCRIPTOR.fields_by_name[category] if category else None
+        name = field.enum_type.values_by_number[value].name if field is not None and field.enum_type else str(value)
+        codes.append((category, name))
+    return codes
+
+
+def classify_google_ads_error(error: BaseException, idempotent: bool = True) -> Optional[str]:
+    """Retry reason for a Google Ads error, or None if it is fatal."""
+    failure_codes = _ads_failure_codes(error)
+    if failure_codes:
+        if not all(code in RETRYABLE_ADS_ERRORS for code in failure_codes):
+            return None
+        reason = failure_codes[0][1]
+        is_quota = all(category == "quota_error" for category, _ in failure_codes)
+    else:
+        reason = _grpc_code(error)
+        if reason not in RETRYABLE_GRPC_CODES:
+            return None
+        is_quota = reason in QUOTA_GRPC_CODES
+    return reason if idempotent or is_quota else None
+
+
+def classify_anthropic_error(error: BaseException) -> Optional[str]:
+    """Retry reason for an Anthropic SDK error, or None if it is fatal."""
+    name = type(error).__name__
+    if name in ("APIConnectionError", "APITimeoutError"):
+        return name
+    status = getattr(error, "status_code", None)
+    if status in RETRYABLE_HTTP_STATUS:
+        return str(status)
+    # Errors delivered inside an SSE stream carry the stream's 200 status
+    if "overloaded_error" in str(error):
+        return "overloaded"
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_idempotent(method: str) -> bool:
+    """Whether a Google Ads service method only reads (safe to repeat on any transient error)."""
+    return method.startswith(READ_METHOD_PREFIXES)
+
+
+class RetryPolicy:
+    """Classify → jittered exponential backoff → give up at max_attempts or the deadline."""
+
+    def __init__(
+        self,
+        target: str,
+        classify: Callable[[BaseException], Optional[str]],
+        max_attempts: int = MAX_ATTEMPTS,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        deadline: float = DEADLINE,
+    ):
+        self.target = target
+        self.classify = classify
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(
+        self,
+        error: BaseException,
+        attempt: int,
+        started: float,
+        deadline: float = None,
+        classify: Callable[[BaseException], Optional[str]] = None,
+    ) -> Optional[float]:
+        """
+        Seconds to sleep before retrying after `attempt` (1-based) failed with
+        `error`, or None to give up and re-raise. `deadline` is an absolute
+        time.monotonic() that caps the policy's own deadline.
+        """
+        reason = (classify or self.classify)(error)
+        if reason is None:
+            return None
+        cutoff = started + self.deadline
+        if deadline is not None:
+            cutoff = min(cutoff, deadline)
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        if attempt >= self.max_attempts or time.monotonic() + delay >= cutoff:
+            RETRIES.inc(target=self.target, reason=reason, outcome="gave_up")
+            logger.warning(f"{self.target}: giving up after {attempt} attempt(s): {reason}")
+            return None
+        RETRIES.inc(target=self.target, reason=reason, outcome="retried")
+        logger.info(f"{self.target}: {reason}, retry {attempt} in {delay:.2f}s")
+        return delay
+
+    def call(self, fn: Callable[..., Any], *args, _deadline: float = None,
+             _classify: Callable[[BaseException], Optional[str]] = None, **kwargs) -> Any:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self.backoff(e, attempt, started, _deadline, _classify)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def acall(self, fn: Callable[..., Awaitable[Any]], *args, _deadline: float = None, **kwargs) -> Any:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self.backoff(e, attempt, started, _deadline)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+
+GOOGLE_ADS_RETRY = RetryPolicy("google_ads", classify_google_ads_error)
+ANTHROPIC_RETRY = RetryPolicy("anthropic", classify_anthropic_error)
@@ -0,0 +1,195 @@
+"""
+Google Ads API Agent — Row Decoder
+Compiled GoogleAdsRow → dict decoding for the reporting actions, replacing
+their per-row extract_value() path walk (split the dotted path, then
+hasattr/getattr through a proto-plus wrapper per hop, per field, per row).
+
+The SELECT field list is compiled once per row type into accessors on the
+raw protobuf message (row._pb):
+
+1. Scalar fields: one operator.attrgetter per dotted path (C-level walk, no
+   wrappers)
+2. Enums: number → name table built from the descriptor
+3. *_micros fields: converted to currency units (rounded to 2 places) and
+   keyed without the _micros suffix
+4. Repeated and message leaves keep the proto-plus path and are stringified,
+   as extract_value() did
+5. Paths that don't exist on the row are left out of the result
+
+decode_columns() decodes into one list per field instead of one dict per
+row (see deploy/report_columns.py), for vectorized summaries.
+
+Usage:
+    from deploy.row_decoder import compile_row_decoder
+
+    decode = compile_row_decoder(["campaign.id", "campaign.status", "metrics.cost_micros"])
+    rows = [decode(row) for row in batch.results]
+    # → {"campaign.id": 1, "campaign.status": "ENABLED", "metrics.cost": 12.5}
+
+    report = decode_columns(batch.results, fields)  # → ReportColumns
+"""
+
+import operator
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from deploy.report_columns import ReportColumns
+
+MICROS = 1_000_000
+
+_SCALAR_TYPES = (int, float, str, bool)
+
+# (result key, getter, whether the getter takes the proto-plus row instead of the raw message)
+Accessor = Tuple[str, Callable[[Any], Any], bool]
+
+
+def _raw(row: Any) -> Any:
+    """The protobuf message behind a proto-plus wrapper (or the message itself)."""
+    return getattr(row, "_pb", row)
+
+
+def _is_repeated(field: Any) -> bool:
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == field.LABEL_REPEATED
+
+
+def _resolve(descriptor: Any, path: str) -> Tuple[Optional[Any], str]:
+    """
+    Leaf FieldDescriptor of a dotted path (None if the path doesn't exist) and
+    the path as the protobuf names it: fields that clash with Python builtins
+    are generated with a trailing underscore (`ad.type_`).
+    """
+    field = None
+    parts = []
+    for part in path.split("."):
+        if descriptor is None:
+            return None, path
+        field = descriptor.fields_by_name.get(part) or descriptor.fields_by_name.get(part + "_")
+        if field is None:
+            return None, path
+        parts.append(field.name)
+        descriptor = field.message_type if not _is_repeated(field) else None
+    return field, ".".join(parts)
+
+
+def _wrapped_value(path: str) -> Callable[[Any], Any]:
+    """Slow path for repeated/message leaves: walk the proto-plus wrapper like extract_value()."""
+    parts = path.split(".")
+
+    def value(row: Any) -> Any:
+        current = row
+        for part in parts:
+            current = getattr(current, part, None)
+            if current is None:
+                return None
+        return str(current)
+
+    return value
+
+
+def _accessor(descriptor: Any, path: str) -> Optional[Accessor]:
+    field, pb_path = _resolve(descriptor, path)
+    if field is None:
+        return None
+    if _is_repeated(field) or field.message_type is not None:
+        return path, _wrapped_value(path), True
+
+    get = operator.attrgetter(pb_path)
+    if field.enum_type is not None:
+        names = {value.number: value.name for value in field.enum_type.values}
+
+        def enum_name(pb: Any) -> Any:
+            number = get(pb)
+            return names.get(number, number)
+
+        return path, enum_name, False
+    if path.endswith("_micros") and field.cpp_type in (field.CPPTYPE_INT64, field.CPPTYPE_INT32):
+        return path.replace("_micros", ""), lambda pb: round(get(pb) / MICROS, 2), False
+    return path, get, False
+
+
+class RowDecoder:
+    """Decodes rows of one message type for a fixed field list."""
+
+    def __init__(self, descriptor: Any, fields: Sequence[str]):
+        self.descriptor = descriptor
+        self.fields = list(fields)
+        self._accessors: List[Accessor] = [
+            accessor for accessor in (_accessor(descriptor, path) for path in self.fields) if accessor is not None
+        ]
+
+    def __call__(self, row: Any) -> Dict[str, Any]:
+        pb = _raw(row)
+        decoded = {}
+        for key, get, wrapped in self._accessors:
+            value = get(row) if wrapped else get(pb)
+            if value is not None:
+                decoded[key] = value if isinstance(value, _SCALAR_TYPES) else str(value)
+        return decoded
+
+    def columns(self, rows: Iterable[Any]) -> Dict[str, List[Any]]:
+        """Decode rows into one list per result key (None where a row has no value)."""
+        columns: Dict[str, List[Any]] = {key: [] for key, _, _ in self._accessors}
+        appenders = [(columns[key].append, get, wrapped) for key, get, wrapped in self._accessors]
+        for row in rows:
+            pb = _raw(row)
+            for append, get, wrapped in appenders:
+                value = get(row) if wrapped else get(pb)
+                append(value if value is None or isinstance(value, _SCALAR_TYPES) else str(value))
+        return columns
+
+
+class _LazyRowDecoder:
+    """Compiles against the first row's descriptor, so callers needn't know the row type."""
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self._decoder: Optional[RowDecoder] = None
+
+    def __call__(self, row: Any) -> Dict[str, Any]:
+        descriptor = _raw(row).DESCRIPTOR
+        decoder = self._decoder
+        if decoder is None or decoder.descriptor is not descriptor:
+            decoder = self._decoder = _decoder_for(descriptor, self.fields)
+        return decoder(row)
+
+    def decode_all(self, rows: Any):
+        """Generator over decoded rows."""
+        for row in rows:
+            yield self(row)
+
+
+_decoders: Dict[Tuple[str, Tuple[str, ...]], RowDecoder] = {}
+_decoders_lock = threading.Lock()
+
+
+def _decoder_for(descriptor: Any, fields: Tuple[str, ...]) -> RowDecoder:
+    key = (descriptor.full_name, fields)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        with _decoders_lock:
+            decoder = _decoders.get(key)
+            if decoder is None:
+                decoder = _decoders[key] = RowDecoder(descriptor, fields)
+    return decoder
+
+
+def compile_row_decoder(fields: Sequence[str]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    A callable decoding one row (proto-plus or raw protobuf) into a flat dict.
+    Compiled decoders are cached per (row type, field list) for the process.
+    """
+    return _LazyRowDecoder(fields)
+
+
+def decode_columns(rows: Iterable[Any], fields: Sequence[str]) -> ReportColumns:
+    """Decode rows column-wise into a ReportColumns (empty if there are no rows)."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return ReportColumns({})
+    decoder = _decoder_for(_raw(first).DESCRIPTOR, tuple(fields))
+    return ReportColumns(decoder.columns(itertools.chain([first], rows)))
@@ -13,31 +13,99 @@ Endpoints:
     GET  /sessions/{id}     — Get session history
     GET  /health            — Health check
     GET  /tools             — List available tools
+    GET  /metrics           — Prometheus metrics (tool/Anthropic latency, tokens, sessions)
 """
 
 import os
+import json
+import time
 import uuid
+import asyncio
 import logging
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 from deploy.orchestrator import GoogleAdsAgent, create_agent_system
+from deploy.session_store import SessionManager
+from deploy.metrics import ACTIVE_SESSIONS, CONTENT_TYPE, render_metrics
 
 logger = logging.getLogger(__name__)
 
 # ── Session Store ─────────────────────────────────────────────────────────────
-sessions: Dict[str, GoogleAdsAgent] = {}
+# One conversation turn at a time per session; different sessions run concurrently.
+# A session's lock exists only while some request holds or waits for it, and is
+# only touched on the event loop.
+session_locks: Dict[str, asyncio.Lock] = {}
+_session_lock_users: Dict[str, int] = {}
+
+
+def _new_agent(model: str = None) -> GoogleAdsAgent:
+    agent = create_agent_system()
+    if model:
+        agent.model = model
+    return agent
+
+
+# Live agents are capped (SESSION_MAX_ACTIVE) and spill to the store when idle
+# (SESSION_TTL_SECONDS); SESSION_STORE=sqlite shares sessions between replicas.
+sessions = SessionManager.from_env(_new_agent)
+ACTIVE_SESSIONS.set_function(lambda: len(sessions))
+
+# Worker threads for tool execution (Google Ads calls are blocking)
+WORKER_THREADS = int(os.environ.get("AGENT_WORKER_THREADS", "32"))
+
+# Warm up (anthropic SDK, action modules, Google Ads protos) instead of paying
+# for it in the first chat turns:
+#   0 / off               — no warm-up (default)
+#   1 / true / background — after startup, while /health already answers
+#   blocking              — before the server accepts requests
+PREWARM_MODE = os.environ.get("AGENT_PREWARM", "0").lower()
+if PREWARM_MODE in ("1", "true", "yes"):
+    PREWARM_MODE = "background"
+elif PREWARM_MODE not in ("background", "blocking"):
+    PREWARM_MODE = "off"
+
+warmup_state: Dict[str, Any] = {"status": "off" if PREWARM_MODE == "off" else "pending"}
+
+
+def _warm_up():
+    """Import everything the first chat turn would. Failures are logged, not raised."""
+    from deploy.orchestrator import load_anthropic
+    from deploy.tool_executor import ToolExecutor
+
+    warmup_state["status"] = "running"
+    started = time.monotonic()
+    try:
+        load_anthropic()
+        result = ToolExecutor().prewarm()
+    except Exception as e:
+        warmup_state.update(status="failed", error=str(e))
+        logger.exception("Warm-up failed")
+        return
+    warmup_state.update(
+        status="done",
+        duration_ms=round((time.monotonic() - started) * 1000),
+        actions_loaded=len(result["loaded"]),
+        actions_failed=sorted(result["failed"]),
+        api_version=result["api_version"],
+    )
+    logger.info(f"Warm-up done in {warmup_state['duration_ms']}ms: {len(result['loaded'])} action modules")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle."""
     logger.info("Google Ads Agent server starting...")
+    # asyncio.to_thread() (used by GoogleAdsAgent.achat) runs on the default executor
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="agent-worker")
+    )
     # Validate credentials on startup
     required_keys = ["ANTHROPIC_API_KEY"]
     missing = [k for k in required_keys if not os.environ.get(k)]
@@ -45,6 +113,10 @@ async def lifespan(app: FastAPI):
         logger.error(f"Missing required env vars: {missing}")
     else:
         logger.info("Anthropic API key found")
+    if PREWARM_MODE == "blocking":
+        await asyncio.to_thread(_warm_up)
+    elif PREWARM_MODE == "background":
+        asyncio.get_running_loop().run_in_executor(None, _warm_up)
     yield
     logger.info("Shutting down...")
     sessions.clear()
@@ -83,34 +155,59 @@ class SessionInfo(BaseModel):
     session_id: str
     message_count: int
     model: str
+    usage: Dict[str, int] = {}
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def get_or_create_session(session_id: str = None, model: str = None) -> tuple:
-    """Get existing session or create a new one."""
-    if session_id and session_id in sessions:
-        return session_id, sessions[session_id]
+async def get_or_create_session(session_id: str = None, model: str = None) -> tuple:
+    """Get existing session (rehydrating it if it was spilled) or create a new one."""
+    if session_id:
+        agent = await asyncio.to_thread(sessions.get, session_id)
+        if agent is not None:
+            return session_id, agent
 
     new_id = session_id or str(uuid.uuid4())
-    agent = create_agent_system()
-    if model:
-        agent.model = model
-    sessions[new_id] = agent
+    agent = await asyncio.to_thread(sessions.create, new_id, model)
     return new_id, agent
 
 
+def format_sse(event: dict) -> str:
+    """Encode one agent event as a Server-Sent Events frame."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@asynccontextmanager
+async def session_lock(session_id: str):
+    """Per-session lock so concurrent requests can't interleave one history."""
+    lock = session_locks.get(session_id)
+    if lock is None:
+        lock = session_locks[session_id] = asyncio.Lock()
+    _session_lock_users[session_id] = _session_lock_users.get(session_id, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _session_lock_users[session_id] -= 1
+        if not _session_lock_users[session_id]:
+            del _session_lock_users[session_id]
+            del session_locks[session_id]
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Send a message and get a response. Auto-creates session if needed."""
-    session_id, agent = get_or_create_session(request.session_id)
+    session_id = request.session_id or str(uuid.uuid4())
 
     try:
-        history_before = len(agent.conversation_history)
-        response_text = agent.chat(request.message)
-        history_after = len(agent.conversation_history)
+        async with session_lock(session_id):
+            session_id, agent = await get_or_create_session(session_id)
+            history_before = len(agent.conversation_history)
+            response_text = await agent.achat(request.message)
+            history_after = len(agent.conversation_history)
+            await asyncio.to_thread(sessions.save, session_id, agent)
 
         # Count tool calls (each pair of assistant+user messages beyond the initial = 1 tool round)
         tool_calls = max(0, (history_after - history_before - 2) // 2)
@@ -125,11 +222,41 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Send a message and stream the response as Server-Sent Events.
+
+    Emits a `session` event immediately, then `text_delta`, `tool_start` and
+    `tool_finish` events as Claude writes and tools run, and finally `done`
+    (or `error`).
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+
+    async def event_stream():
+        yield format_sse({"type": "session", "session_id": session_id})
+        async with session_lock(session_id):
+            try:
+                _, agent = await get_or_create_session(session_id)
+                async for event in agent.astream_chat(request.message):
+                    yield format_sse(event)
+                await asyncio.to_thread(sessions.save, session_id, agent)
+            except Exception as e:
+                logger.error(f"Chat stream error: {e}")
+                yield format_sse({"type": "error", "message": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/sessions", response_model=SessionInfo)
 async def create_session(request: SessionCreate = None):
     """Create a new conversation session."""
     model = request.model if request else None
-    session_id, agent = get_or_create_session(model=model)
+    session_id, agent = await get_or_create_session(model=model)
     return SessionInfo(
         session_id=session_id,
         message_count=0,
@@ -140,21 +267,21 @@ async def create_session(request: SessionCreate = None):
 @app.get("/sessions/{session_id}", response_model=SessionInfo)
 async def get_session(session_id: str):
     """Get session info."""
-    if session_id not in sessions:
+    agent = await asyncio.to_thread(sessions.get, session_id)
+    if agent is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    agent = sessions[session_id]
     return SessionInfo(
         session_id=session_id,
         message_count=len(agent.conversation_history),
         model=agent.model,
+        usage=agent.usage,
     )
 
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session."""
-    if session_id in sessions:
-        del sessions[session_id]
+    await asyncio.to_thread(sessions.delete, session_id)
     return {"deleted": session_id}
 
 
@@ -167,6 +294,7 @@ async def health():
         "anthropic_key_set": bool(os.environ.get("ANTHROPIC_API_KEY")),
         "google_ads_configured": bool(os.environ.get("GOOGLE_ADS_DEVELOPER_TOKEN")),
         "cloudinary_configured": bool(os.environ.get("CLOUDINARY_CLOUD_NAME")),
+        "warmup": warmup_state,
     }
 
 
@@ -176,3 +304,9 @@ async def list_tools():
     from deploy.tool_executor import ToolExecutor
     executor = ToolExecutor()
     return {"tools": executor.list_available_tools()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,358 @@
+"""
+Google Ads API Agent — Session Store
+Bounded, optionally shared storage for conversation sessions.
+
+Two layers:
+1. SessionStore — where serialized session state lives.
+   - MemorySessionStore: process-local, LRU + TTL (the default)
+   - SQLiteSessionStore: durable file shared by every replica that mounts it
+2. SessionManager — the live GoogleAdsAgent objects for recently used
+   sessions, capped by count and idle time. Idle agents spill to the store
+   and are rehydrated on the next request.
+
+With a shared store every finished turn is written through, and a replica
+reloads a session whenever another replica saved a newer version.
+
+Configuration (env):
+    SESSION_STORE              memory | sqlite (default: memory)
+    SESSION_DB_PATH            SQLite file (default: sessions.db)
+    SESSION_TTL_SECONDS        idle time before a live agent spills (default: 1800)
+    SESSION_MAX_ACTIVE         live agents kept in memory (default: 200)
+    SESSION_RETENTION_SECONDS  how long stored sessions are kept (default: 7 days)
+
+Usage:
+    from deploy.session_store import SessionManager
+
+    sessions = SessionManager.from_env(factory)
+    session_id, agent = sessions.create()
+    agent.chat("...")
+    sessions.save(session_id, agent)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 1800
+DEFAULT_MAX_ACTIVE = 200
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+# =============================================================================
+# STORES
+# =============================================================================
+
+class SessionStore(ABC):
+    """Storage for serialized session state (see GoogleAdsAgent.export_state)."""
+
+    # True if other processes/replicas read and write the same sessions
+    shared = False
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, state: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    def version(self, session_id: str) -> Optional[int]:
+        """Stored version of a session, or None if it isn't stored."""
+        state = self.get(session_id)
+        return state.get("version", 0) if state is not None else None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store, bounded by entry count (LRU) and age (TTL)."""
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._states: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._states:
+            session_id, (stored_at, _) = next(iter(self._states.items()))
+            if now - stored_at <= self.ttl_seconds:
+                break
+            self._states.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._expire(time.time())
+            entry = self._states.get(session_id)
+            return entry[1] if entry else None
+
+    def put(self, session_id: str, state: Dict[str, Any]):
+        with self._lock:
+            self._states[session_id] = (time.time(), state)
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Durable store in a SQLite file. Replicas sharing the file (e.g. a docker
+    volume) share sessions; SQLite's file locking serializes the writes.
+    """
+
+    shared = True
+    PURGE_EVERY = 100  # writes between purges of expired rows
+
+    def __init__(self, path: str = "sessions.db", ttl_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " state TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, session_id: str, state: Dict[str, Any]):
+        payload = json.dumps(state, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, version, state, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, state.get("version", 0), payload, now),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE updated_at >= ?", (time.time() - self.ttl_seconds,)
+            ).fetchone()[0]
+
+
+def create_session_store() -> SessionStore:
+    """Build the store selected by SESSION_STORE."""
+    kind = os.environ.get("SESSION_STORE", "memory").lower()
+    retention = float(os.environ.get("SESSION_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS))
+    if kind == "sqlite":
+        return SQLiteSessionStore(os.environ.get("SESSION_DB_PATH", "sessions.db"), ttl_seconds=retention)
+    if kind != "memory":
+        raise ValueError(f"Unknown SESSION_STORE: {kind} (expected 'memory' or 'sqlite')")
+    return MemorySessionStore(ttl_seconds=retention)
+
+
+# =============================================================================
+# LIVE SESSIONS
+# =============================================================================
+
+class _LiveSession:
+    __slots__ = ("agent", "version", "last_used")
+
+    def __init__(self, agent: Any, version: int):
+        self.agent = agent
+        self.version = version
+        self.last_used = time.monotonic()
+
+
+class SessionManager:
+    """
+    Live agents for recently used sessions in front of a SessionStore.
+    Thread-safe; store I/O may block, so async callers should use a worker thread.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        factory: Callable[[Optional[str]], Any],
+        max_active: int = DEFAULT_MAX_ACTIVE,
+        idle_ttl: float = DEFAULT_TTL_SECONDS,
+        on_evict: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            store: Where spilled/shared session state lives
+            factory: Builds a fresh agent, given an optional model name
+            max_active: Live agents kept in memory
+            idle_ttl: Seconds of inactivity before a live agent spills
+            on_evict: Called with the session_id when a live agent is dropped
+        """
+        self.store = store
+        self.factory = factory
+        self.max_active = max_active
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self._live: "OrderedDict[str, _LiveSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, factory: Callable[[Optional[str]], Any], **kwargs) -> "SessionManager":
+        return cls(
+            create_session_store(),
+            factory,
+            max_active=int(os.environ.get("SESSION_MAX_ACTIVE", DEFAULT_MAX_ACTIVE)),
+            idle_ttl=float(os.environ.get("SESSION_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            **kwargs,
+        )
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """The session's agent, rehydrated from the store if needed; None if unknown."""
+        self._evict()
+        with self._lock:
+            live = self._live.get(session_id)
+
+        if live is not None and self.store.shared:
+            stored_version = self.store.version(session_id)
+            if stored_version is None:
+                # Deleted (or expired) by another replica
+                self._drop(session_id)
+                return None
+            if stored_version != live.version:
+                live = None
+
+        if live is not None:
+            with self._lock:
+                live.last_used = time.monotonic()
+                if session_id in self._live:
+                    self._live.move_to_end(session_id)
+            return live.agent
+
+        state = self.store.get(session_id)
+        if state is None:
+            return None
+        agent = self.factory(state.get("model"))
+        agent.load_state(state)
+        if not self.store.shared:
+            # The live agent is authoritative again until it spills
+            self.store.delete(session_id)
+        self._add(session_id, agent, state.get("version", 0))
+        logger.debug(f"Rehydrated session {session_id}")
+        return agent
+
+    def create(self, session_id: str, model: str = None) -> Any:
+        """Start a new session under session_id."""
+        agent = self.factory(model)
+        self._add(session_id, agent, 0)
+        if self.store.shared:
+            self.save(session_id, agent)
+        return agent
+
+    def save(self, session_id: str, agent: Any):
+        """Record a finished turn. Shared stores are written through."""
+        with self._lock:
+            live = self._live.get(session_id)
+            if live is not None and live.agent is agent:
+                live.version += 1
+                live.last_used = time.monotonic()
+                version = live.version
+            else:
+                live = None
+        if live is None:
+            # Spilled (or reloaded elsewhere) while the turn ran: the store holds the latest copy
+            version = (self.store.version(session_id) or 0) + 1
+            self.store.put(session_id, agent.export_state(version))
+        elif self.store.shared:
+            self.store.put(session_id, agent.export_state(version))
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._live.pop(session_id, None)
+        self.store.delete(session_id)
+
+    def _add(self, session_id: str, agent: Any, version: int):
+        with self._lock:
+            self._live[session_id] = _LiveSession(agent, version)
+            self._live.move_to_end(session_id)
+        self._evict()
+
+    def _drop(self, session_id: str):
+        with self._lock:
+            self._live.pop(session_id, None)
+        if self.on_evict:
+            self.on_evict(session_id)
+
+    def _evict(self):
+        """Spill agents idle past idle_ttl, then least recently used ones over max_active."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            while self._live:
+                session_id, live = next(iter(self._live.items()))
+                if now - live.last_used <= self.idle_ttl and len(self._live) <= self.max_active:
+                    break
+                self._live.popitem(last=False)
+                evicted.append((session_id, live))
+
+        for session_id, live in evicted:
+            if not self.store.shared:
+                # Shared stores already hold every finished turn
+                self.store.put(session_id, live.agent.export_state(live.version))
+            if self.on_evict:
+                self.on_evict(session_id)
+            logger.debug(f"Spilled idle session {session_id}")
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._live:
+                return True
+        return self.store.version(session_id) is not None
+
+    def __len__(self) -> int:
+        """Number of live (in-memory) sessions."""
+        with self._lock:
+            return len(self._live)
+
+    def clear(self):
+        """Drop live agents (shutdown). Unsaved state of a process-local store is lost."""
+        with self._lock:
+            self._live.clear()
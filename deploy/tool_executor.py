@@ -2,61 +2,163 @@
 Google Ads API Agent — Tool Executor (Production-Ready)
 Executes tool calls by loading and running the corresponding action Python files.
 
-Handles three agent-platform → standalone Python adaptation issues:
+Handles four agent-platform → standalone Python adaptation issues:
 1. secrets injection — Platform injects `secrets` as a global; we do the same pre-exec
 2. pip install suppression — Actions run subprocess pip install at import time;
-   we monkey-patch subprocess to skip these since requirements.txt handles deps
+   each module gets a private subprocess shim that skips these, since
+   requirements.txt handles deps (see deploy/action_registry.py)
 3. Parameter filtering — Actions have explicit run() params (no **kwargs in 26/28);
    we inspect the signature and only pass matching params to avoid TypeErrors
+4. Client pooling — Actions build a new GoogleAdsClient per call; we rebind their
+   GoogleAdsClient name to the process-wide pool (deploy/client_pool.py)
+
+Results are serialized as compact (tabular where possible) JSON within a token
+budget; oversized results are offloaded to disk with a preview
+(see deploy/result_serializer.py). Read-only results are memoized with a TTL
+and invalidated by mutations of the same account from any session, and
+identical read-only calls in flight at the same time, from any session, share
+one execution (see deploy/result_cache.py).
+With ADS_BACKEND=record|replay (or an injected ads_backend), Google Ads calls
+are captured to or served from fixtures (see deploy/ads_backend.py).
+
+Independent read-only tool calls from one model turn run concurrently on a
+bounded, process-wide thread pool (see execute_tool_uses).
 """
 
 import os
 import sys
 import json
+import time
 import inspect
-import subprocess
-import importlib.util
+import threading
+import contextvars
 import traceback
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from deploy.tool_schemas import TOOL_TO_ACTION_FILE
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from deploy.action_registry import secrets_fingerprint, get_action_registry
+from deploy.ads_backend import AdsBackend, ads_backend_from_env, use_ads_backend
+from deploy.client_pool import preload_api_version
+from deploy.result_serializer import ResultSerializer
+from deploy.result_cache import (
+    CACHE_ENABLED, SINGLE_FLIGHT_ENABLED, ResultCache, SingleFlight, account_scope, get_single_flight,
+    invalidate_cached_results, new_tool_cache, ttl_for,
+)
+from deploy.metrics import TOOL_CACHE, TOOL_DURATION, TOOL_ERRORS
+from deploy.tool_schemas import (
+    TOOL_TO_ACTION_FILE,
+    READ_ONLY_TOOLS,
+    SEQUENTIAL_TOOLS,
+    LOCAL_STATE_TOOLS,
+    READ_ONLY_ACTION_PREFIXES,
+    TOOL_ACTIONS,
+)
 
 logger = logging.getLogger(__name__)
 
 # =============================================================================
-# PIP INSTALL SUPPRESSOR
+# CONCURRENT EXECUTION
 # =============================================================================
 
-_original_check_call = subprocess.check_call
-_original_run = subprocess.run
+MAX_PARALLEL_TOOLS = int(os.environ.get("AGENT_MAX_PARALLEL_TOOLS", "8"))
+DEFAULT_TOOL_CONCURRENCY = 4
+
+# Per-tool caps on simultaneous executions across the whole process
+TOOL_CONCURRENCY_LIMITS: Dict[str, int] = {
+    "query_planner": 2,
+}
+
+_tool_pool: Optional[ThreadPoolExecutor] = None
+_tool_pool_lock = threading.Lock()
+_tool_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def _get_tool_pool() -> ThreadPoolExecutor:
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            _tool_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_TOOLS, thread_name_prefix="tool")
+        return _tool_pool
+
+
+def _get_tool_semaphore(tool_name: str) -> threading.BoundedSemaphore:
+    with _tool_pool_lock:
+        if tool_name not in _tool_semaphores:
+            limit = TOOL_CONCURRENCY_LIMITS.get(tool_name, DEFAULT_TOOL_CONCURRENCY)
+            _tool_semaphores[tool_name] = threading.BoundedSemaphore(limit)
+        return _tool_semaphores[tool_name]
+
+
+def metric_action(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    """The `action` metric label: a declared action of the tool, "" if none given, else "other"."""
+    action = tool_input.get("action")
+    if action is None or action == "":
+        return ""
+    return action if isinstance(action, str) and action in TOOL_ACTIONS.get(tool_name, ()) else "other"
 
-def _suppressed_check_call(cmd, *args, **kwargs):
-    if isinstance(cmd, (list, tuple)) and len(cmd) >= 2 and cmd[0] == "pip" and cmd[1] == "install":
-        logger.debug(f"Suppressed pip install: {' '.join(cmd)}")
-        return 0
-    return _original_check_call(cmd, *args, **kwargs)
 
-def _suppressed_run(cmd, *args, **kwargs):
-    if isinstance(cmd, (list, tuple)) and len(cmd) >= 2 and cmd[0] == "pip" and cmd[1] == "install":
-        logger.debug(f"Suppressed pip install: {' '.join(cmd)}")
-        class FakeResult:
-            returncode = 0
-            stdout = ""
-            stderr = ""
-        return FakeResult()
-    return _original_run(cmd, *args, **kwargs)
+def is_read_only_call(tool_name: str, tool_input: Dict[str, Any]) -> bool:
+    """True if the call only reads data and may run alongside other calls."""
+    if tool_name in SEQUENTIAL_TOOLS:
+        return False
+    if tool_name in READ_ONLY_TOOLS:
+        return True
+    action = tool_input.get("action")
+    if not isinstance(action, str):
+        return False
+    return action.startswith(READ_ONLY_ACTION_PREFIXES)
+
+
+def is_delegable_call(tool_name: str, tool_input: Dict[str, Any]) -> bool:
+    """
+    True if a sub-agent may make the call unsupervised: it reads data, or
+    writes only local state no other call depends on. Google Ads mutations and
+    SEQUENTIAL_TOOLS stay with the main agent, where the user confirms them.
+    """
+    if is_read_only_call(tool_name, tool_input):
+        return True
+    return tool_name in LOCAL_STATE_TOOLS and tool_name not in SEQUENTIAL_TOOLS
 
 
 class ToolExecutor:
     """Executes tools by loading action Python files and calling their run() function."""
 
-    def __init__(self, repo_root: str = None, credentials: Dict[str, str] = None):
+    def __init__(
+        self,
+        repo_root: str = None,
+        credentials: Dict[str, str] = None,
+        parallel: bool = True,
+        result_token_budget: int = None,
+        cache: bool = None,
+        ads_backend: AdsBackend = None,
+    ):
         self.repo_root = Path(repo_root or os.path.dirname(os.path.dirname(__file__)))
         self.credentials = credentials or self._load_credentials_from_env()
+        self.parallel = parallel
+        self.serializer = ResultSerializer(
+            result_token_budget, gateway_loader=lambda: self._load_action_module("api_gateway")
+        )
+        self.result_cache: Optional[ResultCache] = (
+            new_tool_cache() if (CACHE_ENABLED if cache is None else cache) else None
+        )
+        # Record/replay stand-in for the Google Ads API (None: live)
+        self.ads_backend = ads_backend if ads_backend is not None else ads_backend_from_env()
+        # Only executors with the same credentials and backend share in-flight calls
+        self.single_flight: Optional[SingleFlight] = get_single_flight() if SINGLE_FLIGHT_ENABLED else None
+        self._flight_prefix = f"{secrets_fingerprint(self.credentials)[:16]}:{id(self.ads_backend):x}:"
         self._action_cache: Dict[str, Any] = {}
         self._signature_cache: Dict[str, inspect.Signature] = {}
+        self._builtin_tools: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+    def register_builtin(self, tool_name: str, handler: Callable[[Dict[str, Any]], Any]):
+        """
+        Register an in-process tool (no action file). The handler receives the
+        raw tool_input dict; its return value is serialized like run() results,
+        but without the token budget.
+        """
+        self._builtin_tools[tool_name] = handler
 
     def _load_credentials_from_env(self) -> Dict[str, str]:
         keys = [
@@ -105,10 +207,9 @@ class ToolExecutor:
 
     def _load_action_module(self, tool_name: str):
         """
-        Load action file as a Python module with:
-        1. secrets dict injected into module namespace BEFORE execution
-        2. subprocess monkey-patched to suppress pip installs
-        3. Module cached after first load
+        Load the action module for a tool through the process-wide registry
+        (secrets injection, pip suppression and client pooling happen there).
+        Module and signature references are memoized on this executor.
         """
         if tool_name in self._action_cache:
             return self._action_cache[tool_name]
@@ -121,27 +222,38 @@ class ToolExecutor:
         if not file_path.exists():
             raise FileNotFoundError(f"Action file not found: {file_path}")
 
-        spec = importlib.util.spec_from_file_location(f"action_{tool_name}", str(file_path))
-        module = importlib.util.module_from_spec(spec)
+        entry = get_action_registry().load(tool_name, file_path, self._get_secrets_for_tool(tool_name))
 
-        # Inject secrets BEFORE exec so `secrets["KEY"]` resolves during module load
-        secrets = self._get_secrets_for_tool(tool_name)
-        module.__dict__["secrets"] = secrets
+        # Signature first: another thread may pick up the cached module immediately
+        if entry.signature:
+            self._signature_cache[tool_name] = entry.signature
+        self._action_cache[tool_name] = entry.module
 
-        # Suppress pip installs during module loading
-        subprocess.check_call = _suppressed_check_call
-        subprocess.run = _suppressed_run
-        try:
-            spec.loader.exec_module(module)
-        finally:
-            subprocess.check_call = _original_check_call
-            subprocess.run = _original_run
+        return entry.module
 
-        self._action_cache[tool_name] = module
-        if hasattr(module, "run"):
-            self._signature_cache[tool_name] = inspect.signature(module.run)
-
-        return module
+    def prewarm(self, tool_names: List[str] = None) -> Dict[str, Any]:
+        """
+        Load action modules ahead of time so the first tool call doesn't pay for it,
+        then import the Google Ads protos of the API version they run on.
+        Returns the tools that loaded and the ones that failed (with the error).
+        """
+        tool_names = tool_names or list(TOOL_TO_ACTION_FILE)
+        futures = {name: _get_tool_pool().submit(self._load_action_module, name) for name in tool_names}
+        loaded, failed = [], {}
+        for tool_name, future in futures.items():
+            try:
+                future.result()
+                loaded.append(tool_name)
+            except Exception as e:
+                failed[tool_name] = str(e)
+        if failed:
+            logger.warning(f"Prewarm: {len(failed)} action module(s) failed to load: {sorted(failed)}")
+        try:
+            version = preload_api_version()
+        except Exception as e:
+            logger.warning(f"Prewarm: could not load Google Ads API protos: {e}")
+            version = None
+        return {"loaded": loaded, "failed": failed, "api_version": version}
 
     def _filter_params(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -175,32 +287,175 @@ class ToolExecutor:
 
     def execute(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
         """
-        Execute a tool call: load module → filter params → call run() → return result.
+        Execute a tool call, serving read-only calls from the result cache when
+        possible and sharing identical in-flight ones. Mutations invalidate
+        cached reads of the account they touch.
+        """
+        if tool_name not in TOOL_TO_ACTION_FILE:
+            return self._execute(tool_name, tool_input)[0]
+
+        if not is_read_only_call(tool_name, tool_input):
+            try:
+                return self._execute(tool_name, tool_input)[0]
+            finally:
+                # Even a failed mutation may have applied part of its changes
+                if tool_name not in LOCAL_STATE_TOOLS:
+                    scope = account_scope(tool_input)
+                    # Every session's cached reads of the account, not only this executor's
+                    invalidate_cached_results(scope)
+                    if self.single_flight is not None:
+                        self.single_flight.forget(self._flight_prefix, scope)
+
+        key = ResultCache.key_for(tool_name, tool_input)
+        if self.result_cache is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                TOOL_CACHE.inc(tool=tool_name, result="hit")
+                logger.info(f"Cache hit: {tool_name}")
+                return cached
+            TOOL_CACHE.inc(tool=tool_name, result="miss")
+
+        result, succeeded = self._execute_shared(tool_name, tool_input, key)
+        if succeeded and self.result_cache is not None:
+            self.result_cache.put(key, result, ttl_for(tool_input), account_scope(tool_input))
+        return result
+
+    def _execute_shared(self, tool_name: str, tool_input: Dict[str, Any], key: str) -> Tuple[str, bool]:
+        """_execute() for a read-only call; joins an identical call already in flight."""
+        if self.single_flight is None:
+            return self._execute(tool_name, tool_input)
+        outcome, shared = self.single_flight.do(
+            self._flight_prefix + key, lambda: self._execute(tool_name, tool_input), account_scope(tool_input),
+        )
+        if shared:
+            TOOL_CACHE.inc(tool=tool_name, result="coalesced")
+            logger.info(f"Coalesced with in-flight call: {tool_name}")
+        return outcome
+
+    def _execute(self, tool_name: str, tool_input: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Load module → filter params → call run() → serialize result.
+        Returns the result text and whether the call succeeded.
         """
+        action = metric_action(tool_name, tool_input)
+        started = time.monotonic()
         try:
+            handler = self._builtin_tools.get(tool_name)
+            if handler is not None:
+                return self.serializer.serialize(tool_name, tool_input, handler(tool_input), enforce_budget=False), True
+
             module = self._load_action_module(tool_name)
 
             if not hasattr(module, "run"):
-                return json.dumps({"error": f"Action '{tool_name}' has no run() function"})
+                return json.dumps({"error": f"Action '{tool_name}' has no run() function"}), False
 
             filtered_input = self._filter_params(tool_name, tool_input)
 
             logger.info(f"Executing: {tool_name}({', '.join(f'{k}={repr(v)[:50]}' for k,v in filtered_input.items())})")
 
-            result = module.run(**filtered_input)
+            with use_ads_backend(self.ads_backend):
+                result = module.run(**filtered_input)
 
-            if isinstance(result, str):
-                return result
-            return json.dumps(result, indent=2, default=str)
+            failed = isinstance(result, dict) and (result.get("status") == "error" or "error" in result)
+            return self.serializer.serialize(tool_name, tool_input, result), not failed
 
         except Exception as e:
             error_detail = traceback.format_exc()
             logger.error(f"Tool execution failed: {tool_name}\n{error_detail}")
+            TOOL_ERRORS.inc(tool=tool_name, action=action)
             return json.dumps({
                 "error": str(e),
                 "tool": tool_name,
                 "traceback": error_detail
-            })
+            }), False
+        finally:
+            TOOL_DURATION.observe(time.monotonic() - started, tool=tool_name, action=action)
+
+    def execute_tool_uses(
+        self,
+        tool_uses: List[Any],
+        progress: Optional[Callable[..., None]] = None,
+        cancel: Optional[threading.Event] = None,
+        delegated: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute every tool_use block from one model turn and return the matching
+        tool_result blocks, in the same order as the tool_use blocks.
+
+        Consecutive read-only calls run concurrently. A mutating call waits for
+        everything before it and runs on its own, so writes keep the order the
+        model asked for. With parallel=False every call runs in sequence.
+
+        progress, if given, is called as progress("tool_start", block) and
+        progress("tool_finish", block, result, elapsed_seconds), possibly from
+        worker threads. "tool_start" comes before the cancel check, so a caller
+        that sets cancel and then sees no start of a write knows none will run.
+
+        cancel, if given and set, stops calls that haven't started yet: they
+        return an error result instead. Calls already running finish. Anything
+        with an is_set() method will do.
+
+        delegated=True (sub-agents) refuses calls that aren't is_delegable_call().
+        """
+        results: List[Optional[str]] = [None] * len(tool_uses)
+        batch: List[int] = []
+        for index, block in enumerate(tool_uses):
+            if delegated and not is_delegable_call(block.name, block.input):
+                results[index] = json.dumps({
+                    "error": "Sub-agents can only read data. Describe the change in your answer instead; "
+                             "the main agent will make it once the user confirms.",
+                    "tool": block.name,
+                })
+                continue
+            if self.parallel and is_read_only_call(block.name, block.input):
+                batch.append(index)
+                continue
+            self._run_batch(tool_uses, batch, results, progress, cancel)
+            batch = []
+            results[index] = self._execute_block(block, progress, cancel)
+        self._run_batch(tool_uses, batch, results, progress, cancel)
+
+        return [
+            {"type": "tool_result", "tool_use_id": block.id, "content": results[index]}
+            for index, block in enumerate(tool_uses)
+        ]
+
+    def _run_batch(
+        self, tool_uses: List[Any], indexes: List[int], results: List[Optional[str]], progress=None, cancel=None,
+    ):
+        """Run a batch of independent read-only calls on the shared tool pool."""
+        if len(indexes) == 1:
+            results[indexes[0]] = self._execute_limited(tool_uses[indexes[0]], progress, cancel)
+            return
+        pool = _get_tool_pool()
+        # Each worker runs in a copy of this context (e.g. the rate limiter's priority lane)
+        futures = [
+            (index, pool.submit(
+                contextvars.copy_context().run, self._execute_limited, tool_uses[index], progress, cancel,
+            ))
+            for index in indexes
+        ]
+        for index, future in futures:
+            results[index] = future.result()
+
+    def _execute_limited(self, block: Any, progress=None, cancel=None) -> str:
+        with _get_tool_semaphore(block.name):
+            return self._execute_block(block, progress, cancel)
+
+    def _execute_block(self, block: Any, progress=None, cancel=None) -> str:
+        logger.info(f"Executing tool: {block.name} (id: {block.id})")
+        logger.debug(f"Tool input: {json.dumps(block.input, indent=2)}")
+        if progress:
+            progress("tool_start", block)
+        started = time.monotonic()
+        if cancel is not None and cancel.is_set():
+            result = json.dumps({"error": "Not run: the request was cancelled before this call started", "tool": block.name})
+        else:
+            result = self.execute(block.name, block.input)
+        if progress:
+            progress("tool_finish", block, result, time.monotonic() - started)
+        logger.debug(f"Tool result (truncated): {result[:500]}")
+        return result
 
     def list_available_tools(self) -> list:
         available = []
@@ -621,7 +621,7 @@ MAIN_AGENT_TOOLS = [
                 "asset_type": {"type": "string", "enum": ["HEADLINE", "DESCRIPTION", "MARKETING_IMAGE", "SQUARE_MARKETING_IMAGE", "LOGO", "LANDSCAPE_LOGO", "BUSINESS_NAME"]},
                 "texts": {"type": "array", "items": {"type": "string"}},
                 "image_urls": {"type": "array", "items": {"type": "string"}},
-                "performance_label": {"type": "string", "enum": ["BEST", "GOOD", "LOW", "LEARNING"]},
+                "primary_status": {"type": "string", "enum": ["ELIGIBLE", "LIMITED", "NOT_ELIGIBLE", "PENDING", "PAUSED", "REMOVED"]},
                 "date_range": {"type": "string", "default": "LAST_30_DAYS"},
                 "limit": {"type": "integer", "default": 100}
             },
@@ -661,3 +661,86 @@ TOOL_TO_ACTION_FILE = {
     "bidding_strategy_manager": "actions/main-agent/27_bidding_strategy_manager.py",
     "pmax_asset_group_manager": "actions/main-agent/28_pmax_asset_group_manager.py",
 }
+
+# =============================================================================
+# BUILTIN TOOLS (handled in-process by the orchestrator, no action file)
+# =============================================================================
+
+BUILTIN_TOOLS = [
+    {
+        "name": "get_stored_result",
+        "description": "Read back the full data of an earlier tool result that was compacted in the conversation, or of a large result offloaded to managed storage (use its file_id as result_id). Large results can be paged with offset/max_chars.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "result_id": {"type": "string", "description": "result_id from the compacted tool result, or file_id from _result_overflow"},
+                "offset": {"type": "integer", "default": 0, "description": "Character offset to start reading from"},
+                "max_chars": {"type": "integer", "default": 20000, "description": "Maximum characters to return"}
+            },
+            "required": ["result_id"]
+        }
+    },
+    {
+        "name": "delegate_tasks",
+        "description": "Run several independent tasks on sub-agents at the same time and get their merged results — e.g. one reporting task per account in an MCC audit. Each task runs in its own fresh context with read-only tools (sub-agents can't change accounts; make confirmed changes yourself afterwards), within a token and time budget, and returns a concise summary. Use for large data pulls, heavy analysis or bulk creative work; handle single-entity lookups directly.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "description": "Independent tasks, run concurrently",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "agent": {"type": "string", "enum": ["reporting", "research", "creative", "creative_innovate"], "description": "Sub-agent to run the task"},
+                            "task": {"type": "string", "description": "Self-contained task description, including account and date range"},
+                            "context": {"type": "object", "description": "Extra context passed to the sub-agent (IDs, filters, prior findings)"},
+                            "label": {"type": "string", "description": "Short label for this task in the merged results, e.g. the account name"}
+                        },
+                        "required": ["agent", "task"]
+                    }
+                },
+                "max_parallel": {"type": "integer", "default": 4, "description": "Tasks running at once"},
+                "token_budget_per_task": {"type": "integer", "default": 150000, "description": "Max tokens (input + output, all rounds) per task"},
+                "timeout_seconds": {"type": "integer", "default": 300, "description": "Wall-clock limit per task"}
+            },
+            "required": ["tasks"]
+        }
+    },
+]
+
+# =============================================================================
+# EXECUTION CLASSIFICATION
+# =============================================================================
+
+# Tools that never change Google Ads state, whatever their arguments.
+READ_ONLY_TOOLS = {"check_user_access", "account_access_checker", "get_stored_result"}
+
+# Tools that always run alone and in order: they mutate Google Ads, write the
+# shared session/gateway state files, or install packages. delegate_tasks runs
+# its own fan-out (and sub-agents use the tool pool), so it stays off the pool.
+SEQUENTIAL_TOOLS = {
+    "google_ads_mutate", "campaign_creator", "session_state_manager",
+    "api_gateway", "package_installer", "delegate_tasks",
+}
+
+# Tools whose writes stay in local state files or packages, never in Google
+# Ads, so they don't invalidate cached reads.
+LOCAL_STATE_TOOLS = {
+    "session_state_manager", "api_gateway", "package_installer", "cloudinary_creative_tools",
+}
+
+# An `action` starting with one of these only reads data. Every other action
+# is treated as a mutation.
+READ_ONLY_ACTION_PREFIXES = (
+    "list", "get_", "find", "search", "estimate_", "build_query_plan",
+    "validate_completeness",
+)
+
+# Declared `action` values per tool (input_schema enum); metrics label any
+# other value "other", so model-supplied strings can't grow the series count.
+TOOL_ACTIONS = {
+    tool["name"]: frozenset(tool["input_schema"]["properties"]["action"].get("enum", ()))
+    for tool in MAIN_AGENT_TOOLS
+    if "action" in tool["input_schema"].get("properties", {})
+}
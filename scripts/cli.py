@@ -7,12 +7,14 @@ Usage:
     python scripts/cli.py
     python scripts/cli.py --model claude-sonnet-4-5-20250929
     python scripts/cli.py --single "Show me account summary for Acme Corp"
+    python scripts/cli.py --no-prewarm    # don't load action modules in the background
 """
 
 import os
 import sys
 import argparse
 import logging
+import threading
 
 # Add repo root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,14 +22,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv()
 
-from deploy.orchestrator import create_agent_system
-
 
 def main():
     parser = argparse.ArgumentParser(description="Google Ads Agent CLI")
     parser.add_argument("--model", default=None, help="Claude model to use")
     parser.add_argument("--single", default=None, help="Single message (non-interactive)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable debug logging")
+    parser.add_argument("--no-prewarm", action="store_true", help="Load action modules on first use only")
     args = parser.parse_args()
 
     if args.verbose:
@@ -48,7 +49,14 @@ def main():
     print("│    clear conversation history            │")
     print("└─────────────────────────────────────────┘")
 
+    # Imported here so --help and a missing key don't wait for the SDKs
+    from deploy.orchestrator import create_agent_system
+
     agent = create_agent_system()
+    if not args.no_prewarm:
+        # Action modules and Google Ads protos load while the first message is typed
+        # (or, with --single, while Claude answers the first round)
+        threading.Thread(target=agent.executor.prewarm, name="prewarm", daemon=True).start()
     if args.model:
         agent.model = args.model
     print(f"  Model: {agent.model}")
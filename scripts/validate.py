@@ -6,12 +6,15 @@ Runs a series of checks to verify the deployment is working correctly.
 Usage:
     python scripts/validate.py
     python scripts/validate.py --skip-api    # Skip live API calls
+
+Cold-start budget (Phase 1b): AGENT_STARTUP_BUDGET_MS (default 1000) per import.
 """
 
 import os
 import sys
 import json
 import argparse
+import subprocess
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -28,6 +31,23 @@ def check(name: str, passed: bool, detail: str = ""):
     return passed
 
 
+# Cold imports that gate how fast the server and CLI come up
+STARTUP_IMPORTS = {
+    "deploy.server": "import deploy.server",
+    "deploy.orchestrator": "import deploy.orchestrator",
+}
+
+
+def measure_import_ms(root: str, statement: str) -> float:
+    """Time a statement in a fresh interpreter, so earlier imports don't hide its cost."""
+    code = (
+        "import sys, time; sys.path.insert(0, %r); started = time.perf_counter(); %s; "
+        "print((time.perf_counter() - started) * 1000)" % (root, statement)
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--skip-api", action="store_true", help="Skip live API calls")
@@ -62,6 +82,16 @@ def main():
     results.append(check("deploy/orchestrator.py", (root / "deploy" / "orchestrator.py").exists()))
     results.append(check("deploy/server.py", (root / "deploy" / "server.py").exists()))
 
+    # ── Phase 1b: Startup Budget (fresh processes, before anything is imported here)
+    budget_ms = float(os.environ.get("AGENT_STARTUP_BUDGET_MS", "1000"))
+    print(f"\n⏱️  Phase 1b: Startup Budget ({budget_ms:.0f}ms per import)")
+    for label, statement in STARTUP_IMPORTS.items():
+        try:
+            elapsed = min(measure_import_ms(str(root), statement) for _ in range(3))
+            results.append(check(f"Cold import {label}", elapsed <= budget_ms, f"{elapsed:.0f}ms"))
+        except Exception as e:
+            results.append(check(f"Cold import {label}", False, str(e)))
+
     # ── Phase 2: Imports ──────────────────────────────────────────────
     print("\n📦 Phase 2: Package Imports")
 